@@ -0,0 +1,60 @@
+"""
+Cold-start time of a worker: importing the app package and calling create_app().
+
+Each run happens in a fresh interpreter, so module imports are included. The
+MongoDB and Redis hosts point at an unroutable address by default to show that
+startup does not wait on external services. The script exits non-zero if the
+median creation time exceeds STARTUP_BUDGET_MS.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+from stock_trading import STARTUP_BUDGET_MS, create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'create_ms': (created - imported) * 1000,
+                  'budget_ms': STARTUP_BUDGET_MS}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters to start')
+    parser.add_argument('--service-host', default='192.0.2.1',
+                        help='Host to use for MongoDB and Redis (unroutable by default)')
+    args = parser.parse_args()
+
+    env = dict(os.environ, MONGO_HOST=args.service_host, REDIS_HOST=args.service_host)
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_ms = [s['import_ms'] for s in samples]
+    create_ms = [s['create_ms'] for s in samples]
+    budget_ms = samples[0]['budget_ms']
+    print(f"import      median={statistics.median(import_ms):7.1f}ms  max={max(import_ms):7.1f}ms")
+    print(f"create_app  median={statistics.median(create_ms):7.1f}ms  max={max(create_ms):7.1f}ms  "
+          f"budget={budget_ms:.0f}ms")
+
+    if statistics.median(create_ms) > budget_ms:
+        print("create_app is over the startup budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
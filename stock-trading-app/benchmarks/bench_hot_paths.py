@@ -0,0 +1,154 @@
+"""
+Micro-benchmarks of the quote, portfolio, trade, leaderboard and login paths.
+
+Runs in-process against the simulated market-data provider and, by default,
+in-memory MongoDB and Redis stand-ins (mongomock and fakeredis), so no network
+or external service is needed. Use --backend local to run against the MongoDB
+and Redis configured in the environment instead.
+
+Benchmarks:
+    portfolio_view[holdings=N]   get_user_portfolio for a portfolio of N holdings
+    buy_stock                    buy_stock into a rotating set of symbols
+    update_all_stock_prices[N]   a full price refresh of N stocks
+    leaderboard[rows=N]          Stock.get_leaderboard over N stocks
+    login                        POST /login with the right password
+
+Results are written as JSON; pass an earlier file with --compare to see the
+change in p50 latency per benchmark (the exit code is 1 if any regressed by
+more than --threshold).
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import random
+import sys
+
+import common
+
+from stock_trading import create_app  # noqa: E402
+from stock_trading.db import db  # noqa: E402
+from stock_trading.clients.alpha_vantage_client import update_all_stock_prices  # noqa: E402
+from stock_trading.clients.mongo_client import portfolio_trade_collection  # noqa: E402
+from stock_trading.models.mongo_session_model import buy_stock, get_user_portfolio  # noqa: E402
+from stock_trading.models.stock_model import Stock  # noqa: E402
+from stock_trading.models.user_model import Users  # noqa: E402
+
+
+def _symbols(count):
+    return [f"S{i:04d}" for i in range(count)]
+
+
+def _seed_portfolio(user_id, holdings, cash=10 ** 9):
+    portfolio_trade_collection.replace_one({'user_id': user_id}, {
+        'user_id': user_id,
+        'cash_balance': float(cash),
+        'holdings': [{'symbol': s, 'shares': 10, 'avg_purchase_price': 100.0} for s in _symbols(holdings)],
+    }, upsert=True)
+
+
+def _seed_stocks(count):
+    Stock.query.delete()
+    rng = random.Random(count)
+    db.session.add_all([
+        Stock(symbol=symbol, name=f"{symbol} Corp", quantity=rng.randint(1, 1000),
+              buy_price=rng.uniform(10, 500), current_price=rng.uniform(10, 500))
+        for symbol in _symbols(count)
+    ])
+    db.session.commit()
+
+
+def bench_portfolio_view(args):
+    results = []
+    for holdings in args.holdings:
+        user_id = 10 ** 6 + holdings
+        _seed_portfolio(user_id, holdings)
+        samples = common.measure(lambda: get_user_portfolio(user_id), args.iterations)
+        results.append({'name': f"portfolio_view[holdings={holdings}]", **common.summarize(samples)})
+    return results
+
+
+def bench_buy_stock(args):
+    user_id = 2 * 10 ** 6
+    _seed_portfolio(user_id, 0)
+    symbols = _symbols(20)
+    counter = iter(range(10 ** 9))
+    samples = common.measure(lambda: buy_stock(user_id, symbols[next(counter) % len(symbols)], 1, 100.0),
+                             args.iterations * 5)
+    return [{'name': 'buy_stock', **common.summarize(samples)}]
+
+
+def bench_update_prices(args):
+    results = []
+    for count in args.symbols:
+        _seed_stocks(count)
+        samples = common.measure(update_all_stock_prices, max(3, args.iterations // 10))
+        results.append({'name': f"update_all_stock_prices[{count}]", **common.summarize(samples),
+                        'symbols_per_sec': count * len(samples) / sum(samples)})
+    return results
+
+
+def bench_leaderboard(args):
+    results = []
+    for rows in args.leaderboard_rows:
+        _seed_stocks(rows)
+        db.session.expunge_all()
+        samples = common.measure(lambda: Stock.get_leaderboard('value'), max(3, args.iterations // 5))
+        results.append({'name': f"leaderboard[rows={rows}]", **common.summarize(samples)})
+    return results
+
+
+def bench_login(app, args):
+    Users.create_user('bench-user', 'bench-password')
+    client = app.test_client()
+
+    def login():
+        response = client.post('/login', data={'username': 'bench-user', 'password': 'bench-password'})
+        if response.status_code != 302:
+            raise RuntimeError(f"Login failed with status {response.status_code}")
+        client.get('/logout')
+
+    samples = common.measure(login, max(3, args.iterations // 5))
+    return [{'name': 'login', **common.summarize(samples)}]
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['fake', 'local'], default='fake',
+                        help='In-memory MongoDB/Redis stand-ins, or the services configured in the environment')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed calls per benchmark (scaled per benchmark)')
+    parser.add_argument('--holdings', type=_int_list, default=[1, 10, 50, 200], help='Portfolio sizes')
+    parser.add_argument('--symbols', type=_int_list, default=[10, 100, 500], help='Stock counts for the price refresh')
+    parser.add_argument('--leaderboard-rows', type=_int_list, default=[1000, 10000], help='Stock counts for the leaderboard')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated market-data latency per call')
+    parser.add_argument('--output', default='bench_hot_paths.json', help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed p50 slowdown before flagging (0.1 = 10%%)')
+    args = parser.parse_args()
+
+    app = create_app()
+    common.use_standins(args.backend, latency_ms=args.latency_ms)
+
+    results = []
+    with app.app_context():
+        db.create_all()
+        for bench in (bench_portfolio_view, bench_buy_stock, bench_update_prices, bench_leaderboard):
+            results.extend(bench(args))
+        results.extend(bench_login(app, args))
+
+    for result in results:
+        print(f"{result['name']:<40} n={result['n']:5d}  p50={result['p50_ms']:9.3f}ms  "
+              f"p99={result['p99_ms']:9.3f}ms  {result['ops_per_sec']:10.1f} ops/s")
+
+    common.write_results(args.output, 'bench_hot_paths', results,
+                         {k: v for k, v in vars(args).items() if k not in ('output', 'compare')})
+    if args.compare and not common.compare_results(args.compare, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
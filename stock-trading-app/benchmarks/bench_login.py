@@ -0,0 +1,126 @@
+"""
+Login latency under a credential-stuffing load.
+
+A pool of attacker threads posts wrong passwords for a mix of real and made-up
+usernames from a handful of addresses, while a smaller pool of legitimate users
+logs in with the right password from their own addresses. The run is repeated
+with the login throttle disabled and enabled, and p50/p99 latency is reported
+for each population.
+
+Requires the Redis service used by the app (e.g. `docker-compose up -d redis`).
+
+Usage:
+    python benchmarks/bench_login.py [--attackers 16] [--legit 4] [--requests 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+os.environ['DATABASE_URL'] = f"sqlite:///{_db_file.name}"
+
+from stock_trading import create_app  # noqa: E402
+from stock_trading.clients import login_throttle  # noqa: E402
+from stock_trading.clients.redis_client import redis_client  # noqa: E402
+from stock_trading.db import db  # noqa: E402
+from stock_trading.models.user_model import Users  # noqa: E402
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _seed_users(app, count):
+    with app.app_context():
+        for i in range(count):
+            salt, hashed = Users._generate_hashed_password(f"password-{i}")
+            db.session.add(Users(username=f"user{i}", salt=salt, password=hashed))
+        db.session.commit()
+
+
+def _clear_throttle():
+    for key in redis_client.scan_iter('login:fail:*'):
+        redis_client.delete(key)
+
+
+def _worker(app, requests, make_attempt, latencies, statuses):
+    client = app.test_client()
+    for _ in range(requests):
+        username, password, ip = make_attempt()
+        start = time.perf_counter()
+        response = client.post('/login', data={'username': username, 'password': password},
+                               environ_base={'REMOTE_ADDR': ip})
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses.append(response.status_code)
+        client.get('/logout')
+
+
+def run(app, args, throttled):
+    login_throttle.LOGIN_THROTTLE_ENABLED = throttled
+    _clear_throttle()
+
+    rng = random.Random(0)
+    attacker_ips = [f"203.0.113.{i}" for i in range(args.attacker_ips)]
+
+    def attack():
+        username = f"user{rng.randrange(args.users)}" if rng.random() < 0.5 else f"ghost{rng.randrange(10 ** 6)}"
+        return username, 'hunter2', rng.choice(attacker_ips)
+
+    def legit_attempt_for(i):
+        return lambda: (f"user{i}", f"password-{i}", f"198.51.100.{i}")
+
+    attack_latencies, attack_statuses = [], []
+    legit_latencies, legit_statuses = [], []
+    threads = [
+        threading.Thread(target=_worker, args=(app, args.requests, attack, attack_latencies, attack_statuses))
+        for _ in range(args.attackers)
+    ] + [
+        threading.Thread(target=_worker, args=(app, args.requests // 4, legit_attempt_for(i), legit_latencies, legit_statuses))
+        for i in range(args.legit)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    label = 'throttle on ' if throttled else 'throttle off'
+    for name, latencies, statuses in (('attack', attack_latencies, attack_statuses),
+                                      ('legit ', legit_latencies, legit_statuses)):
+        print(f"{label}  {name}  n={len(latencies):5d}  "
+              f"p50={statistics.median(latencies):7.2f}ms  p99={_percentile(latencies, 99):7.2f}ms  "
+              f"429s={statuses.count(429):5d}")
+    print(f"{label}  total {len(attack_latencies) + len(legit_latencies)} requests in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50, help='Number of real accounts to seed')
+    parser.add_argument('--attackers', type=int, default=16, help='Concurrent attacker threads')
+    parser.add_argument('--attacker-ips', type=int, default=4, help='Distinct attacker addresses')
+    parser.add_argument('--legit', type=int, default=4, help='Concurrent legitimate users')
+    parser.add_argument('--requests', type=int, default=200, help='Login attempts per attacker thread')
+    args = parser.parse_args()
+
+    app = create_app()
+    _seed_users(app, args.users)
+
+    try:
+        run(app, args, throttled=False)
+        run(app, args, throttled=True)
+    finally:
+        _clear_throttle()
+        os.unlink(_db_file.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Shared setup for the benchmark and load-generation scripts.
+
+Importing this module points the app at a throwaway SQLite file and quietens
+logging; call use_standins() after creating the app to swap in the simulated
+market-data provider and, for the "fake" backend, in-memory MongoDB and Redis.
+"""
+import atexit
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if 'DATABASE_URL' not in os.environ:
+    _db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    _db_file.close()
+    os.environ['DATABASE_URL'] = f"sqlite:///{_db_file.name}"
+    atexit.register(lambda: os.path.exists(_db_file.name) and os.unlink(_db_file.name))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('SESSION_BACKEND', 'cookie')
+
+
+def use_standins(backend: str = 'fake', seed: int = 0, latency_ms: float = 0.0,
+                 error_rate: float = 0.0) -> None:
+    """
+    Run the app against local stand-ins.
+
+    Args:
+        backend (str): "fake" for mongomock and fakeredis (in
+            requirements-dev.txt), or "local" for the MongoDB and Redis configured in the
+            environment.
+        seed (int): Seed of the simulated market-data provider.
+        latency_ms (float): Simulated upstream latency per market-data call.
+        error_rate (float): Fraction of simulated market-data calls that fail.
+    """
+    from stock_trading.clients import mongo_client, redis_client
+    from stock_trading.clients.market_data import SimulatedProvider, set_provider
+
+    if backend == 'fake':
+        try:
+            import fakeredis
+            import mongomock
+        except ImportError:
+            sys.exit("The fake backend needs mongomock and fakeredis: pip install -r requirements-dev.txt")
+        mongo_client.set_client(mongomock.MongoClient())
+        redis_client.set_redis_client(fakeredis.FakeStrictRedis())
+    elif backend != 'local':
+        sys.exit(f"Unknown backend: {backend}")
+
+    set_provider(SimulatedProvider(seed=seed, latency_ms=latency_ms, error_rate=error_rate))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(samples: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """
+    Summarize latencies (seconds) as milliseconds, plus throughput.
+
+    Args:
+        samples (list[float]): One latency per operation.
+        elapsed (float, optional): Wall time of the whole run, if operations
+            overlapped; defaults to the sum of the samples.
+
+    Returns:
+        dict: n, mean, p50, p95, p99, min and max (ms) and ops_per_sec.
+    """
+    elapsed = elapsed if elapsed is not None else sum(samples)
+    return {
+        'n': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+        'ops_per_sec': len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+def measure(operation: Callable[[], Any], iterations: int, warmup: int = 1) -> List[float]:
+    """
+    Time an operation repeatedly.
+
+    Args:
+        operation (Callable): The code to time.
+        iterations (int): How many timed calls to make.
+        warmup (int): Untimed calls made first.
+
+    Returns:
+        list[float]: The duration of each timed call, in seconds.
+    """
+    for _ in range(warmup):
+        operation()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code a run was made on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def write_results(path: str, suite: str, results: List[Dict[str, Any]], settings: Dict[str, Any]) -> None:
+    """
+    Write a run's results as JSON for later comparison.
+
+    Args:
+        path (str): The output file.
+        suite (str): The name of the benchmark script.
+        results (list[dict]): One entry per benchmark, each with a unique 'name'.
+        settings (dict): The options the run was made with.
+    """
+    with open(path, 'w') as f:
+        json.dump({'suite': suite, 'environment': environment(), 'settings': settings, 'results': results},
+                  f, indent=2)
+    print(f"Results written to {path}")
+
+
+def compare_results(baseline_path: str, results: List[Dict[str, Any]], threshold: float) -> bool:
+    """
+    Print how a run compares with a baseline file.
+
+    A benchmark regresses when its p50 latency grew by more than `threshold`
+    (a fraction, e.g. 0.1 for 10%).
+
+    Args:
+        baseline_path (str): A file written by write_results().
+        results (list[dict]): The current results.
+        threshold (float): The allowed relative slowdown.
+
+    Returns:
+        bool: True if no benchmark regressed.
+    """
+    with open(baseline_path) as f:
+        baseline = {r['name']: r for r in json.load(f)['results']}
+
+    ok = True
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get(result['name'])
+        if before is None or not before['p50_ms']:
+            continue
+        change = result['p50_ms'] / before['p50_ms'] - 1
+        regressed = change > threshold
+        ok = ok and not regressed
+        print(f"  {result['name']:<40} p50 {before['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms "
+              f"({change:+.1%}){'  REGRESSION' if regressed else ''}")
+    return ok
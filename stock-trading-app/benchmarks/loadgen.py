@@ -0,0 +1,299 @@
+"""
+Load generator driving scripted user sessions through the web routes.
+
+Each virtual user registers (or reuses an account seeded with
+`flask create-users --generate`), logs in, and then repeats a trading
+journey until the run ends:
+
+    lookup -> buy -> confirm_buy -> portfolio -> sell -> confirm_sell
+
+with a random think time between steps. Throughput, latency percentiles and
+error rates are reported per step.
+
+Two targets are supported:
+    --target wsgi        (default) the app runs in this process, on the simulated
+                         market-data provider with mongomock and fakeredis, or
+                         with --backend local the MongoDB and Redis configured in
+                         the environment.
+    --url http://host    a running server, e.g. a local gunicorn started with
+                         MARKET_DATA_PROVIDER=simulated so it runs offline.
+
+Pass several concurrency levels with --sweep to find the saturation point:
+each level runs for --duration seconds and a summary line is printed per level.
+
+Usage:
+    python benchmarks/loadgen.py [--users 8] [--duration 30] [--think-time 0.5]
+    python benchmarks/loadgen.py --url http://localhost:5000 --sweep 1,2,4,8,16,32
+"""
+import argparse
+import re
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import common
+
+STEPS = ['register', 'login', 'lookup', 'buy', 'confirm_buy', 'portfolio', 'sell', 'confirm_sell']
+
+SYMBOLS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'JPM', 'V', 'XOM', 'JNJ', 'WMT']
+
+PRICE_FIELD = re.compile(r'name="price" value="([^"]+)"')
+
+Response = Tuple[int, str, str]
+
+
+class WsgiSession:
+    """One user's cookie jar against the in-process app."""
+
+    def __init__(self, app, remote_addr: str):
+        self.client = app.test_client()
+        self.environ = {'REMOTE_ADDR': remote_addr}
+
+    def get(self, path: str) -> Response:
+        response = self.client.get(path, environ_base=self.environ)
+        return response.status_code, response.get_data(as_text=True), response.headers.get('Location', '')
+
+    def post(self, path: str, data: Dict[str, str]) -> Response:
+        response = self.client.post(path, data=data, environ_base=self.environ)
+        return response.status_code, response.get_data(as_text=True), response.headers.get('Location', '')
+
+
+class HttpSession:
+    """One user's cookie jar against a running server."""
+
+    def __init__(self, base_url: str, remote_addr: str):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+        # Lets a trusting proxy spread users over addresses for the login throttle
+        self.session.headers['X-Forwarded-For'] = remote_addr
+
+    def get(self, path: str) -> Response:
+        response = self.session.get(self.base_url + path, allow_redirects=False, timeout=30)
+        return response.status_code, response.text, response.headers.get('Location', '')
+
+    def post(self, path: str, data: Dict[str, str]) -> Response:
+        response = self.session.post(self.base_url + path, data=data, allow_redirects=False, timeout=30)
+        return response.status_code, response.text, response.headers.get('Location', '')
+
+
+class Recorder:
+    """Collects latencies and outcomes per step, from all virtual users."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, seconds: float, error: Optional[str]) -> None:
+        with self._lock:
+            self.latencies[step].append(seconds)
+            if error:
+                self.errors[step] += 1
+                self.error_samples.setdefault(step, error)
+
+
+class VirtualUser(threading.Thread):
+    """
+    Run one user's session until the deadline.
+
+    Args:
+        number (int): The user's index, used for its address and seeded username.
+        make_session: Builds the HTTP or in-process session for this user.
+        recorder (Recorder): Where to record each step.
+        args: The command-line options.
+        deadline (float): perf_counter() time at which to stop.
+    """
+
+    def __init__(self, number: int, make_session, recorder: Recorder, args, deadline: float):
+        super().__init__(name=f"vuser-{number}", daemon=True)
+        self.number = number
+        self.session = make_session(f"10.{number // 65536 % 256}.{number // 256 % 256}.{number % 256}")
+        self.recorder = recorder
+        self.args = args
+        self.deadline = deadline
+        self.rng = random.Random(args.seed * 100003 + number)
+
+    def think(self) -> None:
+        if self.args.think_time > 0:
+            time.sleep(min(self.rng.expovariate(1 / self.args.think_time), self.args.think_time * 10))
+
+    def step(self, name: str, request, check) -> Optional[Response]:
+        """Time one request; `check` returns an error message or None."""
+        if time.perf_counter() >= self.deadline:
+            return None
+        started = time.perf_counter()
+        try:
+            response = request()
+            error = check(response)
+        except Exception as e:
+            response, error = None, f"{type(e).__name__}: {e}"
+        self.recorder.record(name, time.perf_counter() - started, error)
+        self.think()
+        return None if error else response
+
+    def run(self) -> None:
+        args = self.args
+        if args.existing_users:
+            username = f"{args.user_prefix}{self.number % args.existing_users}"
+            password = args.user_password
+        else:
+            username = f"{args.user_prefix}{uuid.uuid4().hex[:12]}"
+            password = args.user_password
+            registered = self.step('register', lambda: self.session.post('/register', {
+                'username': username, 'password': password, 'confirm_password': password,
+            }), lambda r: None if r[0] == 302 and r[2].endswith('/login') else f"status {r[0]}")
+            if registered is None:
+                return
+
+        logged_in = self.step('login', lambda: self.session.post('/login', {
+            'username': username, 'password': password,
+        }), lambda r: None if r[0] == 302 and '/login' not in r[2] else f"status {r[0]}")
+        if logged_in is None:
+            return
+
+        def page(r):
+            return None if r[0] == 200 else f"status {r[0]}"
+
+        def confirm_page(r):
+            if r[0] != 200:
+                return f"status {r[0]}"
+            return None if PRICE_FIELD.search(r[1]) else 'no confirmation form'
+
+        def executed(r):
+            return None if r[0] == 302 and r[2].endswith('/portfolio') else f"status {r[0]} -> {r[2] or 'no redirect'}"
+
+        while time.perf_counter() < self.deadline:
+            symbol = self.rng.choice(SYMBOLS)
+            shares = str(self.rng.randint(1, 5))
+
+            if self.step('lookup', lambda: self.session.post('/lookup', {'symbol': symbol}), page) is None:
+                continue
+            confirm = self.step('buy', lambda: self.session.post('/buy', {'symbol': symbol, 'shares': shares}),
+                                confirm_page)
+            if confirm is None:
+                continue
+            price = PRICE_FIELD.search(confirm[1]).group(1)
+            if self.step('confirm_buy', lambda: self.session.post('/execute-buy', {
+                    'symbol': symbol, 'shares': shares, 'price': price}), executed) is None:
+                continue
+            if self.step('portfolio', lambda: self.session.get('/portfolio'), page) is None:
+                continue
+            confirm = self.step('sell', lambda: self.session.post('/sell', {'symbol': symbol, 'shares': shares}),
+                                confirm_page)
+            if confirm is None:
+                continue
+            price = PRICE_FIELD.search(confirm[1]).group(1)
+            self.step('confirm_sell', lambda: self.session.post('/execute-sell', {
+                'symbol': symbol, 'shares': shares, 'price': price}), executed)
+
+
+def run_level(make_session, users: int, args) -> Tuple[Recorder, float]:
+    """Run `users` concurrent virtual users for args.duration seconds."""
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.ramp_up + args.duration
+    threads = []
+    for number in range(users):
+        thread = VirtualUser(number, make_session, recorder, args, deadline)
+        thread.start()
+        threads.append(thread)
+        if args.ramp_up:
+            time.sleep(args.ramp_up / users)
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def report(recorder: Recorder, elapsed: float, users: int) -> List[dict]:
+    results = []
+    print(f"\n{users} users, {elapsed:.1f}s")
+    print(f"  {'step':<14}{'n':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for step in STEPS + sorted(set(recorder.latencies) - set(STEPS)):
+        samples = recorder.latencies.get(step)
+        if not samples:
+            continue
+        summary = common.summarize(samples, elapsed)
+        error_rate = recorder.errors[step] / len(samples)
+        results.append({'name': f"{step}[users={users}]", 'step': step, 'users': users,
+                        **summary, 'error_rate': error_rate})
+        print(f"  {step:<14}{summary['n']:>7}{summary['ops_per_sec']:>9.1f}{summary['p50_ms']:>10.1f}"
+              f"{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}{error_rate:>8.1%}")
+    total = sum(len(s) for s in recorder.latencies.values())
+    errors = sum(recorder.errors.values())
+    print(f"  total {total} requests, {total / elapsed:.1f} req/s, {errors / max(total, 1):.2%} errors")
+    for step, message in recorder.error_samples.items():
+        print(f"  first {step} error: {message}")
+    return results
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Base URL of a running server (default: drive the app in-process)')
+    parser.add_argument('--backend', choices=['fake', 'local'], default='fake',
+                        help='In-process only: in-memory MongoDB/Redis stand-ins, or configured services')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--sweep', type=_int_list, help='Run each of these concurrency levels in turn (overrides --users)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run each level after ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Seconds over which to start the users')
+    parser.add_argument('--think-time', type=float, default=0.5,
+                        help='Mean pause between steps in seconds (exponential; 0 for a closed loop)')
+    parser.add_argument('--existing-users', type=int, default=0,
+                        help='Log in as <prefix>0..N-1 (seeded with flask create-users --generate) instead of registering')
+    parser.add_argument('--user-prefix', default='loadtest', help='Username prefix')
+    parser.add_argument('--user-password', default='loadtest-password', help='Password of the virtual users')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='In-process only: simulated market-data latency')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the journeys')
+    parser.add_argument('--output', help='Write the per-step results as JSON')
+    args = parser.parse_args()
+
+    if args.url:
+        def make_session(addr):
+            return HttpSession(args.url, addr)
+    else:
+        from stock_trading import create_app
+        from stock_trading.db import db
+
+        app = create_app()
+        common.use_standins(args.backend, seed=args.seed, latency_ms=args.latency_ms)
+        with app.app_context():
+            db.create_all()
+
+        def make_session(addr):
+            return WsgiSession(app, addr)
+
+    results = []
+    levels = args.sweep or [args.users]
+    summary = []
+    for users in levels:
+        recorder, elapsed = run_level(make_session, users, args)
+        level_results = report(recorder, elapsed, users)
+        results.extend(level_results)
+        total = sum(len(s) for s in recorder.latencies.values())
+        all_samples = [s for samples in recorder.latencies.values() for s in samples]
+        summary.append((users, total / elapsed, common.percentile(all_samples, 99) * 1000 if all_samples else 0.0,
+                        sum(recorder.errors.values()) / max(total, 1)))
+
+    if len(levels) > 1:
+        print(f"\n  {'users':>6}{'req/s':>10}{'p99 ms':>10}{'errors':>9}")
+        for users, throughput, p99, error_rate in summary:
+            print(f"  {users:>6}{throughput:>10.1f}{p99:>10.1f}{error_rate:>8.1%}")
+
+    if args.output:
+        common.write_results(args.output, 'loadgen', results,
+                             {k: v for k, v in vars(args).items() if k != 'output'})
+    if not any(r['n'] for r in results):
+        sys.exit("No requests completed")
+
+
+if __name__ == '__main__':
+    main()
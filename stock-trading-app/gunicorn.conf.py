@@ -0,0 +1,97 @@
+"""
+Gunicorn settings for production serving.
+
+Start with:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment. The defaults suit an
+I/O-bound app: one process per core, each with a pool of threads that wait on
+the quote provider, MongoDB and Redis concurrently. Set
+GUNICORN_WORKER_CLASS=gevent for cooperative workers instead (install
+requirements-gevent.txt first).
+"""
+import multiprocessing
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    # The .envtemplate ships some of these empty; treat that as unset
+    return int(os.getenv(name) or default)
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Processes scale with cores; threads per process cover the time spent waiting on I/O
+workers = _int_env('WEB_CONCURRENCY', multiprocessing.cpu_count())
+worker_class = os.getenv('GUNICORN_WORKER_CLASS') or 'gthread'
+threads = _int_env('GUNICORN_THREADS', 8)
+
+# Cooperative mode (GUNICORN_WORKER_CLASS=gevent): each request runs in a greenlet
+# and yields while it waits on the quote provider, MongoDB or Redis, so one
+# worker can hold up to worker_connections slow requests at once
+worker_connections = _int_env('GUNICORN_WORKER_CONNECTIONS', 1000)
+if worker_class == 'gevent':
+    # Patch before the app is preloaded, so every socket, lock, sleep and thread
+    # it creates (pymongo, redis-py and requests included) is cooperative
+    try:
+        from gevent import monkey
+    except ImportError:
+        raise RuntimeError("GUNICORN_WORKER_CLASS=gevent needs the packages in requirements-gevent.txt") from None
+    monkey.patch_all()
+    try:
+        # psycopg2 is a C extension; without this, PostgreSQL queries block the worker
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass
+# Pending connections the kernel queues before gunicorn accepts them
+backlog = _int_env('GUNICORN_BACKLOG', 2048)
+
+# Import the app once in the master so workers fork with the code already loaded.
+# The hooks below give every worker its own database and cache connections.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Kill a worker stuck on one request for this long; on SIGTERM or HUP, let
+# in-flight requests finish for up to graceful_timeout
+timeout = _int_env('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _int_env('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Keep idle client connections open this long; set it above the idle timeout of
+# any load balancer in front so the balancer closes first
+keepalive = _int_env('GUNICORN_KEEPALIVE', 75)
+
+# Recycle workers after this many requests (0 = never), staggered by the jitter
+max_requests = _int_env('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = _int_env('GUNICORN_MAX_REQUESTS_JITTER', 0)
+
+# Proxies whose X-Forwarded-Proto is trusted
+forwarded_allow_ips = os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    Drop any client inherited from the master so each worker opens its own.
+
+    MongoClient and redis-py connection pools are not fork-safe, and pooled
+    SQL connections must not be shared between processes. Per-process metrics
+    start empty. (The logging writer thread restarts itself after fork.)
+    """
+    from stock_trading.clients.mongo_client import reset_client
+    from stock_trading.clients.redis_client import reset_redis_client
+    from stock_trading.db import db
+    from stock_trading.utils.metrics import metrics
+
+    reset_client(close=False)
+    reset_redis_client(close=False)
+    metrics.reset()
+
+    app = getattr(server.app, 'callable', None) if preload_app else None
+    if app is not None:
+        with app.app_context():
+            for engine in db.engines.values():
+                # close=False leaves the parent's sockets alone and just forgets them
+                engine.dispose(close=False)
+    server.log.info("Worker %s initialized its clients", worker.pid)
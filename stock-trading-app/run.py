@@ -1,6 +1,10 @@
 from stock_trading import create_app
+from stock_trading.cli import bootstrap
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # The development server sets up its own schema; deployments run `flask bootstrap`
+    with app.app_context():
+        bootstrap()
+    app.run(debug=True)
@@ -1,22 +1,78 @@
+import logging
+import os
+import time
+
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
+from flask.logging import default_handler
 from flask_login import LoginManager
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
-#db = SQLAlchemy()
+from config import ProductionConfig
 from stock_trading.db import db
+from stock_trading.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
 login_manager = LoginManager()
 
-def create_app():
+# Creating the app must not wait on MongoDB, Redis or DDL; warn if it grows past this
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 500))
+
+
+def create_app(config_class=ProductionConfig):
+    """
+    Create the application: the JSON API plus the server-rendered pages.
+
+    No external service is contacted here. MongoDB and Redis clients are
+    created on first use, and tables and indexes are set up by the explicit
+    `flask bootstrap` command rather than on every worker start.
+
+    Args:
+        config_class: The configuration object to load (defaults to ProductionConfig).
+
+    Returns:
+        Flask: The configured application.
+    """
+    started = time.perf_counter()
     app = Flask(__name__)
-    
-    # Configure the Flask app
-    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev')
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///stock_trading.db')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.from_object(config_class)
+
+    # Behind a load balancer, take the client address (used by the login throttle) from X-Forwarded-For
+    hops = app.config.get('PROXY_FIX_HOPS', 0)
+    if hops:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    # Send app.logger through the shared queue instead of Flask's synchronous handler
+    app.logger.removeHandler(default_handler)
+    configure_logger(app.logger)
+
+    # Keep sessions server-side in Redis unless SESSION_BACKEND=cookie
+    if app.config.get('SESSION_BACKEND', 'redis') == 'redis':
+        from stock_trading.sessions import RedisSessionInterface
+        app.session_interface = RedisSessionInterface()
+
+    # Time every request into /api/metrics
+    from stock_trading.utils.metrics import init_request_metrics
+    init_request_metrics(app)
+
+    # Profile sampled requests when PROFILING_ENABLED is set (no hooks otherwise)
+    from stock_trading.utils.profiling import init_profiling
+    init_profiling(app)
+
+    # Serialize JSON with orjson, and compress large text responses (registered
+    # last so it runs before the timing hooks above and they include it)
+    from stock_trading.utils.json_provider import init_json_provider
+    from stock_trading.utils.compression import init_compression
+    init_json_provider(app)
+    init_compression(app)
+
+    # {% cache %} blocks in templates, kept per FRAGMENT_CACHE_BACKEND
+    from stock_trading.utils.fragment_cache import init_fragment_cache
+    init_fragment_cache(app)
 
     # Initialize extensions
     db.init_app(app)
@@ -28,20 +84,29 @@ def create_app():
     
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.get(int(user_id))
+        return Users.load_identity(int(user_id))
 
     # Register blueprints
+    from stock_trading.routes.api import api
     from stock_trading.routes.portfolio import portfolio
     from stock_trading.routes.auth import auth 
     from stock_trading.routes.trade import trade
     from stock_trading.routes.lookup import lookup
+    app.register_blueprint(api)
     app.register_blueprint(portfolio)
     app.register_blueprint(auth)
     app.register_blueprint(trade)
     app.register_blueprint(lookup)
 
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands
+    from stock_trading.cli import register_commands
+    register_commands(app)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    app.config['STARTUP_TIME_MS'] = elapsed_ms
+    if elapsed_ms > STARTUP_BUDGET_MS:
+        logger.warning("App creation took %.1f ms, over the %.0f ms startup budget", elapsed_ms, STARTUP_BUDGET_MS)
+    else:
+        logger.info("App created in %.1f ms", elapsed_ms)
 
-    return app
\ No newline at end of file
+    return app
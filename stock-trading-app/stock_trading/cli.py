@@ -0,0 +1,145 @@
+import click
+from flask import Flask
+
+
+# Encoded KDF hashes need more room than the SHA-256 hex digests the column was sized for
+PASSWORD_COLUMN_LENGTH = 255
+
+
+def widen_password_column() -> bool:
+    """
+    Grow users.password to PASSWORD_COLUMN_LENGTH on databases created before it was widened.
+
+    create_all() does not alter existing tables. SQLite does not enforce
+    VARCHAR lengths, so only server databases are changed. Requires an app
+    context.
+
+    Returns:
+        bool: True if the column was altered.
+    """
+    from sqlalchemy import inspect, text
+    from stock_trading.db import db
+
+    engine = db.engine
+    if engine.dialect.name == 'sqlite' or not inspect(engine).has_table('users'):
+        return False
+    column = next(c for c in inspect(engine).get_columns('users') if c['name'] == 'password')
+    length = getattr(column['type'], 'length', None)
+    if length is None or length >= PASSWORD_COLUMN_LENGTH:
+        return False
+
+    if engine.dialect.name == 'postgresql':
+        statement = f"ALTER TABLE users ALTER COLUMN password TYPE VARCHAR({PASSWORD_COLUMN_LENGTH})"
+    elif engine.dialect.name in ('mysql', 'mariadb'):
+        statement = f"ALTER TABLE users MODIFY password VARCHAR({PASSWORD_COLUMN_LENGTH}) NOT NULL"
+    else:
+        raise RuntimeError(f"Widen users.password to VARCHAR({PASSWORD_COLUMN_LENGTH}) manually on {engine.dialect.name}")
+    with engine.begin() as connection:
+        connection.execute(text(statement))
+    return True
+
+
+def bootstrap() -> None:
+    """
+    Create the SQL tables and MongoDB indexes the application needs.
+
+    All steps are idempotent. Run this once per deployment (or from run.py in
+    development) instead of on every app start. Requires an app context.
+    """
+    from stock_trading.clients.mongo_client import ensure_indexes
+    from stock_trading.db import db
+
+    db.create_all()
+    widen_password_column()
+    ensure_indexes()
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Register the application's Flask CLI commands.
+
+    Args:
+        app (Flask): The application to register commands on.
+    """
+
+    @app.cli.command('bootstrap')
+    def bootstrap_command():
+        """Create database tables and MongoDB indexes."""
+        bootstrap()
+        click.echo("Bootstrap complete")
+
+    @app.cli.command('warm-overviews')
+    @click.argument('symbols_file', type=click.File())
+    @click.option('--workers', default=4, show_default=True, help='Concurrent upstream requests.')
+    @click.option('--force', is_flag=True, help='Refetch symbols that are already cached.')
+    def warm_overviews(symbols_file, workers, force):
+        """Warm the company overview cache from SYMBOLS_FILE.
+
+        The file may be a plain list with one symbol per line or a CSV whose
+        first column is the symbol (such as a listing-status dump).
+        """
+        from stock_trading.clients.alpha_vantage_client import warm_overview_cache
+
+        symbols = [line.split(',')[0] for line in symbols_file]
+        symbols = [s for s in symbols if s.strip() and s.strip().lower() != 'symbol']
+        summary = warm_overview_cache(symbols, max_workers=workers, force=force)
+        click.echo(f"cached={len(summary['cached'])} skipped={len(summary['skipped'])} "
+                   f"errors={len(summary['errors'])}")
+
+    @app.cli.command('load-symbols')
+    @click.option('--path', default=None, help='CSV path (defaults to SYMBOL_DIRECTORY_PATH).')
+    @click.option('--download', is_flag=True, help='Fetch a fresh listing-status dump first.')
+    def load_symbols(path, download):
+        """Load the local symbol directory, optionally downloading a fresh dump."""
+        from stock_trading.clients.alpha_vantage_client import download_listing_status
+        from stock_trading.clients.symbol_directory import SYMBOL_DIRECTORY_PATH, symbol_directory
+
+        path = path or SYMBOL_DIRECTORY_PATH
+        if download:
+            download_listing_status(path)
+        click.echo(f"Loaded {symbol_directory.load_csv(path)} symbols from {path}")
+
+
+    @app.cli.command('create-users')
+    @click.argument('users_file', type=click.File(), required=False)
+    @click.option('--generate', type=int, default=0, help='Generate N users instead of reading a file.')
+    @click.option('--prefix', default='loadtest', show_default=True, help='Username prefix for --generate.')
+    @click.option('--password', default='loadtest-password', show_default=True, help='Password for --generate.')
+    @click.option('--batch-size', default=1000, show_default=True, help='Users per transaction.')
+    @click.option('--workers', type=int, default=None, help='Password hashing processes.')
+    def create_users(users_file, generate, prefix, password, batch_size, workers):
+        """Register users in bulk from a USERS_FILE of "username,password" lines, or generate them.
+
+        Each batch is created atomically; a failed batch stops the run and is
+        left out entirely, while earlier batches stay committed.
+        """
+        import multiprocessing
+        import time
+        from concurrent.futures import ProcessPoolExecutor
+
+        from stock_trading.models.user_model import PASSWORD_HASH_WORKERS, Users
+
+        if generate:
+            credentials = [(f"{prefix}{i}", password) for i in range(generate)]
+        elif users_file:
+            credentials = []
+            for lineno, line in enumerate(users_file, start=1):
+                if not line.strip():
+                    continue
+                username, sep, user_password = line.rstrip('\r\n').partition(',')
+                if not sep or not username or not user_password:
+                    raise click.BadParameter(f"line {lineno}: expected \"username,password\"",
+                                             param_hint='USERS_FILE')
+                credentials.append((username, user_password))
+        else:
+            raise click.UsageError("Provide USERS_FILE or --generate N")
+
+        started = time.perf_counter()
+        created = 0
+        workers = workers or PASSWORD_HASH_WORKERS
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for start in range(0, len(credentials), batch_size):
+                batch = credentials[start:start + batch_size]
+                created += len(Users.create_users_bulk(batch, workers=workers, executor=pool))
+                click.echo(f"created {created}/{len(credentials)} users")
+        click.echo(f"Created {created} users in {time.perf_counter() - started:.1f}s")
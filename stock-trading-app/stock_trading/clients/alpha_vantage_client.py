@@ -1,10 +1,32 @@
 import requests
 import os
-from typing import Optional, Dict, Any 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List, Set
 import logging 
 
+from stock_trading.clients.market_data import (
+    MarketDataProvider,
+    ProviderError,
+    get_provider,
+    register_provider
+)
+from stock_trading.clients.overview_cache import (
+    OVERVIEW_REVALIDATE_AFTER,
+    get_cached_overview,
+    get_negative,
+    store_negative,
+    store_overview
+)
+from stock_trading.clients.quote_cache import get_last_quote, store_last_quote
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.clients.symbol_directory import symbol_directory
 from stock_trading.models.stock_model import Stock
-from stock_trading.utils.logger import configure_logger
+from stock_trading.utils.circuit_breaker import CircuitBreaker
+from stock_trading.utils.logger import configure_logger, truncated
+from stock_trading.utils.metrics import metrics, record_cache
+from stock_trading.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
@@ -13,10 +35,122 @@ configure_logger(logger)
 ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY')
 
 BASE_URL = "https://www.alphavantage.co/query"
+ALPHA_VANTAGE_TIMEOUT = float(os.getenv('ALPHA_VANTAGE_TIMEOUT', 10))
+
+# Share one upstream call between concurrent identical requests; optionally
+# across worker processes as well, coordinated through Redis. Across processes
+# a result is reused for ALPHA_VANTAGE_COALESCE_RESULT_TTL seconds after it arrives.
+ALPHA_VANTAGE_COALESCE_ACROSS_PROCESSES = os.getenv('ALPHA_VANTAGE_COALESCE_ACROSS_PROCESSES', 'false').lower() == 'true'
+ALPHA_VANTAGE_COALESCE_RESULT_TTL = float(os.getenv('ALPHA_VANTAGE_COALESCE_RESULT_TTL', 2))
+# Waiters give up a little after the leader's own request would have timed out
+_single_flight = SingleFlight(redis_client if ALPHA_VANTAGE_COALESCE_ACROSS_PROCESSES else None,
+                              result_ttl=ALPHA_VANTAGE_COALESCE_RESULT_TTL,
+                              wait_timeout=ALPHA_VANTAGE_TIMEOUT + 5)
+
+# Fail fast on quotes once the upstream keeps failing, serving last known prices instead
+QUOTE_BREAKER_THRESHOLD = int(os.getenv('QUOTE_BREAKER_THRESHOLD', 5))
+QUOTE_BREAKER_RESET = float(os.getenv('QUOTE_BREAKER_RESET', 30))
+_quote_breaker = CircuitBreaker('quotes', QUOTE_BREAKER_THRESHOLD, QUOTE_BREAKER_RESET)
+
+
+def _query(function: str, symbol: str, **params: Any) -> Dict[str, Any]:
+    """
+    Call an Alpha Vantage function, coalescing identical in-flight calls.
+
+    Args:
+        function (str): The Alpha Vantage function (e.g. 'GLOBAL_QUOTE').
+        symbol (str): The stock symbol.
+        params: Any additional query parameters.
+
+    Returns:
+        dict: The decoded JSON response, shared between coalesced callers.
+
+    Raises:
+        requests.exceptions.RequestException: If the HTTP request fails, or
+            an in-flight call being waited on does not finish in time.
+    """
+    key = ':'.join([function, symbol] + [f"{k}={v}" for k, v in sorted(params.items())])
+
+    def fetch() -> Dict[str, Any]:
+        with metrics.timer('upstream_request_duration_seconds', provider='alpha_vantage', function=function):
+            response = requests.get(BASE_URL, params={
+                'function': function,
+                'symbol': symbol,
+                **params,
+                'apikey': ALPHA_VANTAGE_API_KEY
+            }, timeout=ALPHA_VANTAGE_TIMEOUT)
+            response.raise_for_status()
+            return response.json()
+
+    try:
+        return _single_flight.do(key, fetch)
+    except TimeoutError as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+
+
+class AlphaVantageProvider(MarketDataProvider):
+    """Market data from the Alpha Vantage HTTP API."""
+
+    name = 'alpha_vantage'
+
+    def get_quote(self, symbol: str) -> float:
+        data = _query('GLOBAL_QUOTE', symbol)
+        
+        logger.debug("API Response for %s: %s", symbol, truncated(data))  # Debug log
+
+        # Throttled or rejected requests come back as 200s carrying a message
+        if "Note" in data or "Information" in data:
+            logger.error("Alpha Vantage rejected request for %s: %s", symbol, truncated(data))
+            raise ProviderError("Alpha Vantage request limit reached")
+        
+        if "Global Quote" not in data:
+            logger.error("Missing 'Global Quote' in response: %s", truncated(data))
+            raise ValueError("Invalid API response format")
+            
+        quote = data["Global Quote"]
+        if not quote:
+            logger.error("Empty quote data for symbol %s", symbol)
+            raise ValueError("No quote data available")
+            
+        price = quote.get("05. price")
+        if not price:
+            logger.error("No price found in quote data: %s", truncated(quote))
+            raise ValueError("Price not found in quote data")
+
+        return float(price)
+
+    def get_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
+        data = _query('OVERVIEW', symbol)
+
+        logger.debug("API Response for %s info: %s", symbol, truncated(data))  # Debug log
+
+        if "Note" in data or "Information" in data:
+            logger.error("Alpha Vantage rejected request for %s: %s", symbol, truncated(data))
+            raise ProviderError("Alpha Vantage request limit reached")
+
+        if not data.get('Symbol'):
+            return None
+        return {
+            'symbol': data['Symbol'],
+            'name': data.get('Name', symbol),
+            'description': data.get('Description', 'No description available'),
+            'exchange': data.get('Exchange', 'Unknown'),
+            'sector': data.get('Sector', 'Unknown'),
+            'industry': data.get('Industry', 'Unknown')
+        }
+
+    def get_daily_series(self, symbol: str, output_size: str = 'compact') -> Dict[str, Dict[str, str]]:
+        return _query("TIME_SERIES_DAILY_ADJUSTED", symbol, outputsize=output_size)["Time Series (Daily)"]
+
+
+register_provider('alpha_vantage', AlphaVantageProvider)
 
 def validate_stock_symbol(symbol: str) -> bool:
     """
     Validate if a stock symbol exists and is tradeable.
+
+    Answered from the local symbol directory when one is available; otherwise
+    falls back to a GLOBAL_QUOTE request.
     
     Args:
         symbol (str): The stock symbol to validate
@@ -25,34 +159,51 @@ def validate_stock_symbol(symbol: str) -> bool:
         bool: True if the symbol is valid, False otherwise
     """
     logger.info("Validating stock symbol: %s", symbol)
+
+    if symbol_directory.ensure_loaded():
+        valid = symbol in symbol_directory
+        if not valid:
+            logger.warning("Invalid stock symbol: %s", symbol)
+        return valid
     
     try:
-        params = {
-            'function': 'GLOBAL_QUOTE',
-            'symbol': symbol,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-        
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        data = response.json()
-        
-        # Check if we got valid data back
-        if "Global Quote" in data and data["Global Quote"]:
-            logger.info("Stock symbol %s is valid", symbol)
-            return True
-        else:
-            logger.warning("Invalid stock symbol: %s", symbol)
-            return False
-            
-    except requests.exceptions.RequestException as e:
+        get_provider().get_quote(symbol)
+        logger.info("Stock symbol %s is valid", symbol)
+        return True
+    except ValueError:
+        logger.warning("Invalid stock symbol: %s", symbol)
+        return False
+    except (ProviderError, requests.exceptions.RequestException) as e:
         logger.error("Error validating stock symbol %s: %s", symbol, str(e))
         return False
 
+def download_listing_status(path: str) -> None:
+    """
+    Download the listing-status CSV used to build the local symbol directory.
+
+    Args:
+        path (str): Where to write the CSV file.
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails.
+    """
+    logger.info("Downloading listing status to %s", path)
+    response = requests.get(BASE_URL, params={
+        'function': 'LISTING_STATUS',
+        'apikey': ALPHA_VANTAGE_API_KEY
+    })
+    response.raise_for_status()
+    with open(path, 'w', newline='') as f:
+        f.write(response.text)
+
 def get_stock_info(symbol: str) -> Optional[Dict[str, Any]]:
     """
     Get detailed information about a stock.
+
+    Overviews are served from the long-lived overview cache when possible and
+    revalidated in the background once they are older than
+    OVERVIEW_REVALIDATE_AFTER. Failed lookups are negatively cached for a short
+    time so repeated requests for a bad symbol don't reach the upstream.
     
     Args:
         symbol (str): The stock symbol
@@ -60,93 +211,215 @@ def get_stock_info(symbol: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Dictionary containing stock information or None if not found
     """
+    # One cache entry per symbol, however callers spell it
+    symbol = symbol.strip().upper()
     logger.info("Getting information for stock: %s", symbol)
-    
+
+    cached = get_cached_overview(symbol)
+    if cached is not None:
+        overview, age = cached
+        if age > OVERVIEW_REVALIDATE_AFTER:
+            record_cache('overview', 'stale')
+            _schedule_overview_revalidation(symbol)
+        else:
+            record_cache('overview', 'hit')
+        return overview
+
+    reason = get_negative(symbol)
+    if reason is not None:
+        record_cache('overview', 'negative')
+        logger.info("Recent overview lookup for %s failed; serving placeholder", symbol)
+        return _placeholder_overview(symbol, reason)
+
+    record_cache('overview', 'miss')
+    return _refresh_overview(symbol)
+
+
+def _placeholder_overview(symbol: str, description: str) -> Dict[str, Any]:
+    return {
+        'symbol': symbol,
+        'name': symbol,
+        'description': description,
+        'exchange': 'Unknown',
+        'sector': 'Unknown',
+        'industry': 'Unknown'
+    }
+
+
+def _fetch_overview(symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a company overview from the configured market-data provider.
+
+    Returns:
+        Optional[dict]: The overview, or None if the provider has no data for the symbol.
+    """
+    return get_provider().get_overview(symbol)
+
+
+def _refresh_overview(symbol: str) -> Dict[str, Any]:
+    """
+    Fetch an overview and update the positive or negative cache accordingly.
+
+    Always returns a dictionary, using placeholder values when the lookup fails.
+    """
     try:
-        params = {
-            'function': 'OVERVIEW',
-            'symbol': symbol,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-        
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        logger.debug("API Response for %s info: %s", symbol, data)  # Debug log
-        
-        # Always return a dictionary with fallback values for missing data
-        return {
-            'symbol': data.get('Symbol', symbol),
-            'name': data.get('Name', symbol),
-            'description': data.get('Description', 'No description available'),
-            'exchange': data.get('Exchange', 'Unknown'),
-            'sector': data.get('Sector', 'Unknown'),
-            'industry': data.get('Industry', 'Unknown')
-        }
-            
+        overview = _fetch_overview(symbol)
     except Exception as e:
         logger.error("Error getting stock information for %s: %s", symbol, str(e))
-        # Return fallback data
-        return {
-            'symbol': symbol,
-            'name': symbol,
-            'description': 'Information temporarily unavailable',
-            'exchange': 'Unknown',
-            'sector': 'Unknown',
-            'industry': 'Unknown'
-        }
+        store_negative(symbol, 'Information temporarily unavailable')
+        return _placeholder_overview(symbol, 'Information temporarily unavailable')
 
-def get_stock_price(symbol):
+    if overview is None:
+        logger.warning("No overview data available for %s", symbol)
+        store_negative(symbol, 'No description available')
+        return _placeholder_overview(symbol, 'No description available')
+
+    store_overview(symbol, overview)
+    return overview
+
+
+_revalidation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='overview-revalidate')
+_revalidating: Set[str] = set()
+_revalidating_lock = threading.Lock()
+
+
+def _schedule_overview_revalidation(symbol: str) -> None:
+    """Refresh a stale cached overview in the background, at most once at a time per symbol."""
+    with _revalidating_lock:
+        if symbol in _revalidating:
+            return
+        _revalidating.add(symbol)
+
+    def revalidate():
+        try:
+            overview = _fetch_overview(symbol)
+            if overview is not None:
+                store_overview(symbol, overview)
+                logger.info("Revalidated cached overview for %s", symbol)
+        except Exception as e:
+            # Keep serving the cached copy; it will be retried on a later request
+            logger.warning("Background revalidation failed for %s: %s", symbol, str(e))
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(symbol)
+
+    _revalidation_executor.submit(revalidate)
+
+
+def warm_overview_cache(symbols: Iterable[str], max_workers: int = 4, force: bool = False) -> Dict[str, List[str]]:
     """
-    Fetch the latest stock price for a given symbol.
+    Populate the overview cache for a list of symbols.
+
+    Args:
+        symbols (Iterable[str]): The stock symbols to warm.
+        max_workers (int): How many overviews to fetch concurrently.
+        force (bool): Refetch symbols that are already cached.
+
+    Returns:
+        dict: The symbols that were 'cached', 'skipped' (already cached) or failed ('errors').
+    """
+    summary: Dict[str, List[str]] = {'cached': [], 'skipped': [], 'errors': []}
+    pending = []
+    for symbol in dict.fromkeys(s.strip().upper() for s in symbols if s.strip()):
+        if not force and get_cached_overview(symbol) is not None:
+            summary['skipped'].append(symbol)
+        else:
+            pending.append(symbol)
+
+    def warm(symbol: str) -> bool:
+        try:
+            overview = _fetch_overview(symbol)
+        except Exception as e:
+            logger.error("Error warming overview for %s: %s", symbol, str(e))
+            return False
+        if overview is None:
+            return False
+        store_overview(symbol, overview)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for symbol, ok in zip(pending, executor.map(warm, pending)):
+            summary['cached' if ok else 'errors'].append(symbol)
+
+    logger.info("Overview cache warmup: %d cached, %d skipped, %d errors",
+                len(summary['cached']), len(summary['skipped']), len(summary['errors']))
+    return summary
+
+def get_stock_quote(symbol: str) -> Dict[str, Any]:
+    """
+    Fetch the latest price for a symbol, falling back to the last known price.
+
+    A circuit breaker guards the upstream: after QUOTE_BREAKER_THRESHOLD
+    consecutive failures, calls fail fast for QUOTE_BREAKER_RESET seconds
+    instead of waiting on the upstream. While the upstream is failing, the last
+    known price (up to QUOTE_STALE_MAX_AGE old) is served and flagged as stale.
+
     Args:
         symbol (str): The stock ticker symbol.
+
     Returns:
-        dict: Stock price data from Alpha Vantage.
+        dict: 'symbol', 'price', 'stale', 'as_of' (epoch seconds) and 'age_seconds'.
+
+    Raises:
+        ValueError: If no price is available, fresh or stale.
     """
+    if not _quote_breaker.allow_request():
+        logger.warning("Quote circuit open; not calling upstream for %s", symbol)
+        return _stale_quote(symbol, "Quote service temporarily unavailable")
+
     try:
-        params = {
-            'function': 'GLOBAL_QUOTE',
-            'symbol': symbol,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-        
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        logger.debug("API Response for %s: %s", symbol, data)  # Debug log
-        
-        if "Global Quote" not in data:
-            logger.error("Missing 'Global Quote' in response: %s", data)
-            raise ValueError("Invalid API response format")
-            
-        quote = data["Global Quote"]
-        if not quote:
-            logger.error("Empty quote data for symbol %s", symbol)
-            raise ValueError("No quote data available")
-            
-        price = quote.get("05. price")
-        if not price:
-            logger.error("No price found in quote data: %s", quote)
-            raise ValueError("Price not found in quote data")
-            
-        price_float = float(price)
-        logger.info("Successfully got price for %s: $%.2f", symbol, price_float)
-        return price_float
-            
-    except requests.exceptions.RequestException as e:
+        price_float = get_provider().get_quote(symbol)
+    except (ProviderError, requests.exceptions.RequestException) as e:
+        _quote_breaker.record_failure()
         logger.error("Network error getting price for %s: %s", symbol, str(e))
-        raise ValueError(f"Network error while fetching price")
+        return _stale_quote(symbol, "Network error while fetching price")
     except ValueError as e:
+        # The upstream answered; the symbol just has no usable quote
+        _quote_breaker.record_success()
         logger.error("Error getting price for %s: %s", symbol, str(e))
         raise ValueError(str(e))
     except Exception as e:
+        _quote_breaker.record_failure()
         logger.error("Unexpected error getting price for %s: %s", symbol, str(e))
-        raise ValueError(f"Unexpected error while fetching price")
+        return _stale_quote(symbol, "Unexpected error while fetching price")
+
+    _quote_breaker.record_success()
+    now = time.time()
+    store_last_quote(symbol, price_float, now)
+    logger.info("Successfully got price for %s: $%.2f", symbol, price_float)
+    return {'symbol': symbol, 'price': price_float, 'stale': False, 'as_of': now, 'age_seconds': 0.0}
+
+
+def _stale_quote(symbol: str, error: str) -> Dict[str, Any]:
+    """Serve the last known price for a symbol, or raise ValueError(error) if there is none."""
+    last = get_last_quote(symbol)
+    if last is None:
+        record_cache('last_quote', 'miss')
+        raise ValueError(error)
+    record_cache('last_quote', 'hit')
+    price, as_of = last
+    age = time.time() - as_of
+    logger.warning("Serving stale price for %s ($%.2f, %.0fs old)", symbol, price, age)
+    return {'symbol': symbol, 'price': price, 'stale': True, 'as_of': as_of, 'age_seconds': age}
+
+
+def get_stock_price(symbol):
+    """
+    Fetch the latest stock price for a given symbol.
+
+    Only fresh prices are returned; callers that can show a last known price
+    (flagged as stale) should use get_stock_quote() instead.
+    Args:
+        symbol (str): The stock ticker symbol.
+    Returns:
+        float: The latest price from the configured market-data provider.
+    Raises:
+        ValueError: If no fresh price is available.
+    """
+    quote = get_stock_quote(symbol)
+    if quote['stale']:
+        raise ValueError(f"Live price for {symbol} is temporarily unavailable")
+    return quote['price']
 
 
 def get_historical_data(symbol, interval="1d", output_size="compact"):
@@ -157,21 +430,16 @@ def get_historical_data(symbol, interval="1d", output_size="compact"):
         interval (str): Time interval (e.g., '1d').
         output_size (str): 'compact' or 'full'.
     Returns:
-        dict: Historical stock data from Alpha Vantage.
+        dict: Daily bars keyed by date, in Alpha Vantage's format.
     """
-    params = {
-        "function": "TIME_SERIES_DAILY_ADJUSTED",
-        "symbol": symbol,
-        "outputsize": output_size,
-        "apikey": ALPHA_VANTAGE_API_KEY
-    }
-    response = requests.get(BASE_URL, params=params)
-    response.raise_for_status()
-    return response.json()["Time Series (Daily)"]
+    return get_provider().get_daily_series(symbol, output_size)
 
 def update_all_stock_prices():
     """
     Updates the current prices for all stocks in the database.
+
+    Stocks whose live price is unavailable keep their current price and are
+    reported under 'errors'; last known prices are never written back.
     Returns:
         dict: Summary of the update process.
     """
@@ -180,8 +448,7 @@ def update_all_stock_prices():
 
     for stock in stocks:
         try:
-            stock_data = get_stock_price(stock.symbol)
-            current_price = float(stock_data['05. price'])
+            current_price = get_stock_price(stock.symbol)
             Stock.update_stock(stock.id, current_price=current_price)
             success.append({'symbol': stock.symbol, 'current_price': current_price})
         except Exception as e:
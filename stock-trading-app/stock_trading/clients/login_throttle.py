@@ -0,0 +1,130 @@
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import redis
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Failed attempts allowed per window before further logins are rejected outright.
+# The per-user limit counts failures for an account from one address, so nobody
+# can lock an account for everyone just by knowing its name. The per-account
+# limit counts failures from every address, so guessing one account's password
+# from many addresses is still throttled; it is set higher because reaching it
+# does lock the account for everyone until the window ends
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv('LOGIN_MAX_FAILURES_PER_USER', 5))
+LOGIN_MAX_FAILURES_PER_ACCOUNT = int(os.getenv('LOGIN_MAX_FAILURES_PER_ACCOUNT', 50))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv('LOGIN_MAX_FAILURES_PER_IP', 20))
+LOGIN_THROTTLE_WINDOW = int(os.getenv('LOGIN_THROTTLE_WINDOW', 300))
+LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true'
+
+
+def _user_key(username: str, ip: Optional[str]) -> str:
+    return f"login:fail:user:{username.lower()}:{ip or 'unknown'}"
+
+
+def _account_key(username: str) -> str:
+    return f"login:fail:account:{username.lower()}"
+
+
+def _ip_key(ip: str) -> str:
+    return f"login:fail:ip:{ip}"
+
+
+def _counters(username: str, ip: Optional[str]) -> List[Tuple[str, int]]:
+    return [
+        (_user_key(username, ip), LOGIN_MAX_FAILURES_PER_USER),
+        (_account_key(username), LOGIN_MAX_FAILURES_PER_ACCOUNT),
+        (_ip_key(ip or 'unknown'), LOGIN_MAX_FAILURES_PER_IP),
+    ]
+
+
+def login_retry_after(username: str, ip: Optional[str]) -> Optional[int]:
+    """
+    Check whether a login attempt should be rejected before any work is done.
+
+    This costs a single Redis round trip, so a flood of attempts against one
+    account or from one address never reaches the database or the KDF. If Redis
+    is unavailable the check fails open.
+
+    Args:
+        username (str): The username being logged into.
+        ip (str, optional): The client address.
+
+    Returns:
+        Optional[int]: Seconds until attempts are allowed again, or None if the
+            attempt may proceed.
+    """
+    if not LOGIN_THROTTLE_ENABLED:
+        return None
+
+    counters = _counters(username, ip)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, _ in counters:
+            pipe.get(key)
+            pipe.ttl(key)
+        results = pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Login throttle unavailable: %s", str(e))
+        return None
+
+    retry_after = None
+    for (_, limit), failures, ttl in zip(counters, results[0::2], results[1::2]):
+        if failures is not None and int(failures) >= limit:
+            retry_after = max(retry_after or 0, ttl, 1)
+    if retry_after is not None:
+        logger.warning("Throttling login for user %s from %s", username, ip)
+    return retry_after
+
+
+def record_login_failure(username: str, ip: Optional[str]) -> None:
+    """
+    Count a failed login against the account from this address, against the
+    account from any address, and against the address.
+
+    Each counter's window starts at its first failure.
+
+    Args:
+        username (str): The username that failed to log in.
+        ip (str, optional): The client address.
+    """
+    if not LOGIN_THROTTLE_ENABLED:
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, _ in _counters(username, ip):
+            pipe.set(key, 0, ex=LOGIN_THROTTLE_WINDOW, nx=True)
+            pipe.incr(key)
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Failed to record login failure for %s: %s", username, str(e))
+
+
+def reset_login_failures(username: str, ip: Optional[str]) -> None:
+    """
+    Clear an account's failure count from an address after a successful login.
+
+    The per-address counter is left alone, so one valid account cannot be used
+    to reset the limit for a stuffing run from the same address. So is the
+    per-account counter, so a run spread over many addresses is not reset
+    whenever the owner logs in.
+
+    Args:
+        username (str): The username that logged in.
+        ip (str, optional): The client address.
+    """
+    if not LOGIN_THROTTLE_ENABLED:
+        return
+
+    try:
+        redis_client.delete(_user_key(username, ip))
+    except redis.exceptions.RedisError as e:
+        logger.warning("Failed to reset login failures for %s: %s", username, str(e))
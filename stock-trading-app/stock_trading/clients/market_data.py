@@ -0,0 +1,498 @@
+import abc
+import collections
+import datetime
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stock_trading.utils.circuit_breaker import CircuitBreaker
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# A single provider name, or a comma-separated list of providers in priority
+# order to enable failover between them (e.g. "alpha_vantage,simulated").
+MARKET_DATA_PROVIDER = os.getenv('MARKET_DATA_PROVIDER', 'alpha_vantage')
+MARKET_DATA_ROUTING = os.getenv('MARKET_DATA_ROUTING', 'priority')
+MARKET_DATA_HEDGE = os.getenv('MARKET_DATA_HEDGE', 'true').lower() == 'true'
+MARKET_DATA_HEDGE_PERCENTILE = float(os.getenv('MARKET_DATA_HEDGE_PERCENTILE', 0.95))
+MARKET_DATA_HEDGE_MIN_DELAY = float(os.getenv('MARKET_DATA_HEDGE_MIN_DELAY', 0.05))
+MARKET_DATA_BREAKER_THRESHOLD = int(os.getenv('MARKET_DATA_BREAKER_THRESHOLD', 5))
+MARKET_DATA_BREAKER_RESET = float(os.getenv('MARKET_DATA_BREAKER_RESET', 30))
+# Concurrent calls per provider; a provider with this many calls in flight is skipped
+MARKET_DATA_MAX_IN_FLIGHT = int(os.getenv('MARKET_DATA_MAX_IN_FLIGHT', 16))
+
+
+class ProviderError(Exception):
+    """Raised when a market-data provider cannot be reached or fails to answer."""
+
+
+class MarketDataProvider(abc.ABC):
+    """
+    Interface for sources of quotes, company overviews and daily bars.
+
+    Implementations raise ValueError when the provider answered but has no usable
+    data for the symbol, and ProviderError (or a requests exception) when the
+    provider itself failed.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def get_quote(self, symbol: str) -> float:
+        """
+        Get the latest price for a symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+
+        Returns:
+            float: The latest price.
+        """
+
+    @abc.abstractmethod
+    def get_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get company information for a symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+
+        Returns:
+            Optional[dict]: The symbol, name, description, exchange, sector and
+                industry, or None if the provider has no data for the symbol.
+        """
+
+    @abc.abstractmethod
+    def get_daily_series(self, symbol: str, output_size: str = 'compact') -> Dict[str, Dict[str, str]]:
+        """
+        Get daily bars for a symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+            output_size (str): 'compact' (100 bars) or 'full'.
+
+        Returns:
+            dict: Bars keyed by ISO date, in Alpha Vantage's "Time Series (Daily)" format.
+        """
+
+
+class SimulatedProvider(MarketDataProvider):
+    """
+    Offline provider generating reproducible random-walk prices and bars.
+
+    Every symbol gets its own random stream derived from the seed, so the
+    sequence of prices a symbol produces does not depend on which other symbols
+    are queried or in what order. Latency and failures can be injected to model
+    a real upstream; they draw from a separate stream so enabling them does not
+    change the prices.
+
+    With tick_seconds=0 every quote advances the walk by one step, which makes
+    runs fully deterministic. Otherwise prices move once per tick of wall time.
+    Daily bars end at anchor_date (default: today), so pinning it makes the
+    series identical from one day to the next as well.
+    """
+
+    name = 'simulated'
+
+    SECTORS = (
+        ('TECHNOLOGY', 'SERVICES-PREPACKAGED SOFTWARE'),
+        ('FINANCE', 'NATIONAL COMMERCIAL BANKS'),
+        ('LIFE SCIENCES', 'PHARMACEUTICAL PREPARATIONS'),
+        ('ENERGY & TRANSPORTATION', 'CRUDE PETROLEUM & NATURAL GAS'),
+        ('TRADE & SERVICES', 'RETAIL-VARIETY STORES'),
+    )
+
+    def __init__(self, seed: int = 0, latency_ms: float = 0.0, latency_jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, tick_seconds: float = 0.0, volatility: float = 0.01,
+                 anchor_date: Optional[datetime.date] = None):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.tick_seconds = tick_seconds
+        self.volatility = volatility
+        self.anchor_date = anchor_date
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._walks: Dict[str, Tuple[random.Random, int, float]] = {}
+        self._fault_rng = random.Random(f"{seed}:faults")
+
+    def _rng(self, *parts: Any) -> random.Random:
+        digest = hashlib.sha256(':'.join(str(p) for p in (self.seed,) + parts).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    def _base_price(self, symbol: str) -> float:
+        return round(self._rng(symbol, 'base').uniform(10, 500), 2)
+
+    def _simulate_upstream(self) -> None:
+        with self._lock:
+            jitter = self._fault_rng.random()
+            fail = self._fault_rng.random() < self.error_rate
+        delay = self.latency_ms + self.latency_jitter_ms * jitter
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise ProviderError("Simulated upstream failure")
+
+    def get_quote(self, symbol: str) -> float:
+        self._simulate_upstream()
+        with self._lock:
+            rng, step, price = self._walks.get(symbol) or (self._rng(symbol, 'walk'), 0, self._base_price(symbol))
+            target = step + 1 if self.tick_seconds <= 0 else int((time.monotonic() - self._started) / self.tick_seconds)
+            while step < target:
+                price = max(0.01, price * (1 + rng.gauss(0, self.volatility)))
+                step += 1
+            self._walks[symbol] = (rng, step, price)
+        return round(price, 2)
+
+    def get_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self._simulate_upstream()
+        rng = self._rng(symbol, 'overview')
+        sector, industry = rng.choice(self.SECTORS)
+        return {
+            'symbol': symbol,
+            'name': f"{symbol} Simulated Corp",
+            'description': f"Simulated company used for offline testing ({symbol}).",
+            'exchange': rng.choice(('NYSE', 'NASDAQ')),
+            'sector': sector,
+            'industry': industry
+        }
+
+    def get_daily_series(self, symbol: str, output_size: str = 'compact') -> Dict[str, Dict[str, str]]:
+        self._simulate_upstream()
+        count = 100 if output_size == 'compact' else 1000
+        rng = self._rng(symbol, 'daily')
+
+        # Walk forward over the most recent trading days, oldest first
+        day = self.anchor_date or datetime.date.today()
+        days = []
+        while len(days) < count:
+            if day.weekday() < 5:
+                days.append(day)
+            day -= datetime.timedelta(days=1)
+
+        series = {}
+        close = self._base_price(symbol)
+        for day in reversed(days):
+            open_ = close
+            close = max(0.01, open_ * (1 + rng.gauss(0, self.volatility * 2)))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility)))
+            series[day.isoformat()] = {
+                '1. open': f"{open_:.4f}",
+                '2. high': f"{high:.4f}",
+                '3. low': f"{low:.4f}",
+                '4. close': f"{close:.4f}",
+                '5. adjusted close': f"{close:.4f}",
+                '6. volume': str(rng.randint(100000, 50000000)),
+                '7. dividend amount': '0.0000',
+                '8. split coefficient': '1.0'
+            }
+        return dict(reversed(list(series.items())))
+
+
+class ProviderHealth:
+    """
+    Recent latency and outcome history for one provider, its circuit breaker,
+    and the threads its calls run on.
+
+    Each provider has its own bounded pool, so calls stuck on a hung provider
+    cannot occupy the threads another provider's hedges need.
+    """
+
+    def __init__(self, provider: MarketDataProvider, window: int = 100,
+                 failure_threshold: int = MARKET_DATA_BREAKER_THRESHOLD,
+                 reset_timeout: float = MARKET_DATA_BREAKER_RESET,
+                 max_in_flight: int = MARKET_DATA_MAX_IN_FLIGHT):
+        self.provider = provider
+        self.breaker = CircuitBreaker(f"market-data:{provider.name}", failure_threshold, reset_timeout)
+        self._latencies: collections.deque = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight,
+                                            thread_name_prefix=f"market-data-{provider.name}")
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.max_in_flight
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """
+        Run a call on this provider's pool, unless every thread is already busy.
+
+        Returns:
+            Optional[Future]: The pending call, or None if the provider is saturated.
+        """
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                return None
+            self.in_flight += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile over the recent window, in seconds.
+
+        Args:
+            percentile (float): Between 0 and 1.
+
+        Returns:
+            Optional[float]: The latency, or None if there are no samples yet.
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'provider': self.provider.name,
+            'state': self.breaker.state,
+            'successes': self.successes,
+            'failures': self.failures,
+            'in_flight': self.in_flight,
+            'p50_ms': _to_ms(self.latency_percentile(0.5)),
+            'p95_ms': _to_ms(self.latency_percentile(0.95))
+        }
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class FailoverProvider(MarketDataProvider):
+    """
+    Route calls across several providers with health tracking and hedging.
+
+    Providers are tried in priority order, or fastest-median first when routing
+    is 'latency'. A provider whose circuit breaker is open is skipped. If the
+    current attempt has not answered within the hedge percentile of that
+    provider's recent latencies, the next healthy provider is called as well
+    and the first answer wins, so tail latency is bounded by the fastest
+    healthy provider. Every provider runs its calls on its own pool of
+    max_in_flight threads, and one with all of them busy (e.g. hung) is
+    skipped like an open circuit. Provider failures fail over to the next provider; a
+    ValueError (provider answered, but has no data) is returned as is.
+    """
+
+    name = 'failover'
+
+    def __init__(self, providers: List[MarketDataProvider], routing: str = MARKET_DATA_ROUTING,
+                 hedge: bool = MARKET_DATA_HEDGE, hedge_percentile: float = MARKET_DATA_HEDGE_PERCENTILE,
+                 hedge_min_delay: float = MARKET_DATA_HEDGE_MIN_DELAY,
+                 max_in_flight: int = MARKET_DATA_MAX_IN_FLIGHT):
+        if not providers:
+            raise ValueError("At least one market data provider is required")
+        self.health = [ProviderHealth(provider, max_in_flight=max_in_flight) for provider in providers]
+        self.routing = routing
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+
+    def _ordered(self) -> List[ProviderHealth]:
+        if self.routing != 'latency':
+            return list(self.health)
+        # Providers without samples sort first so they get measured
+        return sorted(self.health, key=lambda h: h.latency_percentile(0.5) or 0.0)
+
+    def _hedge_delay(self, health: ProviderHealth) -> Optional[float]:
+        if not self.hedge:
+            return None
+        observed = health.latency_percentile(self.hedge_percentile)
+        return max(self.hedge_min_delay, observed or 0.0)
+
+    def _invoke(self, health: ProviderHealth, method: str, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = getattr(health.provider, method)(*args)
+        except ValueError:
+            # The provider is up; it just has no data for this request
+            health.record(time.perf_counter() - start, ok=True)
+            raise
+        except Exception:
+            health.record(time.perf_counter() - start, ok=False)
+            raise
+        health.record(time.perf_counter() - start, ok=True)
+        return result
+
+    def _call(self, method: str, *args: Any) -> Any:
+        candidates = iter(self._ordered())
+        in_flight: Dict[Future, ProviderHealth] = {}
+        errors: List[str] = []
+
+        def launch_next() -> Optional[ProviderHealth]:
+            for health in candidates:
+                # Checked before the breaker, so a saturated provider does not use up a half-open probe
+                if health.saturated:
+                    errors.append(f"{health.provider.name}: saturated")
+                    continue
+                if not health.breaker.allow_request():
+                    errors.append(f"{health.provider.name}: circuit open")
+                    continue
+                future = health.submit(self._invoke, health, method, *args)
+                if future is None:
+                    errors.append(f"{health.provider.name}: saturated")
+                    continue
+                in_flight[future] = health
+                return health
+            return None
+
+        latest = launch_next()
+        while in_flight:
+            done, _ = wait(in_flight, timeout=self._hedge_delay(latest) if latest else None,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = launch_next()
+                if hedged is not None:
+                    logger.info("Hedging %s(%s) to provider %s", method, ', '.join(map(str, args)),
+                                hedged.provider.name)
+                latest = hedged
+                continue
+
+            for future in done:
+                health = in_flight.pop(future)
+                try:
+                    return future.result()
+                except ValueError:
+                    raise
+                except Exception as e:
+                    logger.warning("Market data provider %s failed for %s: %s",
+                                   health.provider.name, method, str(e))
+                    errors.append(f"{health.provider.name}: {e}")
+            if not in_flight:
+                latest = launch_next()
+
+        raise ProviderError("All market data providers failed: " + '; '.join(errors))
+
+    def get_quote(self, symbol: str) -> float:
+        return self._call('get_quote', symbol)
+
+    def get_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self._call('get_overview', symbol)
+
+    def get_daily_series(self, symbol: str, output_size: str = 'compact') -> Dict[str, Dict[str, str]]:
+        return self._call('get_daily_series', symbol, output_size)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        Get the health of every configured provider.
+
+        Returns:
+            List[dict]: Breaker state, outcome counts and latency percentiles per provider.
+        """
+        return [health.status() for health in self.health]
+
+
+def _simulated_from_env() -> SimulatedProvider:
+    anchor_date = os.getenv('SIMULATED_ANCHOR_DATE')
+    return SimulatedProvider(
+        seed=int(os.getenv('SIMULATED_SEED', 0)),
+        latency_ms=float(os.getenv('SIMULATED_LATENCY_MS', 0)),
+        latency_jitter_ms=float(os.getenv('SIMULATED_LATENCY_JITTER_MS', 0)),
+        error_rate=float(os.getenv('SIMULATED_ERROR_RATE', 0)),
+        tick_seconds=float(os.getenv('SIMULATED_TICK_SECONDS', 0)),
+        volatility=float(os.getenv('SIMULATED_VOLATILITY', 0.01)),
+        anchor_date=datetime.date.fromisoformat(anchor_date) if anchor_date else None
+    )
+
+
+_provider_factories: Dict[str, Callable[[], MarketDataProvider]] = {
+    'simulated': _simulated_from_env
+}
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def register_provider(name: str, factory: Callable[[], MarketDataProvider]) -> None:
+    """
+    Make a provider selectable by name through MARKET_DATA_PROVIDER.
+
+    Args:
+        name (str): The configuration name of the provider.
+        factory (Callable): Builds the provider from the environment.
+    """
+    _provider_factories[name] = factory
+
+
+def create_provider(name: str) -> MarketDataProvider:
+    """
+    Build a registered provider by name.
+
+    A comma-separated list of names builds a FailoverProvider over them.
+
+    Args:
+        name (str): The configuration name of the provider.
+
+    Returns:
+        MarketDataProvider: The new provider.
+
+    Raises:
+        ValueError: If no provider is registered under the name.
+    """
+    names = [n.strip() for n in name.split(',') if n.strip()]
+    if len(names) > 1:
+        return FailoverProvider([create_provider(n) for n in names])
+    name = names[0] if names else name.strip()
+    if name not in _provider_factories:
+        raise ValueError(f"Unknown market data provider: {name}")
+    return _provider_factories[name]()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    Get the configured market-data provider, creating it on first use.
+
+    Returns:
+        MarketDataProvider: The provider selected by MARKET_DATA_PROVIDER.
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider(MARKET_DATA_PROVIDER)
+                logger.info("Using market data provider: %s", _provider.name)
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """
+    Replace the active provider, e.g. with a simulator for benchmarks.
+
+    Args:
+        provider (MarketDataProvider, optional): The provider to use, or None to
+            rebuild it from configuration on next use.
+    """
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -1,12 +1,19 @@
+import importlib.util
 import logging
 import os
-from typing import Any
-
-from pymongo import MongoClient
-from pymongo.database import Database  # Add this import
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from pymongo import MongoClient, monitoring
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from pymongo.write_concern import WriteConcern
 
+from stock_trading.utils.lazy import LazyProxy
 from stock_trading.utils.logger import configure_logger
+from stock_trading.utils.metrics import metrics
 
 
 logger = logging.getLogger(__name__)
@@ -15,21 +22,239 @@ configure_logger(logger)
 
 MONGO_HOST = os.environ.get('MONGO_HOST', 'localhost')
 MONGO_PORT = int(os.environ.get('MONGO_PORT', 27017))
+MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME', 'stock_trading')
+# A full connection string (e.g. for a replica set) takes precedence over host/port
+MONGO_URI = os.environ.get('MONGO_URI')
+
+# Connection pool and timeouts
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 60000))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 10000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
+# Wire compressors in order of preference; ones whose library is not installed are skipped
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', 'zstd,snappy,zlib')
+
+# Portfolio pages tolerate slightly old data; trades must read and write the primary durably
+MONGO_PORTFOLIO_READ_PREFERENCE = os.environ.get('MONGO_PORTFOLIO_READ_PREFERENCE', 'primaryPreferred')
+MONGO_PORTFOLIO_READ_CONCERN = os.environ.get('MONGO_PORTFOLIO_READ_CONCERN', 'local')
+MONGO_MAX_STALENESS_SECONDS = int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', -1))
+MONGO_TRADE_WRITE_CONCERN = os.environ.get('MONGO_TRADE_WRITE_CONCERN', 'majority')
+MONGO_TRADE_JOURNAL = os.environ.get('MONGO_TRADE_JOURNAL', 'true').lower() == 'true'
+MONGO_TRADE_WTIMEOUT_MS = int(os.environ.get('MONGO_TRADE_WTIMEOUT_MS', 5000))
+MONGO_TRADE_READ_CONCERN = os.environ.get('MONGO_TRADE_READ_CONCERN', 'majority')
+
+# Python packages each compressor needs
+_COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+# Collections with per-operation options, built once per client
+_collections: Dict[str, Tuple[MongoClient, Collection]] = {}
+
+
+def _available_compressors(names: str) -> List[str]:
+    compressors = []
+    for name in (n.strip() for n in names.split(',')):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+        elif name:
+            logger.info("MongoDB compressor %s is not available; skipping it", name)
+    return compressors
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Record each MongoDB command in mongodb_command_duration_seconds."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        metrics.observe('mongodb_command_duration_seconds', event.duration_micros / 1e6,
+                        command=event.command_name, outcome='success')
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        metrics.observe('mongodb_command_duration_seconds', event.duration_micros / 1e6,
+                        command=event.command_name, outcome='failure')
+
+
+def client_options() -> Dict[str, Any]:
+    """
+    Build MongoClient keyword arguments from the environment.
+
+    Returns:
+        dict: Pool sizing, timeouts, wire compression and command monitoring settings.
+    """
+    options = {
+        'maxPoolSize': MONGO_MAX_POOL_SIZE,
+        'minPoolSize': MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': MONGO_MAX_IDLE_TIME_MS,
+        'connectTimeoutMS': MONGO_CONNECT_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'socketTimeoutMS': MONGO_SOCKET_TIMEOUT_MS,
+        'waitQueueTimeoutMS': MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+    if metrics.enabled:
+        options['event_listeners'] = [CommandMetrics()]
+    compressors = _available_compressors(MONGO_COMPRESSORS)
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+    return options
+
+
+def _read_preference(name: str):
+    max_staleness = MONGO_MAX_STALENESS_SECONDS
+    preferences = {
+        'primary': lambda: Primary(),
+        'primaryPreferred': lambda: PrimaryPreferred(max_staleness=max_staleness),
+        'secondary': lambda: Secondary(max_staleness=max_staleness),
+        'secondaryPreferred': lambda: SecondaryPreferred(max_staleness=max_staleness),
+        'nearest': lambda: Nearest(max_staleness=max_staleness),
+    }
+    if name not in preferences:
+        raise ValueError(f"Unknown MongoDB read preference: {name}")
+    return preferences[name]()
+
+
+def get_client() -> MongoClient:
+    """
+    Get the process-wide MongoDB client, creating it on first use.
+
+    Nothing connects to MongoDB at import time, so importing a model or
+    booting a worker does not wait on the database.
+
+    Returns:
+        MongoClient: The MongoDB client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if MONGO_URI:
+                    logger.info("Connecting to MongoDB with MONGO_URI")
+                    _client = MongoClient(MONGO_URI, **client_options())
+                else:
+                    logger.info("Connecting to MongoDB at %s:%d", MONGO_HOST, MONGO_PORT)
+                    _client = MongoClient(host=MONGO_HOST, port=MONGO_PORT, **client_options())
+    return _client
+
+
+def set_client(client: Optional[MongoClient]) -> None:
+    """
+    Replace the process-wide MongoDB client (e.g. with a test double).
+
+    Args:
+        client (MongoClient, optional): The client to use, or None to create a
+            fresh one on next use.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+        _collections.clear()
+
+
+def reset_client(close: bool = True) -> None:
+    """
+    Drop the current MongoDB client so the next use opens a new one.
+
+    Call this in a forked worker: MongoClient is not fork-safe.
+
+    Args:
+        close (bool, optional): Close the old client. Pass False in a forked
+            child, whose inherited sockets still belong to the parent.
+    """
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+        _collections.clear()
+    if client is not None and close:
+        client.close()
 
-logger.info("Connecting to MongoDB at %s:%d", MONGO_HOST, MONGO_PORT)
-mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT)
-db = mongo_client['stock_trading']
-sessions_collection = db['sessions']
-portfolios_collection = db['portfolios']  # Add this line
 
 def get_mongo_client() -> Database[Any]:
     """
     Get the MongoDB client instance.
-    
+
     Returns:
         Database: The MongoDB database instance.
     """
-    return db
+    return get_client()[MONGO_DB_NAME]
+
+
+def get_sessions_collection() -> Collection:
+    return get_mongo_client()['sessions']
+
+
+def get_portfolios_collection() -> Collection:
+    return get_mongo_client()['portfolios']
+
+
+def _cached_collection(name: str, build: Callable[[Collection], Collection]) -> Collection:
+    client = get_client()
+    cached = _collections.get(name)
+    # Tagged with its client, so a collection built while the client was being
+    # replaced is never handed out for the new one
+    if cached is not None and cached[0] is client:
+        return cached[1]
+    collection = build(client[MONGO_DB_NAME]['portfolios'])
+    _collections[name] = (client, collection)
+    return collection
+
+
+def get_portfolio_view_collection() -> Collection:
+    """
+    Get the portfolios collection configured for displaying portfolios.
+
+    These reads may be served by secondaries (MONGO_PORTFOLIO_READ_PREFERENCE)
+    with MONGO_PORTFOLIO_READ_CONCERN, trading freshness for latency.
+
+    The configured collection is built once per client and reused.
 
-# Initialize indexes for portfolios collection
-portfolios_collection.create_index('user_id', unique=True)
+    Returns:
+        Collection: The portfolios collection with the view read options.
+    """
+    return _cached_collection('portfolio_view', lambda portfolios: portfolios.with_options(
+        read_preference=_read_preference(MONGO_PORTFOLIO_READ_PREFERENCE),
+        read_concern=ReadConcern(MONGO_PORTFOLIO_READ_CONCERN),
+    ))
+
+
+def get_portfolio_trade_collection() -> Collection:
+    """
+    Get the portfolios collection configured for executing trades.
+
+    Reads go to the primary with MONGO_TRADE_READ_CONCERN and writes are
+    acknowledged per MONGO_TRADE_WRITE_CONCERN (majority, journaled by
+    default), so a confirmed trade survives a failover.
+
+    Returns:
+        Collection: The portfolios collection with the trade read and write options.
+    """
+    w = MONGO_TRADE_WRITE_CONCERN
+    return _cached_collection('portfolio_trade', lambda portfolios: portfolios.with_options(
+        read_preference=Primary(),
+        read_concern=ReadConcern(MONGO_TRADE_READ_CONCERN),
+        write_concern=WriteConcern(w=int(w) if w.isdigit() else w, j=MONGO_TRADE_JOURNAL,
+                                   wtimeout=MONGO_TRADE_WTIMEOUT_MS),
+    ))
+
+
+# Resolved on each use, so these stay valid across reset_client()/set_client()
+sessions_collection = LazyProxy(get_sessions_collection)
+portfolios_collection = LazyProxy(get_portfolios_collection)
+portfolio_view_collection = LazyProxy(get_portfolio_view_collection)
+portfolio_trade_collection = LazyProxy(get_portfolio_trade_collection)
+
+
+def ensure_indexes() -> None:
+    """
+    Create the MongoDB indexes the application relies on.
+
+    This is part of the explicit bootstrap step (`flask bootstrap`) rather than
+    of import or app creation.
+    """
+    get_portfolios_collection().create_index('user_id', unique=True)
+    logger.info("MongoDB indexes ensured")
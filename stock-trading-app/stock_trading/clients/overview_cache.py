@@ -0,0 +1,104 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Company overviews change rarely: keep them for a month, refresh weekly in the
+# background, and remember failed lookups only briefly.
+OVERVIEW_CACHE_TTL = int(os.getenv('OVERVIEW_CACHE_TTL', 30 * 24 * 3600))
+OVERVIEW_REVALIDATE_AFTER = int(os.getenv('OVERVIEW_REVALIDATE_AFTER', 7 * 24 * 3600))
+OVERVIEW_NEGATIVE_TTL = int(os.getenv('OVERVIEW_NEGATIVE_TTL', 300))
+
+OVERVIEW_FIELDS = ('symbol', 'name', 'description', 'exchange', 'sector', 'industry')
+
+
+def _overview_key(symbol: str) -> str:
+    return f"overview:{symbol}"
+
+
+def _negative_key(symbol: str) -> str:
+    return f"overview:miss:{symbol}"
+
+
+def get_cached_overview(symbol: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """
+    Look up a cached company overview.
+
+    Args:
+        symbol (str): The stock symbol.
+
+    Returns:
+        Optional[tuple]: The overview and its age in seconds, or None on a miss.
+    """
+    try:
+        cached = redis_client.hgetall(_overview_key(symbol))
+    except redis.exceptions.RedisError as e:
+        logger.warning("Overview cache unavailable for %s: %s", symbol, str(e))
+        return None
+    if not cached:
+        return None
+
+    cached = {k.decode(): v.decode() for k, v in cached.items()}
+    age = time.time() - float(cached.pop('fetched_at', 0))
+    return {field: cached.get(field, 'Unknown') for field in OVERVIEW_FIELDS}, age
+
+
+def store_overview(symbol: str, overview: Dict[str, Any]) -> None:
+    """
+    Cache a company overview and clear any negative entry for the symbol.
+
+    Args:
+        symbol (str): The stock symbol.
+        overview (dict): The overview fields to store.
+    """
+    mapping = {field: str(overview[field]) for field in OVERVIEW_FIELDS}
+    mapping['fetched_at'] = str(time.time())
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(_overview_key(symbol), mapping=mapping)
+        pipe.expire(_overview_key(symbol), OVERVIEW_CACHE_TTL)
+        pipe.delete(_negative_key(symbol))
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Failed to cache overview for %s: %s", symbol, str(e))
+
+
+def get_negative(symbol: str) -> Optional[str]:
+    """
+    Check whether a recent overview lookup for the symbol failed.
+
+    Args:
+        symbol (str): The stock symbol.
+
+    Returns:
+        Optional[str]: The recorded failure reason, or None if the symbol may be looked up.
+    """
+    try:
+        reason = redis_client.get(_negative_key(symbol))
+    except redis.exceptions.RedisError:
+        return None
+    return reason.decode() if reason is not None else None
+
+
+def store_negative(symbol: str, reason: str) -> None:
+    """
+    Remember that an overview lookup failed, for OVERVIEW_NEGATIVE_TTL seconds.
+
+    Args:
+        symbol (str): The stock symbol.
+        reason (str): The description to serve while the entry is cached.
+    """
+    try:
+        redis_client.set(_negative_key(symbol), reason, ex=OVERVIEW_NEGATIVE_TTL)
+    except redis.exceptions.RedisError as e:
+        logger.warning("Failed to cache overview miss for %s: %s", symbol, str(e))
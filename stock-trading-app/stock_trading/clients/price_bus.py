@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from stock_trading.clients import alpha_vantage_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PRICE_BUS_POLL_INTERVAL = float(os.getenv('PRICE_BUS_POLL_INTERVAL', 15))
+
+
+class Subscription:
+    """
+    A single subscriber's view of the price bus.
+
+    Updates are coalesced per symbol: if several prices for the same symbol are
+    published before the subscriber reads them, only the latest one is kept, so
+    a slow consumer can never make the bus buffer grow without bound.
+    """
+
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols: Set[str] = set(symbols)
+        self._pending: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def push(self, symbol: str, price: float) -> None:
+        with self._condition:
+            self._pending[symbol] = price
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, float]:
+        """
+        Wait for pending price updates.
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up.
+
+        Returns:
+            dict: Mapping of symbol to latest price; empty on timeout or close.
+        """
+        with self._condition:
+            if not self._pending and not self._closed:
+                self._condition.wait(timeout)
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class PriceBus:
+    """
+    In-process fan-out of price changes to any number of subscribers.
+
+    A single background thread polls the upstream once per subscribed symbol per
+    interval, regardless of how many subscribers are interested in it, and
+    publishes to subscribers only when the price actually changes.
+    """
+
+    def __init__(self, fetch_price: Callable[[str], float], poll_interval: float = PRICE_BUS_POLL_INTERVAL):
+        self._fetch_price = fetch_price
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, symbols: Iterable[str]) -> Subscription:
+        """
+        Register interest in a set of symbols.
+
+        Args:
+            symbols (Iterable[str]): The stock symbols to watch.
+
+        Returns:
+            Subscription: The handle used to read updates and to unsubscribe.
+        """
+        subscription = Subscription(symbols)
+        with self._lock:
+            new_symbol = False
+            for symbol in subscription.symbols:
+                if symbol not in self._subscribers:
+                    self._subscribers[symbol] = set()
+                    new_symbol = True
+                self._subscribers[symbol].add(subscription)
+            self._ensure_running()
+        if new_symbol:
+            # Poll straight away so new symbols don't wait a full interval
+            self._wakeup.set()
+        logger.debug("Subscribed to %d symbols on price bus", len(subscription.symbols))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a subscription and stop polling symbols nobody watches any more.
+
+        Args:
+            subscription (Subscription): The handle returned by subscribe().
+        """
+        subscription.close()
+        with self._lock:
+            for symbol in subscription.symbols:
+                subscribers = self._subscribers.get(symbol)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[symbol]
+                    self._last_prices.pop(symbol, None)
+
+    def publish(self, symbol: str, price: float) -> None:
+        """
+        Publish a price for a symbol, notifying subscribers if it changed.
+
+        Args:
+            symbol (str): The stock symbol.
+            price (float): The latest price.
+        """
+        with self._lock:
+            if self._last_prices.get(symbol) == price:
+                return
+            self._last_prices[symbol] = price
+            subscribers = list(self._subscribers.get(symbol, ()))
+        for subscription in subscribers:
+            subscription.push(symbol, price)
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the last price seen on the bus for a symbol, if any.
+        """
+        with self._lock:
+            return self._last_prices.get(symbol)
+
+    def _ensure_running(self) -> None:
+        # Caller holds self._lock
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='price-bus', daemon=True)
+            self._thread.start()
+
+    def poll_once(self) -> int:
+        """
+        Fetch every subscribed symbol once and publish the results.
+
+        Returns:
+            int: The number of symbols polled.
+        """
+        with self._lock:
+            symbols = list(self._subscribers)
+        for symbol in symbols:
+            try:
+                self.publish(symbol, self._fetch_price(symbol))
+            except Exception as e:
+                logger.warning("Price bus failed to fetch %s: %s", symbol, str(e))
+        return len(symbols)
+
+    def _run(self) -> None:
+        logger.info("Price bus poller started")
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    break
+            self.poll_once()
+            self._wakeup.wait(self._poll_interval)
+        logger.info("Price bus poller stopped: no subscribers")
+
+
+# Resolved at call time so the bus always uses the client's current quote path.
+# get_stock_price() raises rather than return a stale price, so only live prices are streamed
+price_bus = PriceBus(lambda symbol: alpha_vantage_client.get_stock_price(symbol))
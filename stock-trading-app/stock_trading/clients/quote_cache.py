@@ -0,0 +1,86 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# How old a last-known price may be and still be served while the upstream is down
+QUOTE_STALE_MAX_AGE = int(os.getenv('QUOTE_STALE_MAX_AGE', 24 * 3600))
+
+_local_quotes: Dict[str, Tuple[float, float]] = {}
+_local_lock = threading.Lock()
+
+
+def _quote_key(symbol: str) -> str:
+    return f"quote:last:{symbol}"
+
+
+def store_last_quote(symbol: str, price: float, as_of: Optional[float] = None) -> None:
+    """
+    Remember the latest successfully fetched price for a symbol.
+
+    The price is kept in process memory and shared with other workers through Redis.
+
+    Args:
+        symbol (str): The stock symbol.
+        price (float): The fetched price.
+        as_of (float, optional): Epoch seconds of the fetch; defaults to now.
+    """
+    as_of = as_of if as_of is not None else time.time()
+    with _local_lock:
+        _local_quotes[symbol] = (price, as_of)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hset(_quote_key(symbol), mapping={'price': str(price), 'as_of': str(as_of)})
+        pipe.expire(_quote_key(symbol), QUOTE_STALE_MAX_AGE)
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Failed to share last quote for %s: %s", symbol, str(e))
+
+
+def get_last_quote(symbol: str) -> Optional[Tuple[float, float]]:
+    """
+    Get the last known price for a symbol, if it is recent enough to serve.
+
+    Both the in-process copy and the one shared through Redis are read and the
+    newer of the two wins, so a worker whose own copy is old still serves the
+    latest price another worker fetched. If Redis is unavailable the local copy
+    is used on its own.
+
+    Args:
+        symbol (str): The stock symbol.
+
+    Returns:
+        Optional[tuple]: The price and the epoch seconds it was fetched at, or
+            None if no price younger than QUOTE_STALE_MAX_AGE is known.
+    """
+    with _local_lock:
+        quote = _local_quotes.get(symbol)
+
+    try:
+        cached = redis_client.hgetall(_quote_key(symbol))
+    except redis.exceptions.RedisError as e:
+        logger.warning("Last quote store unavailable for %s: %s", symbol, str(e))
+        cached = None
+    if cached:
+        shared = (float(cached[b'price']), float(cached[b'as_of']))
+        if quote is None or shared[1] > quote[1]:
+            quote = shared
+            with _local_lock:
+                current = _local_quotes.get(symbol)
+                if current is None or current[1] < shared[1]:
+                    _local_quotes[symbol] = shared
+
+    if quote is None or time.time() - quote[1] > QUOTE_STALE_MAX_AGE:
+        return None
+    return quote
@@ -1,9 +1,15 @@
 import logging
 import os
+import threading
+import time
+from typing import Optional
 
 import redis
+from redis.client import Pipeline
 
+from stock_trading.utils.lazy import LazyProxy
 from stock_trading.utils.logger import configure_logger
+from stock_trading.utils.metrics import metrics
 
 
 logger = logging.getLogger(__name__)
@@ -14,5 +20,80 @@ REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = os.environ.get('REDIS_PORT', 6379)
 REDIS_DB = os.environ.get('REDIS_DB', 0)
 
-logger.info("Connecting to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
-redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
+
+class InstrumentedPipeline(Pipeline):
+    """A pipeline whose round trip is recorded as a single PIPELINE command."""
+
+    def execute(self, raise_on_error: bool = True):
+        with metrics.timer('redis_command_duration_seconds', command='PIPELINE'):
+            return super().execute(raise_on_error)
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """A Redis client that records each command in redis_command_duration_seconds."""
+
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            command = args[0] if args else 'UNKNOWN'
+            metrics.observe('redis_command_duration_seconds', time.perf_counter() - started,
+                            command=command.upper() if isinstance(command, str) else str(command))
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get the process-wide Redis client, creating it on first use.
+
+    Returns:
+        redis.Redis: The Redis client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                logger.info("Connecting to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
+                _client = InstrumentedRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
+    return _client
+
+
+def set_redis_client(client: Optional[redis.Redis]) -> None:
+    """
+    Replace the process-wide Redis client (e.g. with a test double).
+
+    Args:
+        client (redis.Redis, optional): The client to use, or None to create a
+            fresh one on next use.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def reset_redis_client(close: bool = True) -> None:
+    """
+    Drop the current Redis client so the next use opens a new connection pool.
+
+    Call this in a forked worker so it does not share sockets with its parent.
+
+    Args:
+        close (bool, optional): Disconnect the old pool. Pass False in a forked
+            child, whose inherited sockets still belong to the parent.
+    """
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None and close:
+        client.connection_pool.disconnect()
+
+
+# Resolved on each use, so modules can keep importing redis_client directly
+redis_client = LazyProxy(get_redis_client)
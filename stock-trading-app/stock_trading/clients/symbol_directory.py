@@ -0,0 +1,193 @@
+import bisect
+import csv
+import difflib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+SYMBOL_DIRECTORY_PATH = os.getenv('SYMBOL_DIRECTORY_PATH', 'instance/listing_status.csv')
+# Seconds between attempts to load a missing or unreadable directory file
+SYMBOL_DIRECTORY_RETRY_INTERVAL = float(os.getenv('SYMBOL_DIRECTORY_RETRY_INTERVAL', 300))
+
+
+class _Index:
+    """Immutable lookup structures built from one directory load."""
+
+    def __init__(self, listings: Dict[str, Dict[str, Any]]):
+        self.listings = listings
+        self.symbols = sorted(listings)
+        self.names = sorted((listing['name'].lower(), symbol) for symbol, listing in listings.items())
+
+
+class SymbolDirectory:
+    """
+    Local index of tradeable symbols, loaded from an Alpha Vantage listing-status CSV.
+
+    Symbols and company names are kept in sorted arrays so prefix searches are a
+    pair of binary searches, and symbol validation is a dictionary lookup.
+    """
+
+    def __init__(self, retry_interval: float = SYMBOL_DIRECTORY_RETRY_INTERVAL):
+        self._index: Optional[_Index] = None
+        self._load_lock = threading.Lock()
+        self._retry_interval = retry_interval
+        self._retry_at = 0.0
+        self._warned = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def load_rows(self, rows: Iterable[Dict[str, str]]) -> int:
+        """
+        Replace the directory contents with listing rows.
+
+        Only active listings are kept. Rows use the listing-status columns
+        (symbol, name, exchange, assetType, status).
+
+        Args:
+            rows (Iterable[dict]): The listing rows.
+
+        Returns:
+            int: The number of symbols loaded.
+        """
+        listings = {}
+        for row in rows:
+            symbol = (row.get('symbol') or '').strip().upper()
+            if not symbol or (row.get('status') or 'Active').strip().lower() != 'active':
+                continue
+            listings[symbol] = {
+                'symbol': symbol,
+                'name': (row.get('name') or symbol).strip(),
+                'exchange': (row.get('exchange') or 'Unknown').strip(),
+                'asset_type': (row.get('assetType') or 'Stock').strip()
+            }
+        # Swap in a fully built index so readers never see a partial load
+        self._index = _Index(listings)
+        logger.info("Symbol directory loaded with %d symbols", len(listings))
+        return len(listings)
+
+    def load_csv(self, path: str) -> int:
+        """
+        Load the directory from a listing-status CSV file.
+
+        Args:
+            path (str): Path to the CSV file.
+
+        Returns:
+            int: The number of symbols loaded.
+        """
+        with open(path, newline='') as f:
+            return self.load_rows(csv.DictReader(f))
+
+    def ensure_loaded(self, path: str = SYMBOL_DIRECTORY_PATH) -> bool:
+        """
+        Load the directory from disk on first use.
+
+        A missing or unreadable file makes the directory unavailable; loading
+        is retried at most every SYMBOL_DIRECTORY_RETRY_INTERVAL seconds, and
+        only the first failure is logged as a warning.
+
+        Args:
+            path (str): Path to the CSV file.
+
+        Returns:
+            bool: True if the directory is available.
+        """
+        if self._index is not None:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        with self._load_lock:
+            if self._index is not None:
+                return True
+            if time.monotonic() < self._retry_at:
+                return False
+            try:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"Symbol directory file {path} not found")
+                self.load_csv(path)
+            except Exception as e:
+                self._retry_at = time.monotonic() + self._retry_interval
+                log = logger.debug if self._warned else logger.warning
+                log("Symbol directory unavailable, retrying in %.0fs: %s", self._retry_interval, str(e))
+                self._warned = True
+                return False
+        return True
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a listing by its exact symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+
+        Returns:
+            Optional[dict]: The listing, or None if the symbol is unknown.
+        """
+        index = self._index
+        if index is None:
+            return None
+        return index.listings.get(symbol.upper())
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search listings by symbol prefix, name prefix, then approximate symbol match.
+
+        Args:
+            query (str): The search text.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[dict]: Matching listings, best matches first.
+        """
+        index = self._index
+        query = query.strip()
+        if index is None or not query:
+            return []
+
+        symbol_query = query.upper()
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def add(symbol: str) -> bool:
+            results.setdefault(symbol, index.listings[symbol])
+            return len(results) >= limit
+
+        # Symbol prefix: exact match sorts first because it is the shortest
+        start = bisect.bisect_left(index.symbols, symbol_query)
+        for symbol in index.symbols[start:]:
+            if not symbol.startswith(symbol_query) or add(symbol):
+                break
+
+        # Company name prefix
+        name_query = query.lower()
+        start = bisect.bisect_left(index.names, (name_query, ''))
+        for name, symbol in index.names[start:]:
+            if len(results) >= limit or not name.startswith(name_query):
+                break
+            add(symbol)
+
+        # Approximate symbol match for typos, among symbols sharing the first letter
+        if len(results) < limit and len(symbol_query) > 1:
+            lo = bisect.bisect_left(index.symbols, symbol_query[0])
+            hi = bisect.bisect_left(index.symbols, chr(ord(symbol_query[0]) + 1))
+            for symbol in difflib.get_close_matches(symbol_query, index.symbols[lo:hi], n=limit, cutoff=0.6):
+                if add(symbol):
+                    break
+
+        return list(results.values())[:limit]
+
+
+symbol_directory = SymbolDirectory()
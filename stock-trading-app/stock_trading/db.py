@@ -1,3 +1,58 @@
+import logging
+import os
+import sqlite3
+import time
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from stock_trading.utils.logger import configure_logger
+from stock_trading.utils.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Per-connection SQLite tuning. WAL lets readers proceed while a writer commits,
+# and busy_timeout makes a blocked writer wait instead of failing with
+# "database is locked".
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
 
 db = SQLAlchemy()
+
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite pragmas to every new connection (other databases are left alone)."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    except sqlite3.Error as e:
+        logger.warning("Failed to apply SQLite pragmas: %s", str(e))
+    finally:
+        cursor.close()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_query_duration(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Record statement time in sql_query_duration_seconds, labelled by statement type."""
+    started = getattr(context, '_query_started', None)
+    if started is not None:
+        kind = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+        metrics.observe('sql_query_duration_seconds', time.perf_counter() - started, statement=kind)
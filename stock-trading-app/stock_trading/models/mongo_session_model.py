@@ -1,15 +1,28 @@
 import logging
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 from stock_trading.clients.mongo_client import sessions_collection
-from stock_trading.clients.mongo_client import portfolios_collection
+from stock_trading.clients.mongo_client import portfolio_trade_collection
+from stock_trading.clients.mongo_client import portfolio_view_collection
 from stock_trading.utils.logger import configure_logger
-from stock_trading.clients.alpha_vantage_client import get_stock_price
-from stock_trading.clients.mongo_client import get_mongo_client
+from stock_trading.utils.mongo_queries import fields, with_element
+from stock_trading.clients.alpha_vantage_client import get_stock_quote
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# What the portfolio pages read; total_value and _id are never used
+POSITIONS_FIELDS = fields('holdings', 'cash_balance')
+
+def _new_portfolio(user_id: int) -> Dict[str, Any]:
+    return {
+        'user_id': user_id,
+        'holdings': [],
+        'total_value': 0.0,
+        'cash_balance': 10000.00  # Starting cash balance
+    }
+
+
 def initialize_user_portfolio(user_id: int) -> None:
     """
     Initialize an empty portfolio for a new user.
@@ -17,19 +30,11 @@ def initialize_user_portfolio(user_id: int) -> None:
     Args:
         user_id (int): The ID of the user.
     """
-    client = get_mongo_client()
-    db = client.stock_trading
-    
     # Create initial portfolio document
-    portfolio = {
-        'user_id': user_id,
-        'holdings': [],
-        'total_value': 0.0,
-        'cash_balance': 10000.00  # Starting cash balance
-    }
+    portfolio = _new_portfolio(user_id)
 
     try:
-        portfolios_collection.insert_one(portfolio)
+        portfolio_trade_collection.insert_one(portfolio)
         logger.info("Portfolio initialized successfully for user %d", user_id)
         return portfolio
     except Exception as e:
@@ -37,13 +42,58 @@ def initialize_user_portfolio(user_id: int) -> None:
         raise
 
 
+def initialize_user_portfolios(user_ids: List[int]) -> None:
+    """
+    Initialize empty portfolios for many new users with a single insert_many.
+
+    Args:
+        user_ids (List[int]): The IDs of the users.
+
+    Raises:
+        Exception: If the insert fails. Portfolios inserted before the failure
+            are removed again before the error is re-raised.
+    """
+    if not user_ids:
+        return
+    try:
+        portfolio_trade_collection.insert_many([_new_portfolio(user_id) for user_id in user_ids], ordered=False)
+        logger.info("Initialized %d portfolios", len(user_ids))
+    except Exception as e:
+        logger.error("Error initializing %d portfolios: %s", len(user_ids), str(e))
+        delete_user_portfolios(user_ids)
+        raise
+
+
+def delete_user_portfolios(user_ids: List[int]) -> int:
+    """
+    Delete the portfolios of the given users.
+
+    Used to compensate when a bulk registration fails part way.
+
+    Args:
+        user_ids (List[int]): The IDs of the users.
+
+    Returns:
+        int: The number of portfolios deleted.
+    """
+    result = portfolio_trade_collection.delete_many({'user_id': {'$in': list(user_ids)}})
+    logger.info("Deleted %d portfolios", result.deleted_count)
+    return result.deleted_count
+
+
 def get_user_portfolio(user_id: int) -> Dict[str, Any]:
     """
     Get a user's portfolio with current stock prices and values.
+
+    When the quote upstream is unavailable, holdings are valued at their last
+    known price; such holdings carry 'stale': True and their 'price_age_seconds',
+    and the portfolio's 'stale' flag is set.
     """
     logger.info("Retrieving portfolio for user %d", user_id)
     
-    portfolio = portfolios_collection.find_one({'user_id': user_id})
+    # A portfolio created moments ago may not have reached a secondary yet
+    portfolio = (portfolio_view_collection.find_one({'user_id': user_id}, POSITIONS_FIELDS)
+                 or portfolio_trade_collection.find_one({'user_id': user_id}, POSITIONS_FIELDS))
     if not portfolio:
         logger.info("No portfolio found for user %d. Creating new portfolio.", user_id)
         portfolio = initialize_user_portfolio(user_id)
@@ -51,11 +101,14 @@ def get_user_portfolio(user_id: int) -> Dict[str, Any]:
     # Calculate current values for each holding
     holdings = []
     total_stock_value = 0.0
+    oldest_price_age = 0.0
     
     for holding in portfolio['holdings']:
-        current_price = get_stock_price(holding['symbol'])
+        quote = get_stock_quote(holding['symbol'])
+        current_price = quote['price']
         holding_value = current_price * holding['shares']
         total_stock_value += holding_value
+        oldest_price_age = max(oldest_price_age, quote['age_seconds'])
         
         holdings.append({
             'symbol': holding['symbol'],
@@ -63,17 +116,88 @@ def get_user_portfolio(user_id: int) -> Dict[str, Any]:
             'current_price': current_price,
             'total_value': holding_value,
             'avg_purchase_price': holding.get('avg_purchase_price', 0.0),
-            'gain_loss': holding_value - (holding['shares'] * holding.get('avg_purchase_price', 0.0))
+            'gain_loss': holding_value - (holding['shares'] * holding.get('avg_purchase_price', 0.0)),
+            'stale': quote['stale'],
+            'price_age_seconds': quote['age_seconds']
         })
     
     return {
         'holdings': holdings,
         'cash_balance': portfolio['cash_balance'],
         'total_stock_value': total_stock_value,
-        'total_portfolio_value': total_stock_value + portfolio['cash_balance']
+        'total_portfolio_value': total_stock_value + portfolio['cash_balance'],
+        'stale': any(h['stale'] for h in holdings),
+        'oldest_price_age_seconds': oldest_price_age
     }
 
 
+def get_portfolio_positions(user_id: int) -> Dict[str, Any]:
+    """
+    Get a user's raw holdings and cash balance without fetching any prices.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        dict: The 'holdings' list and 'cash_balance' of the user's portfolio.
+    """
+    # A portfolio created moments ago may not have reached a secondary yet
+    portfolio = (portfolio_view_collection.find_one({'user_id': user_id}, POSITIONS_FIELDS)
+                 or portfolio_trade_collection.find_one({'user_id': user_id}, POSITIONS_FIELDS))
+    if not portfolio:
+        logger.info("No portfolio found for user %d. Creating new portfolio.", user_id)
+        portfolio = initialize_user_portfolio(user_id)
+
+    return {
+        'holdings': portfolio['holdings'],
+        'cash_balance': portfolio['cash_balance']
+    }
+
+
+def get_cash_balance(user_id: int) -> float:
+    """
+    Get a user's cash balance without reading their holdings.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        float: The cash balance.
+    """
+    projection = fields('cash_balance')
+    portfolio = (portfolio_view_collection.find_one({'user_id': user_id}, projection)
+                 or portfolio_trade_collection.find_one({'user_id': user_id}, projection))
+    if not portfolio:
+        logger.info("No portfolio found for user %d. Creating new portfolio.", user_id)
+        portfolio = initialize_user_portfolio(user_id)
+    return portfolio['cash_balance']
+
+
+def get_holding(user_id: int, symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a user's cash balance and their holding of a single stock.
+
+    Only the matching holding is returned by the server, not the whole
+    holdings array. The read goes to the primary, as it is used to validate trades.
+
+    Args:
+        user_id (int): The ID of the user.
+        symbol (str): The stock symbol.
+
+    Returns:
+        Optional[dict]: 'cash_balance' and 'holding' (None if the user does not
+            hold the stock), or None if the user has no portfolio.
+    """
+    portfolio = portfolio_trade_collection.find_one(
+        {'user_id': user_id},
+        with_element(fields('cash_balance'), 'holdings', symbol=symbol)
+    )
+    if not portfolio:
+        return None
+    holdings = portfolio.get('holdings', [])
+    return {'cash_balance': portfolio['cash_balance'], 'holding': holdings[0] if holdings else None}
+
+
 def update_portfolio_holding(user_id: int, symbol: str, quantity: int) -> None:
     """
     Update or add a stock holding in user's portfolio.
@@ -137,8 +261,8 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
     """
     total_cost = shares * price
     
-    # Get user's portfolio
-    portfolio = portfolios_collection.find_one({'user_id': user_id})
+    # Get user's cash and their holding of this stock only
+    portfolio = get_holding(user_id, symbol)
     if not portfolio:
         raise ValueError("User portfolio not found")
         
@@ -146,12 +270,7 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
     if portfolio['cash_balance'] < total_cost:
         raise ValueError(f"Insufficient funds. Cost: ${total_cost:.2f}, Available: ${portfolio['cash_balance']:.2f}")
     
-    # Find existing holding for this stock
-    existing_holding = None
-    for holding in portfolio['holdings']:
-        if holding['symbol'] == symbol:
-            existing_holding = holding
-            break
+    existing_holding = portfolio['holding']
     
     if existing_holding:
         # Update existing holding
@@ -159,7 +278,7 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
         total_cost_basis = (existing_holding['shares'] * existing_holding['avg_purchase_price']) + (shares * price)
         new_avg_price = total_cost_basis / total_shares
         
-        portfolios_collection.update_one(
+        portfolio_trade_collection.update_one(
             {'user_id': user_id, 'holdings.symbol': symbol},
             {
                 '$set': {
@@ -170,7 +289,7 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
         )
     else:
         # Add new holding
-        portfolios_collection.update_one(
+        portfolio_trade_collection.update_one(
             {'user_id': user_id},
             {
                 '$push': {
@@ -184,7 +303,7 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
         )
     
     # Update cash balance
-    portfolios_collection.update_one(
+    portfolio_trade_collection.update_one(
         {'user_id': user_id},
         {'$inc': {'cash_balance': -total_cost}}
     )
@@ -192,4 +311,45 @@ def buy_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
     logger.info(
         "User %d purchased %d shares of %s at $%.2f per share",
         user_id, shares, symbol, price
-    )
\ No newline at end of file
+    )
+
+def sell_stock(user_id: int, symbol: str, shares: int, price: float) -> None:
+    """
+    Execute a stock sale for a user.
+
+    Args:
+        user_id (int): The ID of the user making the sale
+        symbol (str): The stock symbol
+        shares (int): Number of shares to sell
+        price (float): Current price per share
+
+    Raises:
+        ValueError: If the user does not hold enough shares or if other validation fails
+    """
+    portfolio = get_holding(user_id, symbol)
+    if not portfolio:
+        raise ValueError("User portfolio not found")
+
+    held = portfolio['holding']['shares'] if portfolio['holding'] else 0
+    if held < shares:
+        raise ValueError(f"Insufficient shares of {symbol}. Requested: {shares}, Held: {held}")
+
+    total_value = shares * price
+    # Only applies if the shares are still held, so concurrent sales cannot oversell
+    result = portfolio_trade_collection.update_one(
+        {'user_id': user_id, 'holdings': {'$elemMatch': {'symbol': symbol, 'shares': {'$gte': shares}}}},
+        {'$inc': {'holdings.$.shares': -shares, 'cash_balance': total_value}}
+    )
+    if result.modified_count == 0:
+        raise ValueError(f"Insufficient shares of {symbol}")
+
+    if held == shares:
+        portfolio_trade_collection.update_one(
+            {'user_id': user_id},
+            {'$pull': {'holdings': {'symbol': symbol, 'shares': {'$lte': 0}}}}
+        )
+
+    logger.info(
+        "User %d sold %d shares of %s at $%.2f per share",
+        user_id, shares, symbol, price
+    )
@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 
 from stock_trading.clients.redis_client import redis_client
 from stock_trading.db import db
+from stock_trading.utils.http_cache import track_versions
 from stock_trading.utils.logger import configure_logger
 
 
@@ -207,4 +208,7 @@ def update_cache_for_stock(mapper, connection, target):
 
 # Register the listener for update and delete events
 event.listen(Stock, 'after_update', update_cache_for_stock)
-event.listen(Stock, 'after_delete', update_cache_for_stock)
\ No newline at end of file
+event.listen(Stock, 'after_delete', update_cache_for_stock)
+
+# Bump the data versions behind the ETags of the stock and portfolio APIs
+track_versions(Stock, lambda stock: ['stocks', f'stock:{stock.symbol}'])
@@ -1,24 +1,82 @@
-import hashlib
 import logging
+import multiprocessing
 import os
+import secrets
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import redis
 from flask_login import UserMixin 
 from sqlalchemy.exc import IntegrityError
 
 from stock_trading.db import db
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.sessions import revoke_user_sessions
 from stock_trading.utils.logger import configure_logger
-from stock_trading.models.mongo_session_model import initialize_user_portfolio
+from stock_trading.utils.metrics import record_cache
+from stock_trading.utils.passwords import generate_salted_hash, needs_rehash, verify_password
+from stock_trading.utils.ttl_cache import TTLCache
+from stock_trading.models.mongo_session_model import (
+    delete_user_portfolios, initialize_user_portfolio, initialize_user_portfolios
+)
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# The per-process tier bounds how long another worker may keep serving a
+# deleted user or stale identity, so keep it short
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 30))
+USER_CACHE_MAXSIZE = int(os.getenv('USER_CACHE_MAXSIZE', 10000))
+USER_CACHE_REDIS = os.getenv('USER_CACHE_REDIS', 'false').lower() == 'true'
+USER_CACHE_REDIS_TTL = int(os.getenv('USER_CACHE_REDIS_TTL', 300))
+
+_identity_cache = TTLCache(USER_CACHE_TTL, USER_CACHE_MAXSIZE)
+
+# Worker processes used to hash passwords for bulk registration
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+# Below this many users, hashing inline is cheaper than starting a pool
+BULK_HASH_POOL_THRESHOLD = 32
+
+# Checked against when a username is unknown, so that case costs as much as a
+# wrong password and response times do not reveal which usernames exist
+_dummy_hash: Optional[Tuple[str, str]] = None
+
+
+def _dummy_salted_hash() -> Tuple[str, str]:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = generate_salted_hash(secrets.token_hex(16))
+    return _dummy_hash
+
+
+class UserIdentity(UserMixin):
+    """
+    The part of a user Flask-Login needs on every request.
+
+    Unlike a Users row it is not bound to a database session, so it can be
+    cached and shared between requests.
+    """
+
+    def __init__(self, id: int, username: str):
+        self.id = id
+        self.username = username
+
+    def get_id(self):
+        return str(self.id)
+
+
+def _identity_key(user_id: int) -> str:
+    return f"user:identity:{user_id}"
+
+
 class Users(UserMixin, db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
-    password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    password = db.Column(db.String(255), nullable=False)  # Encoded KDF hash (legacy rows: SHA-256 hex)
 
     def get_id(self):
         return str(self.id)
@@ -34,9 +92,7 @@ class Users(UserMixin, db.Model):
         Returns:
             tuple: A tuple containing the salt and hashed password.
         """
-        salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
-        return salt, hashed_password
+        return generate_salted_hash(password)
 
     @classmethod
     def create_user(cls, username: str, password: str) -> None:
@@ -66,11 +122,88 @@ class Users(UserMixin, db.Model):
             logger.error("Database error: %s", str(e))
             raise
 
+    @classmethod
+    def create_users_bulk(cls, credentials: List[Tuple[str, str]], workers: Optional[int] = None,
+                          executor: Optional[Executor] = None) -> List[int]:
+        """
+        Create many users and their portfolios in one go.
+
+        Passwords are hashed in a process pool, all users are inserted in one
+        SQL transaction and all portfolios with one insert_many. If the
+        portfolio insert fails, the SQL transaction is rolled back. If the SQL
+        commit fails, the portfolios are deleted again. Either way, nothing is
+        left half-created.
+
+        Args:
+            credentials (List[Tuple[str, str]]): (username, password) pairs.
+            workers (int, optional): Hashing processes (defaults to PASSWORD_HASH_WORKERS).
+            executor (Executor, optional): An existing pool to hash in, so callers
+                creating several batches do not start a new pool for each.
+
+        Returns:
+            List[int]: The IDs of the created users, in input order.
+
+        Raises:
+            ValueError: If a username is repeated in the batch or already exists.
+        """
+        usernames = [username for username, _ in credentials]
+        if len(set(usernames)) != len(usernames):
+            raise ValueError("Duplicate usernames in batch")
+        existing = set()
+        # Chunked to stay under the database's bound-parameter limit
+        for start in range(0, len(usernames), 500):
+            chunk = usernames[start:start + 500]
+            existing.update(row.username for row in db.session.query(cls.username).filter(cls.username.in_(chunk)))
+        if existing:
+            raise ValueError(f"Users already exist: {', '.join(sorted(existing)[:10])}")
+
+        passwords = [password for _, password in credentials]
+        workers = workers or PASSWORD_HASH_WORKERS
+        chunksize = max(1, len(passwords) // (workers * 4))
+        if executor is not None:
+            hashes = list(executor.map(generate_salted_hash, passwords, chunksize=chunksize))
+        elif workers > 1 and len(passwords) >= BULK_HASH_POOL_THRESHOLD:
+            # spawn, not fork: the parent may hold threads and database sockets
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                hashes = list(pool.map(generate_salted_hash, passwords, chunksize=chunksize))
+        else:
+            hashes = [generate_salted_hash(password) for password in passwords]
+
+        users = [cls(username=username, salt=salt, password=hashed)
+                 for username, (salt, hashed) in zip(usernames, hashes)]
+        try:
+            db.session.add_all(users)
+            db.session.flush()
+            user_ids = [user.id for user in users]
+            initialize_user_portfolios(user_ids)
+        except IntegrityError:
+            db.session.rollback()
+            logger.error("Duplicate username in bulk registration")
+            raise ValueError("One or more usernames already exist")
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Bulk registration failed: %s", str(e))
+            raise
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Bulk registration commit failed, removing portfolios: %s", str(e))
+            delete_user_portfolios(user_ids)
+            raise
+
+        logger.info("Bulk registered %d users", len(user_ids))
+        return user_ids
+
     @classmethod
     def check_password(cls, username: str, password: str) -> bool:
         """
         Check if a given password matches the stored password for a user.
 
+        Hashes made with a legacy or outdated KDF are transparently replaced
+        with one using the current settings after a successful check.
+
         Args:
             username (str): The username of the user.
             password (str): The password to check.
@@ -84,9 +217,82 @@ class Users(UserMixin, db.Model):
         user = cls.query.filter_by(username=username).first()
         if not user:
             logger.info("User %s not found", username)
+            salt, encoded = _dummy_salted_hash()
+            verify_password(password, salt, encoded)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        if not verify_password(password, user.salt, user.password):
+            return False
+
+        if needs_rehash(user.password):
+            try:
+                user.salt, user.password = cls._generate_hashed_password(password)
+                db.session.commit()
+                logger.info("Rehashed password for user %s", username)
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Failed to rehash password for user %s: %s", username, str(e))
+        return True
+
+    @classmethod
+    def load_identity(cls, user_id: int) -> Optional[UserIdentity]:
+        """
+        Load the identity of a user for an authenticated request.
+
+        Lookups are answered from a per-process TTL cache and, when
+        USER_CACHE_REDIS is enabled, a shared Redis tier before falling back
+        to the database.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Optional[UserIdentity]: The user's identity, or None if no such user exists.
+        """
+        identity = _identity_cache.get(user_id)
+        if identity is not None:
+            record_cache('identity', 'hit')
+            return identity
+
+        if USER_CACHE_REDIS:
+            try:
+                username = redis_client.get(_identity_key(user_id))
+            except redis.exceptions.RedisError as e:
+                logger.warning("User identity cache unavailable: %s", str(e))
+                username = None
+            if username is not None:
+                record_cache('identity', 'redis_hit')
+                identity = UserIdentity(user_id, username.decode())
+                _identity_cache.set(user_id, identity)
+                return identity
+
+        record_cache('identity', 'miss')
+        user = db.session.get(cls, user_id)
+        if not user:
+            return None
+
+        identity = UserIdentity(user.id, user.username)
+        _identity_cache.set(user_id, identity)
+        if USER_CACHE_REDIS:
+            try:
+                redis_client.set(_identity_key(user_id), user.username, ex=USER_CACHE_REDIS_TTL)
+            except redis.exceptions.RedisError as e:
+                logger.warning("Failed to cache identity for user %d: %s", user_id, str(e))
+        return identity
+
+    @classmethod
+    def invalidate_identity(cls, user_id: int) -> None:
+        """
+        Drop a user's cached identity after their account changes.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        _identity_cache.delete(user_id)
+        if USER_CACHE_REDIS:
+            try:
+                redis_client.delete(_identity_key(user_id))
+            except redis.exceptions.RedisError as e:
+                logger.warning("Failed to invalidate identity for user %d: %s", user_id, str(e))
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -103,8 +309,11 @@ class Users(UserMixin, db.Model):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
+        user_id = user.id
         db.session.delete(user)
         db.session.commit()
+        cls.invalidate_identity(user_id)
+        revoke_user_sessions(user_id)
         logger.info("User %s deleted successfully", username)
 
     @classmethod
@@ -132,6 +341,8 @@ class Users(UserMixin, db.Model):
         """
         Update the password for a user.
 
+        All of the user's existing sessions are revoked.
+
         Args:
             username (str): The username of the user.
             new_password (str): The new password to set.
@@ -147,5 +358,8 @@ class Users(UserMixin, db.Model):
         salt, hashed_password = cls._generate_hashed_password(new_password)
         user.salt = salt
         user.password = hashed_password
+        user_id = user.id
         db.session.commit()
+        cls.invalidate_identity(user_id)
+        revoke_user_sessions(user_id)
         logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
@@ -0,0 +1,379 @@
+import hmac
+import os
+from functools import wraps
+
+from flask import Blueprint, current_app, jsonify, make_response, request, Response, send_file
+from werkzeug.exceptions import BadRequest
+
+from stock_trading.models.stock_model import Stock
+from stock_trading.models.user_model import Users
+from stock_trading.clients.alpha_vantage_client import get_stock_quote, get_historical_data, update_all_stock_prices
+from stock_trading.clients.market_data import FailoverProvider, get_provider
+from stock_trading.utils.http_cache import HISTORICAL_CACHE_CONTROL, conditional, content_conditional
+from stock_trading.utils.metrics import metrics
+from stock_trading.utils.profiling import get_profile_store
+
+api = Blueprint('api', __name__)
+
+# Shared secret for operational endpoints; they are disabled when it is unset
+ADMIN_API_TOKEN = os.getenv('ADMIN_API_TOKEN', '')
+
+# Largest batch accepted by the bulk registration endpoint. Passwords are hashed
+# inside the request, so a batch must finish well within gunicorn's timeout;
+# seed larger sets with `flask create-users`
+BULK_REGISTRATION_MAX_USERS = int(os.getenv('BULK_REGISTRATION_MAX_USERS', 100))
+
+
+def admin_token_required(view):
+    """
+    Reject requests without the X-Admin-Token header matching ADMIN_API_TOKEN.
+
+    The token may also be sent as "Authorization: Bearer <token>", which is
+    what scrapers such as Prometheus support.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        token = request.headers.get('X-Admin-Token', '')
+        if not token and request.authorization and request.authorization.type == 'bearer':
+            token = request.authorization.token or ''
+        if not ADMIN_API_TOKEN or not hmac.compare_digest(token, ADMIN_API_TOKEN):
+            return jsonify({'status': 'error', 'message': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapped
+
+
+####################################################
+#
+# Healthchecks
+#
+####################################################
+
+
+@api.route('/api/health', methods=['GET'])
+def healthcheck() -> Response:
+    """
+    Health check route to verify the service is running.
+
+    Returns:
+        JSON response indicating the health status of the service.
+    """
+    current_app.logger.info('Health check')
+    return make_response(jsonify({'status': 'healthy'}), 200)
+
+
+@api.route('/api/metrics', methods=['GET'])
+@admin_token_required
+def metrics_exposition() -> Response:
+    """
+    Expose this process's latency histograms and cache counters for Prometheus.
+
+    Requires the admin token, since route timings reveal how the service is used.
+
+    Returns:
+        Text response in the Prometheus exposition format, or 404 when
+        METRICS_ENABLED is off.
+    """
+    if not metrics.enabled:
+        return make_response(jsonify({'status': 'error', 'message': 'Metrics are disabled'}), 404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/profiles', methods=['GET'])
+@admin_token_required
+def list_profiles() -> Response:
+    """
+    List the stored request profiles, newest first.
+
+    Returns:
+        JSON response with the metadata of each profile.
+    """
+    return make_response(jsonify({'status': 'success', 'profiles': get_profile_store(current_app).list()}), 200)
+
+
+@api.route('/api/profiles/<string:profile_id>', methods=['GET'])
+@admin_token_required
+def download_profile(profile_id: str) -> Response:
+    """
+    Download a stored request profile.
+
+    Sampling profiles are collapsed stacks, ready for flamegraph.pl or
+    speedscope; cProfile profiles are pstats files for pstats or snakeviz.
+
+    Args:
+        profile_id (str): The profile ID from /api/profiles or the X-Profile-Id header.
+
+    Returns:
+        The profile file, or 404 if there is no such profile.
+    """
+    store = get_profile_store(current_app)
+    path = store.data_path(profile_id)
+    if path is None:
+        return make_response(jsonify({'status': 'error', 'message': 'Profile not found'}), 404)
+    collapsed = path.endswith('.collapsed')
+    return send_file(path, mimetype='text/plain' if collapsed else 'application/octet-stream',
+                     as_attachment=True, download_name=os.path.basename(path))
+
+####################################################
+#
+# User Management
+#
+####################################################
+
+
+@api.route('/api/users/bulk', methods=['POST'])
+@admin_token_required
+def bulk_register_users():
+    """
+    Register many users at once (e.g. to seed a load-test environment).
+
+    Requires the X-Admin-Token header.
+
+    Expected JSON Input:
+        - users (list): Objects with 'username' and 'password'.
+
+    Returns:
+        JSON response with the number of users created and their IDs.
+    """
+    data = request.get_json(silent=True) or {}
+    users = data.get('users')
+    if not isinstance(users, list) or not users:
+        return jsonify({'status': 'error', 'message': "Expected a non-empty 'users' list."}), 400
+    if len(users) > BULK_REGISTRATION_MAX_USERS:
+        return jsonify({'status': 'error',
+                        'message': f"At most {BULK_REGISTRATION_MAX_USERS} users per request."}), 400
+    if not all(isinstance(user, dict) and isinstance(user.get('username'), str) and user['username']
+               and isinstance(user.get('password'), str) and user['password'] for user in users):
+        return jsonify({'status': 'error',
+                        'message': "Each user needs a non-empty string 'username' and 'password'."}), 400
+    credentials = [(user['username'], user['password']) for user in users]
+
+    try:
+        user_ids = Users.create_users_bulk(credentials)
+        return jsonify({'status': 'success', 'created': len(user_ids), 'user_ids': user_ids}), 201
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except Exception as e:
+        current_app.logger.error('Bulk registration failed: %s', str(e))
+        return jsonify({'status': 'error', 'message': 'Bulk registration failed'}), 500
+
+####################################################
+#
+# Stock Management
+#
+####################################################
+
+@api.route('/api/add-stock', methods=['POST'])
+def add_stock():
+    """
+    Add a new stock to the portfolio.
+
+    Expected JSON Input:
+        - symbol (str): Stock ticker symbol.
+        - name (str): Stock company name.
+        - quantity (int): Number of shares purchased.
+        - buy_price (float): Price per share at purchase.
+
+    Returns:
+        JSON response with status and added stock details.
+    """
+    data = request.get_json()
+    try:
+        symbol = data['symbol']
+        name = data['name']
+        quantity = data['quantity']
+        buy_price = data['buy_price']
+
+        if not symbol or not name or quantity <= 0 or buy_price <= 0:
+            raise BadRequest("Invalid input. Ensure all fields are valid and positive.")
+
+        Stock.add_stock(symbol, name, quantity, buy_price)
+        return jsonify({'status': 'success', 'message': 'Stock added successfully.'}), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@api.route('/api/update-stock/<int:stock_id>', methods=['PUT'])
+def update_stock(stock_id):
+    """
+    Update stock details.
+
+    Expected JSON Input:
+        - Any updatable fields (e.g., quantity, current_price).
+
+    Returns:
+        JSON response indicating success or failure.
+    """
+    data = request.get_json()
+    try:
+        Stock.update_stock(stock_id, **data)
+        return jsonify({'status': 'success', 'message': 'Stock updated successfully.'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@api.route('/api/delete-stock/<int:stock_id>', methods=['DELETE'])
+def delete_stock(stock_id):
+    """
+    Delete a stock from the portfolio.
+
+    Path Parameter:
+        - stock_id (int): ID of the stock to delete.
+
+    Returns:
+        JSON response indicating success or failure.
+    """
+    try:
+        Stock.delete_stock(stock_id)
+        return jsonify({'status': 'success', 'message': 'Stock deleted successfully.'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@api.route('/api/get-stock/<string:symbol>', methods=['GET'])
+@conditional(lambda symbol: [f'stock:{symbol}'])
+def get_stock(symbol):
+    """
+    Retrieve stock details by symbol.
+
+    Path Parameter:
+        - symbol (str): The ticker symbol of the stock.
+
+    Returns:
+        JSON response with stock details or error.
+    """
+    try:
+        stock = Stock.get_stock_by_symbol(symbol)
+        return jsonify({'status': 'success', 'stock': stock}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+####################################################
+#
+# Portfolio Management
+#
+####################################################
+
+@api.route('/api/portfolio', methods=['GET'])
+@conditional(lambda: ['stocks'])
+def get_portfolio():
+    """
+    Get the portfolio details, including total value.
+
+    Returns:
+        JSON response with portfolio value and stocks.
+    """
+    try:
+        stocks = Stock.query.all()
+        total_value = Stock.get_portfolio_value()
+        portfolio = [{'symbol': s.symbol, 'name': s.name, 'quantity': s.quantity, 'current_price': s.current_price}
+                     for s in stocks]
+        return jsonify({'status': 'success', 'portfolio': portfolio, 'total_value': total_value}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/portfolio-leaderboard', methods=['GET'])
+@conditional(lambda: ['stocks'])
+def get_leaderboard():
+    """
+    Retrieve the leaderboard of stocks.
+
+    Query Parameter:
+        - sort_by (str): Sorting criteria ('value' or 'quantity').
+
+    Returns:
+        JSON response with the leaderboard.
+    """
+    sort_by = request.args.get('sort_by', 'value')
+    try:
+        leaderboard = Stock.get_leaderboard(sort_by=sort_by)
+        return jsonify({'status': 'success', 'leaderboard': leaderboard}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+####################################################
+#
+# Alpha Vantage API Integration
+#
+####################################################
+
+@api.route('/api/fetch-stock/<string:symbol>', methods=['GET'])
+def fetch_stock(symbol):
+    """
+    Fetch the latest stock price for a given symbol.
+
+    Path Parameter:
+        symbol (str): The ticker symbol of the stock (e.g., "AAPL").
+
+    Returns:
+        JSON: 
+            - status (str): "success" or "error".
+            - data (float, optional): The latest price on success.
+            - stale (bool, optional): True if the upstream is unavailable and
+              the last known price is being served.
+            - age_seconds (float, optional): How old the price is.
+            - message (str, optional): Error message on failure.
+    """
+    try:
+        quote = get_stock_quote(symbol)
+        return jsonify({'status': 'success', 'data': quote['price'], 'stale': quote['stale'],
+                        'age_seconds': round(quote['age_seconds'], 3)}), 200
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/api/historical-stock/<string:symbol>', methods=['GET'])
+@content_conditional(HISTORICAL_CACHE_CONTROL)
+def historical_stock(symbol):
+    """
+    Fetch historical stock price data for a given symbol.
+
+    Path Parameter:
+        symbol (str): The ticker symbol of the stock (e.g., "AAPL").
+
+    Query Parameters:
+        interval (str): Time interval for data points (default: "1d").
+        output_size (str): Size of the data set ("compact" or "full", default: "compact").
+
+    Returns:
+        JSON: 
+            - status (str): "success" or "error".
+            - data (dict, optional): Contains historical stock data on success.
+            - message (str, optional): Error message on failure.
+    """
+    interval = request.args.get('interval', '1d')
+    output_size = request.args.get('output_size', 'compact')
+    try:
+        historical_data = get_historical_data(symbol, interval, output_size)
+        return jsonify({'status': 'success', 'data': historical_data}), 200
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/api/market-data/status', methods=['GET'])
+def market_data_status():
+    """
+    Report the health of the configured market-data providers.
+
+    Returns:
+        JSON:
+            - status (str): "success".
+            - providers (list): Circuit state, outcome counts and latency
+              percentiles for each provider (failover setups only).
+    """
+    provider = get_provider()
+    providers = provider.status() if isinstance(provider, FailoverProvider) else [{'provider': provider.name}]
+    return jsonify({'status': 'success', 'providers': providers}), 200
+
+
+@api.route('/api/update-prices', methods=['POST'])
+def update_prices():
+    """
+    Updates the current prices for all stocks in the database.
+
+    Returns:
+        JSON: 
+            - status (str): "success" or "error".
+            - result (dict, optional): Summary of updated stocks on success.
+            - message (str, optional): Error message on failure.
+    """
+    try:
+        result = update_all_stock_prices()
+        return jsonify({'status': 'success', 'result': result}), 200
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
 from stock_trading.models.user_model import Users
+from stock_trading.clients.login_throttle import login_retry_after, record_login_failure, reset_login_failures
 
 auth = Blueprint('auth', __name__)
 
@@ -18,16 +19,25 @@ def login():
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
+
+        # Reject floods before touching the database or the password KDF
+        retry_after = login_retry_after(username or '', request.remote_addr)
+        if retry_after is not None:
+            flash(f'Too many failed login attempts. Try again in {retry_after} seconds.')
+            return render_template('auth/login.html'), 429, {'Retry-After': str(retry_after)}
         
         try:
             if Users.check_password(username, password):
                 user = Users.query.filter_by(username=username).first()
                 login_user(user)
+                reset_login_failures(username, request.remote_addr)
                 next_page = request.args.get('next')
                 return redirect(next_page or url_for('portfolio.view_portfolio'))
             else:
+                record_login_failure(username, request.remote_addr)
                 flash('Invalid username or password')
         except ValueError:
+            record_login_failure(username or '', request.remote_addr)
             flash('Invalid username or password')
     
     return render_template('auth/login.html')
@@ -1,7 +1,8 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required
 import logging
-from stock_trading.clients.alpha_vantage_client import get_stock_info, get_stock_price
+from stock_trading.clients.alpha_vantage_client import get_stock_info, get_stock_quote
+from stock_trading.clients.symbol_directory import symbol_directory
 from stock_trading.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
@@ -22,14 +23,16 @@ def lookup_stock():
         try:
             # Get stock information
             stock_info = get_stock_info(symbol)
-            current_price = get_stock_price(symbol)
+            quote = get_stock_quote(symbol)
             
             # Create stock data dictionary
             stock_data = {
                 'symbol': symbol,
                 'name': stock_info['name'],
                 'description': stock_info['description'],
-                'current_price': current_price,
+                'current_price': quote['price'],
+                'stale': quote['stale'],
+                'price_age_seconds': quote['age_seconds'],
                 'exchange': stock_info['exchange'],
                 'sector': stock_info['sector'],
                 'industry': stock_info['industry']
@@ -45,4 +48,26 @@ def lookup_stock():
             return redirect(url_for('lookup.lookup_stock'))
     
     # GET request - show empty form
-    return render_template('lookup/lookup.html')
\ No newline at end of file
+    return render_template('lookup/lookup.html')
+
+
+@lookup.route('/api/symbols/search', methods=['GET'])
+def search_symbols():
+    """
+    Search the local symbol directory for autocomplete.
+
+    Query Parameters:
+        q (str): Symbol or company name prefix.
+        limit (int): Maximum number of results (default: 10, at most 50).
+
+    Returns:
+        JSON response with matching symbols, names and exchanges.
+    """
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+
+    if not symbol_directory.ensure_loaded():
+        return jsonify({'status': 'error', 'message': 'Symbol directory is not available'}), 503
+
+    results = symbol_directory.search(query, limit=limit)
+    return jsonify({'status': 'success', 'results': results}), 200
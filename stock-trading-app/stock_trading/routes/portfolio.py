@@ -1,18 +1,156 @@
-from flask import Blueprint, render_template, jsonify, current_app
-from stock_trading.models.mongo_session_model import get_user_portfolio
-from flask_login import login_required, current_user 
+import json
+import os
+
+from flask import Blueprint, render_template, jsonify, current_app, Response, stream_with_context
+from stock_trading.models.mongo_session_model import get_user_portfolio, get_portfolio_positions
+from stock_trading.clients.price_bus import price_bus
+from flask_login import login_required, current_user
 
 portfolio = Blueprint('portfolio', __name__)
 
+STREAM_HEARTBEAT_SECONDS = float(os.getenv('PORTFOLIO_STREAM_HEARTBEAT', 15))
+
 @portfolio.route('/portfolio')
 @login_required
 def view_portfolio():
     try:
         portfolio = get_user_portfolio(current_user.id)
-        return render_template('portfolio.html', 
+        return render_template('portfolio.html',
                              portfolio=portfolio,
                              error = None)
     except Exception as e:
-        current_app.logger.error(f"Error fetching portfolio: {str(e)}")
-        return render_template('portfolio.html', 
+        current_app.logger.error("Error fetching portfolio: %s", str(e))
+        return render_template('portfolio.html',
                              error="Unable to fetch portfolio at this time.")
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _valuation(positions: dict, prices: dict) -> dict:
+    """
+    Compute portfolio totals from raw positions and the prices known so far.
+
+    Totals are None until every holding has a price, so a client never shows
+    a partial sum as the portfolio's value.
+    """
+    holdings = []
+    total_stock_value = 0.0
+    complete = True
+    for holding in positions['holdings']:
+        price = prices.get(holding['symbol'])
+        value = price * holding['shares'] if price is not None else None
+        if value is not None:
+            total_stock_value += value
+        else:
+            complete = False
+        holdings.append({
+            'symbol': holding['symbol'],
+            'shares': holding['shares'],
+            'current_price': price,
+            'total_value': value,
+            'avg_purchase_price': holding.get('avg_purchase_price', 0.0),
+            'gain_loss': value - holding['shares'] * holding.get('avg_purchase_price', 0.0) if value is not None else None
+        })
+    return {
+        'holdings': holdings,
+        'cash_balance': positions['cash_balance'],
+        'complete': complete,
+        'total_stock_value': total_stock_value if complete else None,
+        'total_portfolio_value': total_stock_value + positions['cash_balance'] if complete else None
+    }
+
+
+def _seed_prices(prices: dict, symbols) -> None:
+    """Fill in the bus's last known price for symbols that have none yet."""
+    for symbol in symbols:
+        if symbol not in prices:
+            price = price_bus.last_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+
+
+def _portfolio_events(user_id: int):
+    """
+    Generate the server-sent events of a user's portfolio stream.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Yields:
+        str: Formatted events and keep-alive comments.
+    """
+    positions = get_portfolio_positions(user_id)
+    subscription = price_bus.subscribe(h['symbol'] for h in positions['holdings'])
+    prices = {}
+    _seed_prices(prices, subscription.symbols)
+    try:
+        yield _sse('snapshot', _valuation(positions, prices))
+        while True:
+            updates = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            if not updates:
+                # Heartbeat; also pick up trades made since the last snapshot,
+                # including ones that only changed quantities or cash
+                latest = get_portfolio_positions(user_id)
+                if latest == positions:
+                    yield ": keep-alive\n\n"
+                    continue
+                positions = latest
+                symbols = {h['symbol'] for h in positions['holdings']}
+                if symbols != subscription.symbols:
+                    # Subscribe before leaving the old subscription, so symbols held
+                    # throughout keep their place (and last price) on the bus
+                    previous, subscription = subscription, price_bus.subscribe(symbols)
+                    price_bus.unsubscribe(previous)
+                    prices = {symbol: price for symbol, price in prices.items() if symbol in symbols}
+                    # A price that is already on the bus will not be published again
+                    _seed_prices(prices, symbols)
+                yield _sse('snapshot', _valuation(positions, prices))
+                continue
+
+            before = _valuation(positions, prices)
+            for symbol, price in updates.items():
+                if prices.get(symbol) == price:
+                    continue
+                prices[symbol] = price
+                after = _valuation(positions, prices)
+                delta = None
+                if before['complete'] and after['complete']:
+                    delta = after['total_portfolio_value'] - before['total_portfolio_value']
+                yield _sse('valuation', {
+                    'symbol': symbol,
+                    'current_price': price,
+                    'holdings': [h for h in after['holdings'] if h['symbol'] == symbol],
+                    'complete': after['complete'],
+                    'total_stock_value': after['total_stock_value'],
+                    'total_portfolio_value': after['total_portfolio_value'],
+                    'delta': delta
+                })
+                before = after
+    finally:
+        price_bus.unsubscribe(subscription)
+
+
+@portfolio.route('/portfolio/stream')
+@login_required
+def stream_portfolio():
+    """
+    Stream valuation changes for the logged-in user's portfolio as server-sent events.
+
+    Emits a 'snapshot' event with every holding on connect and whenever a trade
+    changes the holdings or cash, and a 'valuation' event whenever the price of
+    a held symbol changes on the shared price bus. Totals are only sent once
+    every holding is priced.
+
+    Each open stream occupies a worker thread for as long as the page is open,
+    so under the default gthread worker the number of concurrent viewers is
+    capped by workers x threads; use GUNICORN_WORKER_CLASS=gevent to serve many.
+    """
+    user_id = current_user.id
+
+    response = Response(stream_with_context(_portfolio_events(user_id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,8 +1,9 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 import logging
-from stock_trading.models.mongo_session_model import get_user_portfolio, update_portfolio_holding, buy_stock
-from stock_trading.clients.alpha_vantage_client import get_stock_price, get_stock_info
+from stock_trading.models.mongo_session_model import get_user_portfolio, get_cash_balance, buy_stock, sell_stock
+from stock_trading.clients.alpha_vantage_client import get_stock_quote, get_stock_info
+from stock_trading.clients.symbol_directory import symbol_directory
 
 from stock_trading.utils.logger import configure_logger
 
@@ -31,6 +32,11 @@ def buy_stock_route():
             if shares <= 0:
                 flash('Number of shares must be positive.')
                 return redirect(url_for('trade.buy_stock_route'))
+
+            # Reject unknown symbols locally before spending upstream calls on them
+            if symbol_directory.ensure_loaded() and symbol not in symbol_directory:
+                flash(f'Invalid stock symbol: {symbol}')
+                return redirect(url_for('trade.buy_stock_route'))
             
             # Get stock information and validate
             stock_info = get_stock_info(symbol)
@@ -38,8 +44,12 @@ def buy_stock_route():
                 flash(f'Invalid stock symbol: {symbol}')
                 return redirect(url_for('trade.buy_stock_route'))
             
-            # Get current price and execute purchase
-            current_price = get_stock_price(symbol)
+            # Get current price; never confirm a purchase at a last known price
+            quote = get_stock_quote(symbol)
+            if quote['stale']:
+                flash(f'Live prices for {symbol} are temporarily unavailable. Please try again shortly.')
+                return redirect(url_for('trade.buy_stock_route'))
+            current_price = quote['price']
             total_cost = current_price * shares
             
             # Show confirmation with stock details
@@ -58,8 +68,7 @@ def buy_stock_route():
             logger.error("Error in buy_stock_route: %s", str(e))
             
     # Get user's current cash balance for the template
-    portfolio = get_user_portfolio(current_user.id)
-    return render_template('trade/buy.html', cash_balance=portfolio['cash_balance'])
+    return render_template('trade/buy.html', cash_balance=get_cash_balance(current_user.id))
 
 
 @trade.route('/sell', methods=['GET', 'POST'])
@@ -86,8 +95,12 @@ def sell_stock_route():
                 flash(f'Invalid stock symbol: {symbol}')
                 return redirect(url_for('trade.sell_stock_route'))
             
-            # Get current price
-            current_price = get_stock_price(symbol)
+            # Get current price; never confirm a sale at a last known price
+            quote = get_stock_quote(symbol)
+            if quote['stale']:
+                flash(f'Live prices for {symbol} are temporarily unavailable. Please try again shortly.')
+                return redirect(url_for('trade.sell_stock_route'))
+            current_price = quote['price']
             total_value = current_price * shares
             
             # Show confirmation with stock details
@@ -139,8 +152,8 @@ def execute_sell():
         shares = int(request.form.get('shares'))
         price = float(request.form.get('price'))
         
-        # Execute the sale using update_portfolio_holding with negative shares
-        update_portfolio_holding(current_user.id, symbol, -shares, price)
+        # Execute the sale
+        sell_stock(current_user.id, symbol, shares, price)
         
         flash(f'Successfully sold {shares} shares of {symbol} at ${price:.2f} per share.')
         return redirect(url_for('portfolio.view_portfolio'))
@@ -0,0 +1,201 @@
+import logging
+import os
+import secrets
+from typing import Optional
+
+import msgpack
+import redis
+from flask import Flask, Request, Response
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Seconds of inactivity after which a server-side session expires; every request slides it
+SESSION_IDLE_TIMEOUT = int(os.getenv('SESSION_IDLE_TIMEOUT', 24 * 3600))
+
+SESSION_KEY_PREFIX = 'session:'
+USER_SESSIONS_KEY_PREFIX = 'session:user:'
+
+
+def _session_key(sid: str) -> str:
+    return f"{SESSION_KEY_PREFIX}{sid}"
+
+
+def _user_sessions_key(user_id) -> str:
+    return f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+
+
+class RedisSession(CallbackDict, SessionMixin):
+    """A session whose data lives in Redis; the cookie only carries its ID."""
+
+    def __init__(self, initial=None, sid: Optional[str] = None, new: bool = False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        # Who the session belonged to when it was loaded, to detect login/logout
+        self.loaded_user_id = (initial or {}).get('_user_id')
+
+
+class RedisSessionInterface(SessionInterface):
+    """
+    Server-side sessions stored in Redis as msgpack.
+
+    Each session is a single key whose expiry is reset on every request it is
+    read by, so idle sessions age out after SESSION_IDLE_TIMEOUT. The IDs of a
+    logged-in user's sessions are tracked in a set so they can all be revoked
+    at once with revoke_user_sessions. The set has no expiry, since its
+    sessions may be kept alive indefinitely by reads; IDs of sessions that
+    have expired are pruned from it at each login. A fresh ID is issued
+    whenever the user attached to a session changes, so a pre-login ID cannot
+    be fixed by an attacker.
+
+    If Redis is unavailable, requests get an empty session rather than an
+    error, except that a login whose session cannot be saved fails with 503
+    instead of silently leaving the user logged out.
+    """
+
+    def __init__(self, client: redis.Redis = redis_client, idle_timeout: int = SESSION_IDLE_TIMEOUT):
+        self.client = client
+        self.idle_timeout = idle_timeout
+
+    def open_session(self, app: Flask, request: Request) -> RedisSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid:
+            return RedisSession(sid=secrets.token_urlsafe(32), new=True)
+
+        try:
+            # GETEX reads the session and slides its expiry in one round trip
+            payload = self.client.getex(_session_key(sid), ex=self.idle_timeout)
+        except redis.exceptions.RedisError as e:
+            logger.warning("Session store unavailable: %s", str(e))
+            payload = None
+
+        if payload is None:
+            return RedisSession(sid=secrets.token_urlsafe(32), new=True)
+
+        try:
+            data = msgpack.unpackb(payload, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            logger.error("Discarding unreadable session: %s", str(e))
+            return RedisSession(sid=secrets.token_urlsafe(32), new=True)
+        return RedisSession(data, sid=sid)
+
+    def save_session(self, app: Flask, session: RedisSession, response: Response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        user_id = session.get('_user_id')
+        old_sid = None
+        if session.modified and user_id != session.loaded_user_id:
+            old_sid, session.sid = session.sid, secrets.token_urlsafe(32)
+        logging_in = old_sid is not None and user_id is not None and bool(session)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            if old_sid is not None and not session.new:
+                pipe.delete(_session_key(old_sid))
+                if session.loaded_user_id is not None:
+                    pipe.srem(_user_sessions_key(session.loaded_user_id), old_sid)
+            if not session:
+                if session.modified and not session.new:
+                    pipe.delete(_session_key(session.sid))
+            elif session.modified:
+                pipe.set(_session_key(session.sid), msgpack.packb(dict(session), use_bin_type=True),
+                         ex=self.idle_timeout)
+                if user_id is not None:
+                    pipe.sadd(_user_sessions_key(user_id), session.sid)
+            pipe.execute()
+            if logging_in:
+                self._prune_user_sessions(user_id)
+        except redis.exceptions.RedisError as e:
+            if logging_in:
+                # Without a stored session the login would not stick; say so instead of redirecting
+                logger.error("Failed to save session at login for user %s: %s", user_id, str(e))
+                response.status_code = 503
+                response.headers.pop('Location', None)
+                response.set_data('Sign-in is temporarily unavailable. Please try again shortly.')
+                response.mimetype = 'text/plain'
+            else:
+                logger.warning("Failed to save session: %s", str(e))
+            return
+
+        if not session:
+            if session.modified and not session.new:
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+                response.vary.add('Cookie')
+            return
+
+        if not (session.new or old_sid is not None or self.should_set_cookie(app, session)):
+            return
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=httponly,
+            domain=domain,
+            path=path,
+            secure=secure,
+            samesite=samesite,
+        )
+        response.vary.add('Cookie')
+
+    def _prune_user_sessions(self, user_id) -> None:
+        """Drop the IDs of a user's expired sessions from their session set."""
+        key = _user_sessions_key(user_id)
+        sids = [sid.decode() if isinstance(sid, bytes) else sid for sid in self.client.smembers(key)]
+        if not sids:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for sid in sids:
+            pipe.exists(_session_key(sid))
+        expired = [sid for sid, alive in zip(sids, pipe.execute()) if not alive]
+        if expired:
+            self.client.srem(key, *expired)
+
+
+def revoke_user_sessions(user_id, client: redis.Redis = redis_client) -> int:
+    """
+    Log a user out everywhere by deleting all of their server-side sessions.
+
+    Args:
+        user_id: The ID of the user.
+        client (redis.Redis, optional): The Redis client holding the sessions.
+
+    Returns:
+        int: The number of sessions revoked.
+    """
+    try:
+        sids = client.smembers(_user_sessions_key(user_id))
+        pipe = client.pipeline(transaction=False)
+        for sid in sids:
+            pipe.delete(_session_key(sid.decode() if isinstance(sid, bytes) else sid))
+        pipe.delete(_user_sessions_key(user_id))
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.error("Failed to revoke sessions for user %s: %s", user_id, str(e))
+        return 0
+
+    logger.info("Revoked %d sessions for user %s", len(sids), user_id)
+    return len(sids)
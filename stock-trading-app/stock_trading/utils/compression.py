@@ -0,0 +1,90 @@
+import gzip
+import logging
+
+from stock_trading.utils.logger import configure_logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Text formats worth compressing; images, archives and files are left alone
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+    'application/javascript',
+)
+
+
+def _encode(data: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def init_compression(app) -> None:
+    """
+    Compress an app's text responses with brotli or gzip.
+
+    The encoding is negotiated from Accept-Encoding, preferring brotli when
+    the brotli package is installed. Responses smaller than
+    COMPRESSION_MIN_SIZE bytes are sent as they are, as are streamed
+    responses (the SSE price stream), files sent with send_file, responses
+    that already have a Content-Encoding and those marked no-transform.
+    Compressed responses carry `Vary: Accept-Encoding`, and a strong ETag is
+    weakened because the bytes no longer match the uncompressed body.
+
+    Args:
+        app (Flask): The application to configure.
+    """
+    from flask import request
+
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    min_size = int(app.config.get('COMPRESSION_MIN_SIZE', 1024))
+    gzip_level = int(app.config.get('COMPRESSION_GZIP_LEVEL', 6))
+    brotli_quality = int(app.config.get('COMPRESSION_BROTLI_QUALITY', 4))
+    mimetypes = set(app.config.get('COMPRESSION_MIMETYPES', COMPRESSIBLE_MIMETYPES))
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    if brotli is None:
+        logger.info("brotli is not installed; compressing responses with gzip only")
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.status_code < 200 or response.status_code in (204, 206)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in mimetypes
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        # The body now depends on the request's Accept-Encoding
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+
+        compressed = _encode(data, encoding, gzip_level, brotli_quality)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
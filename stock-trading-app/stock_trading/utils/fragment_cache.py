@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import time
+from typing import Any, Iterable, List, Mapping, Optional
+
+import redis
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+from stock_trading.utils.metrics import record_cache
+from stock_trading.utils.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+FRAGMENT_KEY_PREFIX = 'fragment:'
+
+
+def pluck(items: Iterable[Mapping[str, Any]], *fields: str) -> List[tuple]:
+    """
+    Template filter picking the fields a fragment shows from each item, so
+    fields it does not show (e.g. a quote's age) do not change its key.
+
+    Args:
+        items (Iterable[Mapping]): The rows, e.g. portfolio holdings.
+        *fields (str): The keys to keep.
+
+    Returns:
+        list[tuple]: One tuple of values per item.
+    """
+    return [tuple(item.get(field) for field in fields) for item in items]
+
+
+class MemoryFragmentStore:
+    """Rendered fragments held in this process, least recently used evicted first."""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+
+class RedisFragmentStore:
+    """Rendered fragments shared by all workers through Redis."""
+
+    def __init__(self, ttl: float):
+        self.ttl = max(1, int(ttl))
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = redis_client.get(key)
+        except redis.exceptions.RedisError as e:
+            logger.warning("Fragment cache read failed for %s: %s", key, str(e))
+            return None
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            redis_client.setex(key, self.ttl, value)
+        except redis.exceptions.RedisError as e:
+            logger.warning("Fragment cache write failed for %s: %s", key, str(e))
+
+
+class FragmentCacheExtension(Extension):
+    """
+    The `{% cache %}` template tag: cache a rendered block by the data it shows.
+
+        {% cache 'holdings', portfolio.holdings|pluck('symbol', 'shares') %}
+            ... markup built from each holding's symbol and shares ...
+        {% endcache %}
+
+    The first argument names the fragment; the rest are the values it depends
+    on. The key is a digest of those values and of the block's own template
+    code, so changed data or a changed template simply misses and stale
+    fragments age out with the TTL. Everything the block reads must be listed,
+    otherwise requests with different data could share a fragment.
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+        environment.filters['pluck'] = pluck
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        # Node reprs hold the block's structure but not line numbers, so edits
+        # elsewhere in the template keep its fragments valid
+        code = hashlib.sha1(repr(body).encode()).hexdigest()[:12]
+        call = self.call_method('_render', [args[0], nodes.Const(code), nodes.List(args[1:])])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, name: str, code: str, values: List[Any], caller) -> str:
+        store = self.environment.fragment_cache
+        if store is None:
+            return caller()
+
+        digest = hashlib.sha1(repr(values).encode()).hexdigest()
+        key = f"{FRAGMENT_KEY_PREFIX}{name}:{code}:{digest}"
+        cached = store.get(key)
+        if cached is not None:
+            record_cache('fragment', 'hit')
+            return Markup(cached)
+
+        record_cache('fragment', 'miss')
+        rendered = caller()
+        store.set(key, str(rendered))
+        return rendered
+
+
+def init_fragment_cache(app) -> None:
+    """
+    Enable `{% cache %}` blocks in an app's templates.
+
+    FRAGMENT_CACHE_BACKEND selects where fragments are kept: "memory"
+    (default, per process), "redis" (shared by workers) or "none" (blocks are
+    always rendered). Fragments expire after FRAGMENT_CACHE_TTL seconds.
+
+    Args:
+        app (Flask): The application to configure.
+    """
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    backend = app.config.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    ttl = float(app.config.get('FRAGMENT_CACHE_TTL', 300))
+    if backend == 'memory':
+        store = MemoryFragmentStore(ttl, int(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 10000)))
+    elif backend == 'redis':
+        store = RedisFragmentStore(ttl)
+    elif backend == 'none':
+        store = None
+    else:
+        raise ValueError(f"Unknown FRAGMENT_CACHE_BACKEND: {backend}")
+    app.jinja_env.fragment_cache = store
+
+
+def precompile_templates(app) -> int:
+    """
+    Compile all of an app's templates into the Jinja template cache.
+
+    Called once in the gunicorn master (see wsgi.py), so forked workers start
+    with compiled templates instead of compiling them on their first requests.
+
+    Args:
+        app (Flask): The application whose templates to compile.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    started = time.perf_counter()
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    logger.info("Compiled %d templates in %.1f ms", len(names), (time.perf_counter() - started) * 1000)
+    return len(names)
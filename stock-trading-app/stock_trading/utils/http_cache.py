@@ -0,0 +1,200 @@
+import hashlib
+import logging
+import os
+import time
+from functools import wraps
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import redis
+from flask import make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+
+from stock_trading.clients.redis_client import redis_client
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Validators also rotate on this period, so a missed version bump (e.g. Redis
+# was down during a write) cannot pin clients to stale data for longer
+HTTP_CACHE_VALIDATOR_TTL = int(os.getenv('HTTP_CACHE_VALIDATOR_TTL', 300))
+
+# Versioned data: caches may store it but must revalidate on every use
+REVALIDATE = os.getenv('HTTP_CACHE_REVALIDATE', 'public, no-cache')
+# Daily price series change at most a few times a day
+HISTORICAL_CACHE_CONTROL = os.getenv('HTTP_CACHE_HISTORICAL', 'public, max-age=300')
+
+VERSION_KEY_PREFIX = 'version:'
+
+
+def _version_key(scope: str) -> str:
+    return f"{VERSION_KEY_PREFIX}{scope}"
+
+
+def bump_versions(scopes: Iterable[str]) -> None:
+    """
+    Record that the data in some scopes changed.
+
+    A missing counter starts from the current time in milliseconds rather
+    than from zero, so versions never repeat after Redis loses its data.
+
+    Args:
+        scopes (Iterable[str]): The changed scopes, e.g. "stocks" or "stock:AAPL".
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    now = time.time()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for scope in scopes:
+            pipe.set(_version_key(scope), int(now * 1000), nx=True)
+            pipe.incr(_version_key(scope))
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.error("Failed to bump data versions %s: %s", scopes, str(e))
+
+
+def get_versions(scopes: List[str]) -> Optional[List[int]]:
+    """
+    Get the current version of each scope.
+
+    Args:
+        scopes (list[str]): The scopes a response depends on.
+
+    Returns:
+        Optional[list[int]]: The versions, or None if Redis is unavailable.
+    """
+    keys = [_version_key(scope) for scope in scopes]
+    try:
+        versions = redis_client.mget(keys)
+        missing = [scope for scope, version in zip(scopes, versions) if version is None]
+        if missing:
+            # Never written, or lost: start those counters now so later reads agree
+            bump_versions(missing)
+            versions = redis_client.mget(keys)
+            if any(version is None for version in versions):
+                return None
+    except redis.exceptions.RedisError as e:
+        logger.warning("Data versions unavailable: %s", str(e))
+        return None
+    return [int(v) for v in versions]
+
+
+def _etag(*parts: Any) -> str:
+    return hashlib.sha1('\x1f'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def _not_modified(etag: str, cache_control: str):
+    response = make_response('', 304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def conditional(scopes: Callable[..., List[str]], cache_control: str = REVALIDATE):
+    """
+    Answer conditional GETs of a view from data versions, before running it.
+
+    The ETag is derived from the versions of the scopes the view depends on,
+    the request path and query string, so a client revalidating unchanged data
+    gets a 304 without the view's queries or serialization being run. If
+    Redis is unavailable, the view runs and no validators are sent.
+
+    No Last-Modified is sent: with one-second resolution, two writes in the
+    same second would give If-Modified-Since clients a 304 for the older data.
+
+    Args:
+        scopes (Callable): Maps the view's arguments to the scopes it depends on.
+        cache_control (str, optional): The Cache-Control header to send.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            versions = get_versions(scopes(*args, **kwargs))
+            if versions is None:
+                return view(*args, **kwargs)
+            etag = _etag(request.endpoint, request.full_path, *versions,
+                         int(time.time() // HTTP_CACHE_VALIDATOR_TTL))
+
+            if not is_resource_modified(request.environ, etag=f'W/"{etag}"'):
+                return _not_modified(etag, cache_control)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapped
+    return decorator
+
+
+def content_conditional(cache_control: str):
+    """
+    Add a content-hash ETag to a view's successful responses and answer
+    matching conditional GETs with 304.
+
+    For data without a version counter: the body is still built, but not sent.
+
+    Args:
+        cache_control (str): The Cache-Control header to send.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            etag = _etag(response.get_data())
+            if not is_resource_modified(request.environ, etag=f'W/"{etag}"'):
+                return _not_modified(etag, cache_control)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapped
+    return decorator
+
+
+# Models whose changes bump data versions, with the scopes each instance belongs to
+_tracked_models: Dict[type, Callable[[Any], Iterable[str]]] = {}
+
+_PENDING_SCOPES = 'pending_version_scopes'
+
+
+def track_versions(model: type, scopes: Callable[[Any], Iterable[str]]) -> None:
+    """
+    Bump data versions whenever instances of a model are committed.
+
+    Versions are bumped after the commit, not at flush time, so a reader can
+    never see a new version alongside the old data.
+
+    Args:
+        model (type): The mapped class.
+        scopes (Callable): Maps an instance to the scopes it belongs to.
+    """
+    _tracked_models[model] = scopes
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_scopes(session, flush_context) -> None:
+    for instance in chain(session.new, session.dirty, session.deleted):
+        scopes = _tracked_models.get(type(instance))
+        if scopes is not None:
+            session.info.setdefault(_PENDING_SCOPES, set()).update(scopes(instance))
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_scopes(session) -> None:
+    scopes = session.info.pop(_PENDING_SCOPES, None)
+    if scopes:
+        bump_versions(scopes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_scopes(session) -> None:
+    session.info.pop(_PENDING_SCOPES, None)
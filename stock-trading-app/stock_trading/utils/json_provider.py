@@ -0,0 +1,84 @@
+import logging
+from decimal import Decimal
+from typing import Any, Union
+
+from flask.json.provider import JSONProvider
+
+from stock_trading.utils.logger import configure_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        # As a string, so prices keep their exact value
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, for jsonify(), request.get_json() and the
+    tojson template filter.
+
+    Unlike Flask's default provider, datetimes are written in ISO 8601 (naive
+    ones as UTC, which is how the database stores them) instead of as HTTP
+    dates. Decimals are written as strings, and dataclasses, UUIDs and dates
+    are serialized natively. Keys are only sorted if sort_keys is set.
+    """
+
+    sort_keys = False
+    compact = None
+    mimetype = 'application/json'
+
+    def _options(self, indent: bool = False) -> int:
+        options = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self._options(bool(kwargs.get('indent')))).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        # Skip the str round trip: the body is the bytes orjson produced
+        body = orjson.dumps(obj, default=_default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app) -> None:
+    """
+    Install the JSON provider selected by JSON_PROVIDER.
+
+    "orjson" (default) uses OrjsonProvider if orjson is installed; "default"
+    keeps Flask's provider.
+
+    Args:
+        app (Flask): The application to configure.
+    """
+    name = app.config.get('JSON_PROVIDER', 'orjson')
+    if name == 'default':
+        return
+    if name != 'orjson':
+        raise ValueError(f"Unknown JSON_PROVIDER: {name}")
+    if orjson is None:
+        logger.warning("orjson is not installed; using Flask's default JSON provider")
+        return
+    app.json = OrjsonProvider(app)
@@ -0,0 +1,20 @@
+from typing import Any, Callable
+
+
+class LazyProxy:
+    """
+    Stand in for an object that is only created when it is first used.
+
+    Every attribute access is forwarded to factory(), so a module can export a
+    client at import time without constructing it, and the client can later be
+    replaced (e.g. after a fork) without re-importing the modules that use it.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_factory', factory)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._factory(), name)
+
+    def __repr__(self) -> str:
+        return f"<LazyProxy {getattr(self._factory, '__name__', self._factory)}>"
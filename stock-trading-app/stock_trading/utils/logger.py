@@ -1,26 +1,220 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+import warnings
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
-from flask import current_app, has_request_context
 
+# Default level for every logger, and per-logger overrides by name prefix,
+# e.g. LOG_LEVELS="stock_trading.clients=DEBUG,stock_trading.sessions=WARNING"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+# "text" for human-readable lines, "json" for one JSON object per line
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+# Records waiting to be written; when full, new records are dropped rather than blocking
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+# Longest rendering of a payload wrapped in truncated()
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', 500))
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-    # Create a console handler that logs to stderr
+
+def _level_number(level: str, setting: str) -> int:
+    # A typo in the environment should cost verbosity, not stop the app from importing
+    level = level.strip().upper()
+    if level.isdigit():
+        return int(level)
+    number = logging.getLevelName(level)
+    if isinstance(number, int):
+        return number
+    warnings.warn(f"Unknown log level {level!r} in {setting}; using INFO")
+    return logging.INFO
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    levels = {}
+    for item in spec.split(','):
+        name, sep, level = item.partition('=')
+        if sep and name.strip():
+            levels[name.strip()] = _level_number(level, 'LOG_LEVELS')
+    return levels
+
+
+_LEVEL_OVERRIDES = _parse_levels(LOG_LEVELS)
+
+
+def level_for(name: str) -> int:
+    """
+    Get the configured level for a logger.
+
+    The longest LOG_LEVELS prefix matching the name wins; otherwise LOG_LEVEL
+    applies.
+
+    Args:
+        name (str): The logger name.
+
+    Returns:
+        int: The logging level.
+    """
+    matches = [prefix for prefix in _LEVEL_OVERRIDES
+               if name == prefix or name.startswith(prefix + '.')]
+    if matches:
+        return _LEVEL_OVERRIDES[max(matches, key=len)]
+    return _level_number(LOG_LEVEL, 'LOG_LEVEL')
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    A QueueHandler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler renders every message in the logging thread before
+    enqueueing it. Here only the traceback, if any, is rendered up front; the
+    message and its arguments are formatted when the record is written. Log
+    arguments must therefore not be mutated after the call.
+
+    Records are dropped, and counted, if the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _make_output_handler() -> logging.Handler:
     handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+_setup_lock = threading.Lock()
+_queue_handler: Optional[DeferredQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_pipeline() -> DeferredQueueHandler:
+    global _queue_handler, _listener
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    if _queue_handler is None:
+        _queue_handler = DeferredQueueHandler(log_queue)
+    else:
+        _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, _make_output_handler(), respect_handler_level=True)
+    _listener.start()
+    return _queue_handler
+
+
+def get_queue_handler() -> DeferredQueueHandler:
+    """
+    Get the shared queue handler, starting the writer thread on first use.
+
+    Returns:
+        DeferredQueueHandler: The handler every configured logger writes to.
+    """
+    if _queue_handler is None or _listener is None:
+        with _setup_lock:
+            if _queue_handler is None or _listener is None:
+                _start_pipeline()
+    return _queue_handler
+
+
+def stop_logging() -> None:
+    """Write out any queued records and stop the writer thread."""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def _restart_in_child() -> None:
+    # The writer thread does not survive fork and the queue's lock may have
+    # been held when the parent forked, so a forked worker starts over
+    global _listener
+    _listener = None
+    if _queue_handler is not None:
+        _start_pipeline()
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def configure_logger(logger: logging.Logger) -> None:
+    """
+    Route a logger through the shared, non-blocking logging pipeline.
+
+    Safe to call any number of times for the same logger. Records are put on
+    a bounded queue and written to stderr by a single background thread, so
+    the calling thread never waits on I/O.
+
+    Args:
+        logger (logging.Logger): The logger to configure.
+    """
+    logger.setLevel(level_for(logger.name))
+    handler = get_queue_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    # The shared handler is the only output; don't repeat records via the root logger
+    logger.propagate = False
+
+
+class truncated:
+    """
+    Render a value for logging, lazily and cut to a maximum length.
+
+    Nothing is converted to a string unless the record is actually written,
+    so large payloads cost nothing at disabled levels.
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    Args:
+        value: The value to log.
+        limit (int, optional): The maximum number of characters.
+    """
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+    __slots__ = ('value', 'limit')
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+    def __init__(self, value: Any, limit: int = LOG_PAYLOAD_MAX_CHARS):
+        self.value = value
+        self.limit = limit
 
-    if has_request_context():
-        app_logger = current_app.logger
-        for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... ({len(text) - self.limit} more chars)"
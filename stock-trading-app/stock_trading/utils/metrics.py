@@ -0,0 +1,288 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+
+def _log_linear_buckets(min_exponent: int, max_exponent: int) -> List[float]:
+    # Every decade is split the same way, so the relative error of a quantile
+    # estimate is bounded (about 25%) from 100us to 100s, as in an HDR histogram
+    mantissas = (1, 1.25, 1.5, 2, 2.5, 3, 4, 5, 6, 7.5)
+    return [round(m * 10 ** e, 10) for e in range(min_exponent, max_exponent) for m in mantissas]
+
+
+# Upper bounds (seconds) of the latency buckets
+LATENCY_BUCKETS = _log_linear_buckets(-4, 2) + [100.0]
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    A fixed-bucket latency histogram.
+
+    Args:
+        buckets (list[float]): Sorted bucket upper bounds, in seconds.
+    """
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One extra slot for values above the last bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate in seconds (0.0 if nothing was observed).
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+class MetricsRegistry:
+    """
+    In-process histograms and counters, rendered in Prometheus text format.
+
+    Each process keeps its own registry, so with several workers every worker
+    is scraped separately (or its series are summed by the scraper).
+
+    Args:
+        enabled (bool): When False, recording is a no-op.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """
+        Register the type ("histogram" or "counter") and help text of a metric.
+        """
+        self._help[name] = (kind, help_text)
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Record a duration in a histogram.
+
+        Args:
+            name (str): The metric name.
+            seconds (float): The observed duration.
+            **labels: The label values identifying the series.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): The metric name.
+            amount (float, optional): How much to add.
+            **labels: The label values identifying the series.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Time a block into a histogram; failures are recorded too.
+
+        Args:
+            name (str): The metric name.
+            **labels: The label values identifying the series.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """
+        Get the histogram for a series, if anything was recorded in it.
+        """
+        return self._histograms.get((name, tuple(sorted(labels.items()))))
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+        Get the value of a counter series (0.0 if never incremented).
+        """
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """
+        Render every series in the Prometheus text exposition format (0.0.4).
+
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines: List[str] = []
+        described = set()
+
+        def header(name: str, default_kind: str) -> None:
+            if name in described:
+                return
+            described.add(name)
+            kind, help_text = self._help.get(name, (default_kind, ''))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            header(name, 'histogram')
+            counts, count, total = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_bound(bound)))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(f"{name}{_format_labels(labels)} {value!r}")
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry(enabled=METRICS_ENABLED)
+
+metrics.describe('http_request_duration_seconds', 'histogram', 'Time to handle a request, by route.')
+metrics.describe('upstream_request_duration_seconds', 'histogram', 'Time spent in market-data provider calls.')
+metrics.describe('mongodb_command_duration_seconds', 'histogram', 'MongoDB command round-trip time.')
+metrics.describe('sql_query_duration_seconds', 'histogram', 'SQL statement execution time.')
+metrics.describe('redis_command_duration_seconds', 'histogram', 'Redis command round-trip time.')
+metrics.describe('cache_requests_total', 'counter', 'Cache lookups, by cache and result.')
+
+
+def record_cache(cache: str, result: str) -> None:
+    """
+    Count a cache lookup.
+
+    Args:
+        cache (str): The cache name, e.g. "overview".
+        result (str): The outcome, e.g. "hit" or "miss".
+    """
+    metrics.inc('cache_requests_total', cache=cache, result=result)
+
+
+def init_request_metrics(app) -> None:
+    """
+    Time every request of a Flask app into http_request_duration_seconds.
+
+    Requests are labelled by URL rule rather than path, so the number of
+    series stays bounded.
+
+    Args:
+        app (Flask): The application to instrument.
+    """
+    from flask import g, request
+
+    if not metrics.enabled:
+        return
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _remember_status(response):
+        g.response_status = response.status_code
+        return response
+
+    # Recorded at teardown, which also runs when the request raised, so
+    # unhandled errors are counted (as 500s) alongside normal responses
+    @app.teardown_request
+    def _record_duration(exc):
+        started = g.pop('request_started', None)
+        if started is not None:
+            status = g.pop('response_status', None)
+            metrics.observe(
+                'http_request_duration_seconds',
+                time.perf_counter() - started,
+                method=request.method,
+                route=request.url_rule.rule if request.url_rule else 'unmatched',
+                status=str(500 if exc is not None or status is None else status),
+            )
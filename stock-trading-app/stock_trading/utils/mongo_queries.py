@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+
+def fields(*names: str) -> Dict[str, Any]:
+    """
+    Build a projection that returns only the named fields.
+
+    _id is excluded unless it is named, so callers always state exactly what
+    they read.
+
+    Args:
+        *names (str): The fields to return (dotted paths allowed).
+
+    Returns:
+        dict: A find() projection.
+    """
+    projection: Dict[str, Any] = {name: 1 for name in names}
+    if '_id' not in names:
+        projection['_id'] = 0
+    return projection
+
+
+def with_element(projection: Dict[str, Any], array: str, **match: Any) -> Dict[str, Any]:
+    """
+    Add the first element of an array matching some conditions to a projection.
+
+    Uses $elemMatch, so only that element, rather than the whole array, is
+    sent by the server.
+
+    Args:
+        projection (dict): The projection to extend (not modified).
+        array (str): The array field.
+        **match: Field conditions the element must satisfy.
+
+    Returns:
+        dict: The extended projection.
+    """
+    return {**projection, array: {'$elemMatch': match}}
@@ -0,0 +1,151 @@
+import hashlib
+import hmac
+import logging
+import os
+from typing import Tuple
+
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# KDF used for new hashes: "scrypt" or "pbkdf2_sha256"
+PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM', 'scrypt')
+SCRYPT_N = int(os.getenv('SCRYPT_N', 2 ** 14))
+SCRYPT_R = int(os.getenv('SCRYPT_R', 8))
+SCRYPT_P = int(os.getenv('SCRYPT_P', 1))
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', 600000))
+
+# Upper bounds on the work a single verification may do, so a huge password or a
+# tampered hash row cannot turn one login attempt into a CPU or memory sink
+MAX_PASSWORD_LENGTH = int(os.getenv('MAX_PASSWORD_LENGTH', 1024))
+SCRYPT_MAX_N = int(os.getenv('SCRYPT_MAX_N', 2 ** 17))
+PBKDF2_MAX_ITERATIONS = int(os.getenv('PBKDF2_MAX_ITERATIONS', 2000000))
+
+LEGACY_SHA256 = 'sha256'
+
+
+def _scrypt(password: str, salt: str, n: int, r: int, p: int) -> str:
+    # maxmem must cover 128 * n * r bytes plus some headroom
+    return hashlib.scrypt(
+        password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+        maxmem=256 * n * r + 1024 * 1024, dklen=32
+    ).hex()
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations).hex()
+
+
+def hash_password(password: str, salt: str) -> str:
+    """
+    Hash a password with the configured key derivation function.
+
+    The result encodes the algorithm and its cost parameters, so hashes made
+    under older settings can still be verified after the settings change.
+
+    Args:
+        password (str): The plaintext password.
+        salt (str): The per-user salt (hex).
+
+    Returns:
+        str: The encoded hash, e.g. "scrypt$16384$8$1$<hex>".
+
+    Raises:
+        ValueError: If the password is too long or the algorithm is unknown.
+    """
+    if len(password) > MAX_PASSWORD_LENGTH:
+        raise ValueError(f"Password must be at most {MAX_PASSWORD_LENGTH} characters")
+    if PASSWORD_HASH_ALGORITHM == 'scrypt':
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)}"
+    if PASSWORD_HASH_ALGORITHM == 'pbkdf2_sha256':
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_pbkdf2(password, salt, PBKDF2_ITERATIONS)}"
+    raise ValueError(f"Unknown password hash algorithm: {PASSWORD_HASH_ALGORITHM}")
+
+
+def generate_salted_hash(password: str) -> Tuple[str, str]:
+    """
+    Hash a password under a new random salt.
+
+    This is a plain module-level function so it can run in a process pool.
+
+    Args:
+        password (str): The plaintext password.
+
+    Returns:
+        tuple: The salt (hex) and the encoded hash.
+    """
+    salt = os.urandom(16).hex()
+    return salt, hash_password(password, salt)
+
+
+def _parse(encoded: str) -> Tuple[str, list]:
+    if '$' not in encoded:
+        return LEGACY_SHA256, [encoded]
+    algorithm, *parts = encoded.split('$')
+    return algorithm, parts
+
+
+def verify_password(password: str, salt: str, encoded: str) -> bool:
+    """
+    Check a password against a stored hash in constant time.
+
+    Legacy rows holding a bare SHA-256 hex digest are still accepted.
+
+    Args:
+        password (str): The plaintext password to check.
+        salt (str): The per-user salt (hex).
+        encoded (str): The stored hash.
+
+    Returns:
+        bool: True if the password matches, False otherwise (including for
+            malformed hashes or cost parameters above the configured limits).
+    """
+    if len(password) > MAX_PASSWORD_LENGTH:
+        return False
+
+    algorithm, parts = _parse(encoded)
+    try:
+        if algorithm == LEGACY_SHA256:
+            candidate = hashlib.sha256((password + salt).encode()).hexdigest()
+            expected = parts[0]
+        elif algorithm == 'scrypt':
+            n, r, p, expected = int(parts[0]), int(parts[1]), int(parts[2]), parts[3]
+            if n > SCRYPT_MAX_N or r * p > 64:
+                logger.warning("Refusing to verify scrypt hash with excessive cost (n=%d, r=%d, p=%d)", n, r, p)
+                return False
+            candidate = _scrypt(password, salt, n, r, p)
+        elif algorithm == 'pbkdf2_sha256':
+            iterations, expected = int(parts[0]), parts[1]
+            if iterations > PBKDF2_MAX_ITERATIONS:
+                logger.warning("Refusing to verify pbkdf2 hash with excessive cost (%d iterations)", iterations)
+                return False
+            candidate = _pbkdf2(password, salt, iterations)
+        else:
+            logger.error("Unknown password hash algorithm: %s", algorithm)
+            return False
+    except (IndexError, ValueError) as e:
+        logger.error("Malformed password hash: %s", str(e))
+        return False
+
+    return hmac.compare_digest(candidate, expected)
+
+
+def needs_rehash(encoded: str) -> bool:
+    """
+    Check whether a stored hash was made with an outdated algorithm or cost.
+
+    Args:
+        encoded (str): The stored hash.
+
+    Returns:
+        bool: True if the hash should be replaced on the user's next login.
+    """
+    algorithm, parts = _parse(encoded)
+    if algorithm != PASSWORD_HASH_ALGORITHM:
+        return True
+    if algorithm == 'scrypt':
+        return parts[:3] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+    return parts[:1] != [str(PBKDF2_ITERATIONS)]
@@ -0,0 +1,286 @@
+import cProfile
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# File extension of each stored profile format
+PROFILE_FORMATS = {'collapsed': '.collapsed', 'pstats': '.pstats'}
+
+# cProfile can only profile one thread at a time
+_cprofile_lock = threading.Lock()
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of one thread at a fixed interval.
+
+    A background thread records the target thread's stack every `interval`
+    seconds; the profiled code itself is not traced, so its overhead is low
+    and independent of how many calls it makes.
+
+    Args:
+        thread_id (int): The thread to sample (threading.get_ident()).
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """
+        Render the samples as collapsed stacks ("root;...;leaf count" per line),
+        the input format of flamegraph.pl and speedscope.
+        """
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """
+    Keep the most recent profiles on disk.
+
+    Each profile is a data file plus a JSON metadata file named by its ID.
+
+    Args:
+        directory (str): Where to write the profiles.
+        max_profiles (int): How many profiles to keep; the oldest are deleted.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, profile_id + suffix)
+
+    def save(self, metadata: Dict[str, Any], fmt: str, data: Optional[str] = None,
+             profile: Optional[cProfile.Profile] = None) -> str:
+        """
+        Store a profile.
+
+        Args:
+            metadata (dict): Details of the profiled request.
+            fmt (str): "collapsed" or "pstats".
+            data (str, optional): The collapsed stacks.
+            profile (cProfile.Profile, optional): The cProfile result.
+
+        Returns:
+            str: The new profile's ID.
+        """
+        profile_id = uuid.uuid4().hex
+        os.makedirs(self.directory, exist_ok=True)
+        data_path = self._path(profile_id, PROFILE_FORMATS[fmt])
+        if profile is not None:
+            profile.dump_stats(data_path)
+        else:
+            with open(data_path, 'w') as f:
+                f.write(data or '')
+        with open(self._path(profile_id, '.json'), 'w') as f:
+            json.dump({'id': profile_id, 'format': fmt, **metadata}, f)
+        self._prune()
+        return profile_id
+
+    def _prune(self) -> None:
+        with self._lock:
+            profiles = self.list()
+            for stale in profiles[self.max_profiles:]:
+                for suffix in ['.json', *PROFILE_FORMATS.values()]:
+                    try:
+                        os.remove(self._path(stale['id'], suffix))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        List stored profiles, newest first.
+
+        Returns:
+            list[dict]: The metadata of each profile.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda p: p.get('created', 0), reverse=True)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of a profile.
+
+        Args:
+            profile_id (str): The profile ID.
+
+        Returns:
+            Optional[dict]: The metadata, or None if there is no such profile.
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, '.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def data_path(self, profile_id: str) -> Optional[str]:
+        """
+        Get the path of a profile's data file.
+
+        Args:
+            profile_id (str): The profile ID.
+
+        Returns:
+            Optional[str]: The absolute path, or None if there is no such profile.
+        """
+        metadata = self.get(profile_id)
+        if metadata is None:
+            return None
+        path = os.path.abspath(self._path(profile_id, PROFILE_FORMATS[metadata['format']]))
+        return path if os.path.exists(path) else None
+
+
+def get_profile_store(app) -> ProfileStore:
+    """Get the profile store configured for an app."""
+    return ProfileStore(app.config.get('PROFILING_DIR', 'instance/profiles'),
+                        app.config.get('PROFILING_MAX_PROFILES', 100))
+
+
+def init_profiling(app) -> None:
+    """
+    Profile a sample of an app's requests when PROFILING_ENABLED is set.
+
+    A request is profiled when it carries the PROFILING_HEADER header set to
+    PROFILING_TOKEN, or at random with probability PROFILING_SAMPLE_RATE.
+    PROFILING_MODE selects the sampling profiler ("sampling", which records
+    collapsed stacks) or cProfile ("cprofile", which records pstats). When
+    profiling is disabled no hooks are installed, so requests pay nothing.
+
+    Args:
+        app (Flask): The application to instrument.
+    """
+    from flask import g, request
+
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+
+    mode = app.config.get('PROFILING_MODE', 'sampling')
+    sample_rate = float(app.config.get('PROFILING_SAMPLE_RATE', 0.0))
+    header = app.config.get('PROFILING_HEADER', 'X-Profile')
+    token = app.config.get('PROFILING_TOKEN', '')
+    interval = float(app.config.get('PROFILING_INTERVAL', 0.005))
+    store = get_profile_store(app)
+    logger.info("Request profiling enabled (%s mode, sample rate %.3f)", mode, sample_rate)
+    if mode == 'sampling' and 'gevent.monkey' in sys.modules and sys.modules['gevent.monkey'].is_module_patched('threading'):
+        # Greenlets share one OS thread, so the sampler cannot see a single request's stack
+        logger.warning("Sampling profiles are not meaningful under gevent; use PROFILING_MODE=cprofile")
+
+    def wanted() -> bool:
+        requested = request.headers.get(header)
+        if requested is not None and token and hmac.compare_digest(requested, token):
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    @app.before_request
+    def _start_profile():
+        if not wanted():
+            return
+        if mode == 'cprofile':
+            if not _cprofile_lock.acquire(blocking=False):
+                return
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(threading.get_ident(), interval)
+            profiler.start()
+        g.profile = (profiler, time.perf_counter())
+
+    @app.after_request
+    def _finish_profile(response):
+        active = g.pop('profile', None)
+        if active is None:
+            return response
+        profiler, started = active
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            _cprofile_lock.release()
+        else:
+            profiler.stop()
+
+        metadata = {
+            'created': time.time(),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profile_id = store.save(metadata, 'pstats', profile=profiler)
+            else:
+                profile_id = store.save(metadata, 'collapsed', data=profiler.collapsed())
+        except OSError as e:
+            logger.error("Failed to store profile for %s: %s", request.path, str(e))
+            return response
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        # Only reached with a profile still running if the response was never finalized
+        active = g.pop('profile', None)
+        if active is not None:
+            profiler = active[0]
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+                _cprofile_lock.release()
+            else:
+                profiler.stop()
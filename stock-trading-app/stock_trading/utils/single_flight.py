@@ -0,0 +1,131 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import redis
+
+from stock_trading.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _Call:
+    """An in-flight call whose outcome is shared with every waiting caller."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single execution.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is in flight wait for it, for at most wait_timeout seconds, and
+    receive the same result or exception. Results are shared objects, so
+    callers must treat them as read-only.
+
+    When a Redis client is given, leaders additionally coordinate across worker
+    processes: one process takes a short Redis lock and publishes its (JSON
+    serializable) result for the others to pick up. The published result stays
+    readable for result_ttl seconds, so across processes this also acts as a
+    cache of that lifetime: a call made shortly after another finished gets
+    its result instead of a new one. Any Redis failure degrades to running
+    the function locally.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, lock_timeout: float = 10.0,
+                 result_ttl: float = 2.0, poll_interval: float = 0.025, wait_timeout: float = 30.0):
+        self._redis = redis_client
+        self._lock_timeout = lock_timeout
+        self._wait_timeout = wait_timeout
+        self._result_ttl_ms = int(result_ttl * 1000)
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for an identical in-flight call and share its outcome.
+
+        Args:
+            key (str): Identifies calls that are interchangeable.
+            fn (Callable): The zero-argument function to run.
+
+        Returns:
+            Any: The result of fn.
+
+        Raises:
+            TimeoutError: If the in-flight call did not finish within wait_timeout.
+            Exception: Whatever fn raised, re-raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            logger.debug("Coalescing call for %s onto in-flight request", key)
+            if not call.done.wait(self._wait_timeout):
+                raise TimeoutError(f"In-flight call for {key} did not finish within {self._wait_timeout:.0f}s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if self._redis is not None:
+                call.result = self._do_across_processes(key, fn)
+            else:
+                call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _do_across_processes(self, key: str, fn: Callable[[], Any]) -> Any:
+        result_key = f"singleflight:result:{key}"
+        try:
+            cached = self._redis.get(result_key)
+            if cached is not None:
+                return json.loads(cached)
+
+            lock = self._redis.lock(f"singleflight:lock:{key}", timeout=self._lock_timeout)
+            if lock.acquire(blocking=False):
+                try:
+                    result = fn()
+                    try:
+                        self._redis.set(result_key, json.dumps(result), px=self._result_ttl_ms)
+                    except redis.exceptions.RedisError as e:
+                        logger.warning("Could not share result for %s: %s", key, str(e))
+                    return result
+                finally:
+                    try:
+                        lock.release()
+                    except redis.exceptions.RedisError:
+                        logger.warning("Single-flight lock for %s expired before release", key)
+
+            # Another process is fetching; wait for its result or for it to give up
+            deadline = time.monotonic() + self._lock_timeout
+            while time.monotonic() < deadline:
+                cached = self._redis.get(result_key)
+                if cached is not None:
+                    logger.debug("Shared result for %s from another process", key)
+                    return json.loads(cached)
+                if not lock.locked():
+                    break
+                time.sleep(self._poll_interval)
+        except redis.exceptions.RedisError as e:
+            logger.warning("Redis unavailable for single-flight on %s: %s", key, str(e))
+
+        return fn()
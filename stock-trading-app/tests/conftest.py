@@ -1,6 +1,6 @@
 import pytest
 
-from app import create_app
+from stock_trading import create_app
 from config import TestConfig
 from stock_trading.db import db
 
@@ -0,0 +1,191 @@
+import time
+
+import pytest
+
+from stock_trading.clients import alpha_vantage_client
+from stock_trading.clients.alpha_vantage_client import get_stock_info, get_stock_price, get_stock_quote, update_all_stock_prices
+from stock_trading.clients.market_data import ProviderError
+from stock_trading.utils.circuit_breaker import CircuitBreaker
+
+
+OVERVIEW_RESPONSE = {
+    "Symbol": "AAPL",
+    "Name": "Apple Inc",
+    "Description": "Apple designs consumer electronics.",
+    "Exchange": "NASDAQ",
+    "Sector": "TECHNOLOGY",
+    "Industry": "ELECTRONIC COMPUTERS"
+}
+
+
+@pytest.fixture
+def mock_overview_cache(mocker):
+    """Fixture to replace the Redis-backed overview cache with mocks."""
+    return {
+        "get": mocker.patch("stock_trading.clients.alpha_vantage_client.get_cached_overview", return_value=None),
+        "store": mocker.patch("stock_trading.clients.alpha_vantage_client.store_overview"),
+        "get_negative": mocker.patch("stock_trading.clients.alpha_vantage_client.get_negative", return_value=None),
+        "store_negative": mocker.patch("stock_trading.clients.alpha_vantage_client.store_negative"),
+    }
+
+
+##########################################################
+# Company Overview Cache
+##########################################################
+
+def test_get_stock_info_miss_fetches_and_caches(mocker, mock_overview_cache):
+    """Test that a cache miss fetches the overview and stores it."""
+    mock_query = mocker.patch("stock_trading.clients.alpha_vantage_client._query", return_value=OVERVIEW_RESPONSE)
+
+    info = get_stock_info("AAPL")
+
+    assert info["name"] == "Apple Inc"
+    mock_query.assert_called_once_with("OVERVIEW", "AAPL")
+    mock_overview_cache["store"].assert_called_once_with("AAPL", info)
+
+def test_get_stock_info_hit_skips_upstream(mocker, mock_overview_cache):
+    """Test that a fresh cached overview is served without an upstream call."""
+    cached = {"symbol": "AAPL", "name": "Apple Inc"}
+    mock_overview_cache["get"].return_value = (cached, 60.0)
+    mock_query = mocker.patch("stock_trading.clients.alpha_vantage_client._query")
+    mock_revalidate = mocker.patch("stock_trading.clients.alpha_vantage_client._schedule_overview_revalidation")
+
+    assert get_stock_info("AAPL") == cached
+    mock_query.assert_not_called()
+    mock_revalidate.assert_not_called()
+
+def test_get_stock_info_stale_hit_revalidates_in_background(mocker, mock_overview_cache):
+    """Test that an old cached overview is served and refreshed in the background."""
+    cached = {"symbol": "AAPL", "name": "Apple Inc"}
+    mock_overview_cache["get"].return_value = (cached, alpha_vantage_client.OVERVIEW_REVALIDATE_AFTER + 1)
+    mock_revalidate = mocker.patch("stock_trading.clients.alpha_vantage_client._schedule_overview_revalidation")
+
+    assert get_stock_info("AAPL") == cached
+    mock_revalidate.assert_called_once_with("AAPL")
+
+def test_get_stock_info_error_is_negatively_cached(mocker, mock_overview_cache):
+    """Test that an upstream error returns placeholder data and records a negative entry."""
+    mocker.patch("stock_trading.clients.alpha_vantage_client._query", side_effect=RuntimeError("timeout"))
+
+    info = get_stock_info("AAPL")
+
+    assert info["description"] == "Information temporarily unavailable"
+    mock_overview_cache["store_negative"].assert_called_once_with("AAPL", "Information temporarily unavailable")
+    mock_overview_cache["store"].assert_not_called()
+
+def test_get_stock_info_normalizes_symbol(mocker, mock_overview_cache):
+    """Test that differently cased symbols share one overview and negative cache key."""
+    mock_query = mocker.patch("stock_trading.clients.alpha_vantage_client._query", return_value=OVERVIEW_RESPONSE)
+
+    get_stock_info(" aapl ")
+
+    mock_overview_cache["get"].assert_called_once_with("AAPL")
+    mock_overview_cache["get_negative"].assert_called_once_with("AAPL")
+    mock_query.assert_called_once_with("OVERVIEW", "AAPL")
+
+def test_get_stock_info_negative_hit_skips_upstream(mocker, mock_overview_cache):
+    """Test that a negatively cached symbol is not looked up again."""
+    mock_overview_cache["get_negative"].return_value = "No description available"
+    mock_query = mocker.patch("stock_trading.clients.alpha_vantage_client._query")
+
+    info = get_stock_info("ZZZZ")
+
+    assert info["name"] == "ZZZZ"
+    assert info["description"] == "No description available"
+    mock_query.assert_not_called()
+
+
+##########################################################
+# Quote Circuit Breaker and Stale Fallback
+##########################################################
+
+@pytest.fixture
+def mock_provider(mocker):
+    """Fixture to replace the market-data provider and reset the quote breaker."""
+    provider = mocker.Mock()
+    mocker.patch("stock_trading.clients.alpha_vantage_client.get_provider", return_value=provider)
+    mocker.patch.object(alpha_vantage_client, "_quote_breaker", CircuitBreaker("quotes", failure_threshold=2))
+    return provider
+
+
+@pytest.fixture
+def mock_quote_cache(mocker):
+    """Fixture to replace the last-known quote store."""
+    return {
+        "get": mocker.patch("stock_trading.clients.alpha_vantage_client.get_last_quote", return_value=None),
+        "store": mocker.patch("stock_trading.clients.alpha_vantage_client.store_last_quote"),
+    }
+
+
+def test_get_stock_quote_fresh(mock_provider, mock_quote_cache):
+    """Test that a successful fetch is returned fresh and remembered."""
+    mock_provider.get_quote.return_value = 150.0
+
+    quote = get_stock_quote("AAPL")
+
+    assert quote["price"] == 150.0
+    assert quote["stale"] is False
+    assert mock_quote_cache["store"].call_args[0][:2] == ("AAPL", 150.0)
+
+def test_get_stock_quote_serves_stale_on_error(mock_provider, mock_quote_cache):
+    """Test that an upstream failure serves the last known price flagged as stale."""
+    mock_provider.get_quote.side_effect = ProviderError("down")
+    mock_quote_cache["get"].return_value = (149.0, time.time() - 120)
+
+    quote = get_stock_quote("AAPL")
+
+    assert quote["price"] == 149.0
+    assert quote["stale"] is True
+    assert quote["age_seconds"] >= 120
+
+def test_get_stock_quote_error_without_last_price(mock_provider, mock_quote_cache):
+    """Test that an upstream failure with nothing cached raises ValueError."""
+    mock_provider.get_quote.side_effect = ProviderError("down")
+
+    with pytest.raises(ValueError, match="Network error while fetching price"):
+        get_stock_quote("AAPL")
+
+def test_get_stock_quote_open_circuit_skips_upstream(mock_provider, mock_quote_cache):
+    """Test that an open breaker fails fast without calling the provider."""
+    mock_provider.get_quote.side_effect = ProviderError("down")
+    mock_quote_cache["get"].return_value = (149.0, time.time())
+    get_stock_quote("AAPL")
+    get_stock_quote("AAPL")
+    mock_provider.get_quote.reset_mock()
+
+    quote = get_stock_quote("AAPL")
+
+    assert quote["stale"] is True
+    mock_provider.get_quote.assert_not_called()
+
+def test_get_stock_quote_missing_data_does_not_trip_breaker(mock_provider, mock_quote_cache):
+    """Test that 'no data' answers are raised and do not count as upstream failures."""
+    mock_provider.get_quote.side_effect = ValueError("No quote data available")
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="No quote data available"):
+            get_stock_quote("ZZZZ")
+
+    assert alpha_vantage_client._quote_breaker.state == CircuitBreaker.CLOSED
+
+def test_get_stock_price_refuses_stale(mock_provider, mock_quote_cache):
+    """Test that get_stock_price raises instead of returning a last known price."""
+    mock_provider.get_quote.side_effect = ProviderError("down")
+    mock_quote_cache["get"].return_value = (149.0, time.time() - 3600)
+
+    with pytest.raises(ValueError, match="temporarily unavailable"):
+        get_stock_price("AAPL")
+
+def test_update_all_stock_prices_skips_stale(app, mocker, mock_provider, mock_quote_cache):
+    """Test that a price refresh does not write last known prices back to the database."""
+    stock = mocker.Mock(id=1, symbol="AAPL")
+    mocker.patch("stock_trading.clients.alpha_vantage_client.Stock.query").all.return_value = [stock]
+    mock_update = mocker.patch("stock_trading.clients.alpha_vantage_client.Stock.update_stock")
+    mock_provider.get_quote.side_effect = ProviderError("down")
+    mock_quote_cache["get"].return_value = (149.0, time.time() - 3600)
+
+    summary = update_all_stock_prices()
+
+    mock_update.assert_not_called()
+    assert summary["success"] == []
+    assert summary["errors"][0]["symbol"] == "AAPL"
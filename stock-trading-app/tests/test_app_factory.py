@@ -0,0 +1,45 @@
+from config import TestConfig
+from stock_trading import create_app
+from stock_trading.clients import mongo_client, redis_client
+
+
+##########################################################
+# App Factory
+##########################################################
+
+def test_create_app_registers_api_and_pages(app):
+    """Test that the single factory serves both the JSON API and the web pages."""
+    rules = {rule.rule for rule in app.url_map.iter_rules()}
+    assert {'/api/health', '/api/fetch-stock/<string:symbol>', '/login', '/portfolio', '/lookup'} <= rules
+
+def test_healthcheck(client):
+    """Test that the health check is served by the unified app."""
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'healthy'}
+
+def test_create_app_does_not_contact_services(mocker):
+    """Test that creating the app neither builds service clients nor runs DDL."""
+    mocker.patch.object(mongo_client, "_client", None)
+    mocker.patch.object(redis_client, "_client", None)
+    mock_mongo = mocker.patch("stock_trading.clients.mongo_client.MongoClient")
+    mock_redis = mocker.patch("stock_trading.clients.redis_client.redis.StrictRedis")
+    mock_create_all = mocker.patch("stock_trading.db.db.create_all")
+
+    app = create_app(TestConfig)
+
+    mock_mongo.assert_not_called()
+    mock_redis.assert_not_called()
+    mock_create_all.assert_not_called()
+    assert app.config['STARTUP_TIME_MS'] >= 0
+
+def test_mongo_client_is_created_lazily_once(mocker):
+    """Test that the MongoDB client is built on first use and then reused."""
+    mocker.patch.object(mongo_client, "_client", None)
+    mock_mongo = mocker.patch("stock_trading.clients.mongo_client.MongoClient")
+
+    first = mongo_client.get_client()
+    second = mongo_client.get_client()
+
+    assert first is second
+    mock_mongo.assert_called_once()
@@ -0,0 +1,68 @@
+import pytest
+
+from stock_trading.utils.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(mocker):
+    """Fixture to control the breaker's notion of time."""
+    now = [1000.0]
+    mocker.patch("stock_trading.utils.circuit_breaker.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+
+def test_breaker_opens_after_threshold(breaker):
+    """Test that consecutive failures open the breaker."""
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+def test_success_resets_failure_count(breaker):
+    """Test that a success in between failures keeps the breaker closed."""
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_allows_single_trial(breaker, clock):
+    """Test that only one trial call is let through after the reset timeout."""
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_half_open_trial_success_closes(breaker, clock):
+    """Test that a successful trial closes the breaker."""
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+    breaker.allow_request()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_trial_failure_reopens(breaker, clock):
+    """Test that a failed trial re-opens the breaker for another timeout."""
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
@@ -0,0 +1,95 @@
+import gzip
+
+import pytest
+
+from config import TestConfig
+from stock_trading import create_app
+
+
+BODY = "x" * 4096
+
+
+@pytest.fixture
+def compress_app():
+    """Fixture providing an app with routes of different sizes and kinds."""
+    app = create_app(type("CompressionConfig", (TestConfig,), {"COMPRESSION_MIN_SIZE": 1024}))
+
+    @app.route("/large")
+    def large():
+        return {"data": BODY}
+
+    @app.route("/small")
+    def small():
+        return {"data": "x"}
+
+    @app.route("/stream")
+    def stream():
+        return app.response_class((chunk for chunk in [BODY]), mimetype="text/event-stream")
+
+    @app.route("/tagged")
+    def tagged():
+        response = app.make_response({"data": BODY})
+        response.set_etag("v1")
+        return response
+
+    return app
+
+
+##########################################################
+# Response Compression
+##########################################################
+
+def test_gzip_large_response(compress_app):
+    """Test that large JSON responses are gzipped when the client accepts it."""
+    response = compress_app.test_client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(BODY)
+    assert compress_app.json.loads(gzip.decompress(response.get_data())) == {"data": BODY}
+
+def test_brotli_preferred(compress_app):
+    """Test that brotli is chosen over gzip when both are accepted."""
+    brotli = pytest.importorskip("brotli")
+
+    response = compress_app.test_client().get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.get_data()).startswith(b'{"data"')
+
+def test_uncompressed_without_accept_encoding(compress_app):
+    """Test that clients that do not accept compression get the plain body."""
+    response = compress_app.test_client().get("/large")
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+def test_small_response_not_compressed(compress_app):
+    """Test that responses below the size threshold are sent as they are."""
+    response = compress_app.test_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+
+def test_stream_not_compressed(compress_app):
+    """Test that streamed responses such as SSE are not buffered for compression."""
+    response = compress_app.test_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == BODY
+
+def test_strong_etag_weakened(compress_app):
+    """Test that a strong ETag becomes weak when the body is compressed."""
+    response = compress_app.test_client().get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["ETag"] == 'W/"v1"'
+
+def test_compression_disabled():
+    """Test that no compression hook runs when COMPRESSION_ENABLED is false."""
+    app = create_app(type("NoCompressionConfig", (TestConfig,), {"COMPRESSION_ENABLED": False}))
+
+    @app.route("/large")
+    def large():
+        return {"data": BODY}
+
+    response = app.test_client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine, text
+
+import config
+from stock_trading.db import SQLITE_BUSY_TIMEOUT_MS
+
+
+##########################################################
+# Engine Options
+##########################################################
+
+def test_engine_options_for_server_database(monkeypatch):
+    """Test that pool settings are read from the environment for server databases."""
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+
+    options = config._engine_options("postgresql+psycopg2://u:p@db/app")
+
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is True
+
+def test_engine_options_for_in_memory_sqlite():
+    """Test that no pool options are passed for an in-memory SQLite database."""
+    assert config._engine_options("sqlite:///:memory:") == {}
+
+##########################################################
+# SQLite Tuning
+##########################################################
+
+def test_sqlite_connections_are_tuned(tmp_path):
+    """Test that new SQLite connections use WAL, NORMAL sync and a busy timeout."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT_MS
+    engine.dispose()
+
+
+##########################################################
+# Schema Upgrades
+##########################################################
+
+def test_widen_password_column_skips_sqlite(app):
+    """Test that bootstrap leaves SQLite schemas alone, since SQLite ignores VARCHAR lengths."""
+    from stock_trading.cli import widen_password_column
+
+    assert widen_password_column() is False
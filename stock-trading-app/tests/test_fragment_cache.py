@@ -0,0 +1,99 @@
+import pytest
+import redis
+from flask import render_template
+
+from config import TestConfig
+from stock_trading import create_app
+from stock_trading.utils.fragment_cache import RedisFragmentStore, pluck, precompile_templates
+
+
+TEMPLATE = "{% cache 'rows', rows|pluck('symbol') %}{% for row in rows %}{{ row.symbol }}:{{ count() }};{% endfor %}{% endcache %}"
+
+
+@pytest.fixture
+def render(app):
+    """Fixture rendering TEMPLATE and counting how often its block runs."""
+    template = app.jinja_env.from_string(TEMPLATE)
+    calls = []
+
+    def render_rows(rows):
+        return template.render(rows=rows, count=lambda: calls.append(1) or len(calls))
+
+    render_rows.calls = calls
+    return render_rows
+
+
+##########################################################
+# Fragment Cache
+##########################################################
+
+def test_fragment_cached_by_values(render):
+    """Test that a block is rendered once for the same values."""
+    rows = [{"symbol": "AAPL", "age": 1}]
+
+    first = render(rows)
+    rows[0]["age"] = 2
+
+    assert render(rows) == first == "AAPL:1;"
+    assert len(render.calls) == 1
+
+def test_fragment_rerendered_for_new_values(render):
+    """Test that different values miss the cache."""
+    render([{"symbol": "AAPL"}])
+
+    assert render([{"symbol": "MSFT"}]) == "MSFT:2;"
+
+def test_fragment_cache_disabled():
+    """Test that blocks are always rendered with FRAGMENT_CACHE_BACKEND=none."""
+    app = create_app(type("NoFragmentConfig", (TestConfig,), {"FRAGMENT_CACHE_BACKEND": "none"}))
+    template = app.jinja_env.from_string("{% cache 'n', 1 %}{{ values.pop() }}{% endcache %}")
+    values = [1, 2]
+
+    assert template.render(values=values) == "2"
+    assert template.render(values=values) == "1"
+
+def test_fragment_escaping(render):
+    """Test that cached fragments are not escaped a second time."""
+    render([{"symbol": "<b>"}])
+
+    assert render([{"symbol": "<b>"}]) == "&lt;b&gt;:1;"
+
+def test_redis_store_failure(mocker):
+    """Test that Redis errors are treated as misses."""
+    mock_redis = mocker.patch("stock_trading.utils.fragment_cache.redis_client")
+    mock_redis.get.side_effect = redis.exceptions.ConnectionError("down")
+    mock_redis.setex.side_effect = redis.exceptions.ConnectionError("down")
+    store = RedisFragmentStore(ttl=60)
+
+    assert store.get("fragment:x") is None
+    store.set("fragment:x", "<p></p>")
+
+def test_pluck():
+    """Test that pluck keeps only the named fields of each row."""
+    assert pluck([{"symbol": "AAPL", "shares": 2, "age": 5}], "symbol", "shares") == [("AAPL", 2)]
+
+
+##########################################################
+# Templates
+##########################################################
+
+def test_precompile_templates(app):
+    """Test that every template compiles at startup."""
+    assert precompile_templates(app) >= 9
+
+def test_portfolio_holdings_cached(app):
+    """Test that the portfolio holdings table comes from the cache on the second render."""
+    holding = {"symbol": "AAPL", "shares": 2, "current_price": 100.0, "total_value": 200.0,
+               "avg_purchase_price": 90.0, "gain_loss": 20.0, "stale": False, "price_age_seconds": 1.0}
+    portfolio = {"holdings": [holding], "cash_balance": 50.0, "total_stock_value": 200.0,
+                 "total_portfolio_value": 250.0, "stale": False, "oldest_price_age_seconds": 0.0}
+
+    with app.test_request_context():
+        first = render_template("portfolio.html", portfolio=portfolio, error=None)
+        store = app.jinja_env.fragment_cache
+        cached = [store.get(key) for key in list(store._cache._entries)]
+        holding["price_age_seconds"] = 2.0
+        second = render_template("portfolio.html", portfolio=portfolio, error=None)
+
+    assert first == second
+    assert len(cached) == 1 and 'data-symbol="AAPL"' in cached[0]
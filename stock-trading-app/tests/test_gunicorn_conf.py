@@ -0,0 +1,102 @@
+import os
+import runpy
+
+import pytest
+
+
+CONF_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+@pytest.fixture
+def load_conf(monkeypatch):
+    """Fixture that loads gunicorn.conf.py under a given environment."""
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(CONF_PATH)
+    return load
+
+
+##########################################################
+# Settings
+##########################################################
+
+def test_defaults(load_conf, mocker):
+    """Test that workers follow the core count with threaded workers by default."""
+    mocker.patch("multiprocessing.cpu_count", return_value=4)
+
+    conf = load_conf()
+
+    assert conf["workers"] == 4
+    assert conf["worker_class"] == "gthread"
+    assert conf["threads"] == 8
+    assert conf["preload_app"] is True
+
+def test_empty_values_use_defaults(load_conf, mocker):
+    """Test that empty values, as shipped in .envtemplate, fall back to the defaults."""
+    mocker.patch("multiprocessing.cpu_count", return_value=4)
+
+    conf = load_conf(WEB_CONCURRENCY="", GUNICORN_THREADS="", GUNICORN_TIMEOUT="", GUNICORN_WORKER_CLASS="")
+
+    assert conf["workers"] == 4
+    assert conf["threads"] == 8
+    assert conf["timeout"] == 30
+    assert conf["worker_class"] == "gthread"
+
+def test_environment_overrides(load_conf):
+    """Test that worker and keep-alive settings come from the environment."""
+    conf = load_conf(WEB_CONCURRENCY="3", GUNICORN_THREADS="16", GUNICORN_KEEPALIVE="10",
+                     GUNICORN_PRELOAD="false")
+
+    assert conf["workers"] == 3
+    assert conf["threads"] == 16
+    assert conf["keepalive"] == 10
+    assert conf["preload_app"] is False
+
+
+##########################################################
+# Fork Hooks
+##########################################################
+
+def test_post_fork_drops_inherited_clients(load_conf, app, mocker):
+    """Test that a new worker forgets the master's clients without closing them."""
+    reset_client = mocker.patch("stock_trading.clients.mongo_client.reset_client")
+    reset_redis_client = mocker.patch("stock_trading.clients.redis_client.reset_redis_client")
+    metrics_reset = mocker.patch("stock_trading.utils.metrics.metrics.reset")
+    from stock_trading.db import db
+    with app.app_context():
+        dispose = mocker.patch.object(db.engine, "dispose")
+
+    conf = load_conf()
+    conf["post_fork"](mocker.Mock(app=mocker.Mock(callable=app)), mocker.Mock(pid=123))
+
+    reset_client.assert_called_once_with(close=False)
+    reset_redis_client.assert_called_once_with(close=False)
+    metrics_reset.assert_called_once()
+    dispose.assert_called_once_with(close=False)
+
+def test_gevent_mode_patches_before_preload(load_conf, mocker):
+    """Test that choosing gevent workers monkey-patches when the config is loaded."""
+    monkey = mocker.Mock()
+    mocker.patch.dict("sys.modules", {"gevent": mocker.Mock(monkey=monkey), "gevent.monkey": monkey})
+
+    conf = load_conf(GUNICORN_WORKER_CLASS="gevent", GUNICORN_WORKER_CONNECTIONS="500")
+
+    monkey.patch_all.assert_called_once()
+    assert conf["worker_connections"] == 500
+
+def test_threaded_mode_does_not_patch(load_conf, mocker):
+    """Test that the default threaded workers leave the standard library alone."""
+    monkey = mocker.Mock()
+    mocker.patch.dict("sys.modules", {"gevent": mocker.Mock(monkey=monkey), "gevent.monkey": monkey})
+
+    load_conf()
+
+    monkey.patch_all.assert_not_called()
+
+def test_gevent_mode_without_gevent_installed(load_conf, mocker):
+    """Test that gevent mode names the optional requirements file when gevent is missing."""
+    mocker.patch.dict("sys.modules", {"gevent": None})
+
+    with pytest.raises(RuntimeError, match="requirements-gevent.txt"):
+        load_conf(GUNICORN_WORKER_CLASS="gevent")
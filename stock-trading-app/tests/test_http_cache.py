@@ -0,0 +1,138 @@
+import pytest
+import redis
+
+from stock_trading.db import db
+from stock_trading.models.stock_model import Stock
+from stock_trading.utils import http_cache
+
+
+@pytest.fixture
+def mock_versions(mocker):
+    """Fixture that stubs the data versions read by the conditional views."""
+    return mocker.patch("stock_trading.utils.http_cache.get_versions", return_value=[3])
+
+@pytest.fixture
+def mock_bump(mocker):
+    """Fixture that captures version bumps."""
+    return mocker.patch("stock_trading.utils.http_cache.bump_versions")
+
+
+##########################################################
+# Data Versions
+##########################################################
+
+def test_get_versions(mocker):
+    """Test that the versions of all scopes are read in one call."""
+    mock_redis = mocker.patch("stock_trading.utils.http_cache.redis_client")
+    mock_redis.mget.return_value = [b"5", b"7"]
+
+    assert http_cache.get_versions(["stocks", "stock:AAPL"]) == [5, 7]
+    mock_redis.mget.assert_called_once_with(["version:stocks", "version:stock:AAPL"])
+
+def test_get_versions_starts_missing_counters(mocker, mock_bump):
+    """Test that missing counters are created before the versions are returned."""
+    mock_redis = mocker.patch("stock_trading.utils.http_cache.redis_client")
+    mock_redis.mget.side_effect = [[None], [b"1760000000001"]]
+
+    assert http_cache.get_versions(["stock:AAPL"]) == [1760000000001]
+    mock_bump.assert_called_once_with(["stock:AAPL"])
+
+def test_get_versions_redis_down(mocker):
+    """Test that no versions are returned when Redis is unavailable."""
+    mock_redis = mocker.patch("stock_trading.utils.http_cache.redis_client")
+    mock_redis.mget.side_effect = redis.exceptions.ConnectionError("down")
+
+    assert http_cache.get_versions(["stocks"]) is None
+
+def test_commit_bumps_versions(session, mock_bump):
+    """Test that committing a stock bumps its versions."""
+    session.add(Stock(symbol="AAPL", name="Apple", quantity=1, buy_price=100.0, current_price=100.0))
+    session.commit()
+
+    mock_bump.assert_called_once_with({"stocks", "stock:AAPL"})
+
+def test_rollback_discards_versions(session, mock_bump):
+    """Test that rolled-back changes do not bump versions."""
+    session.add(Stock(symbol="AAPL", name="Apple", quantity=1, buy_price=100.0, current_price=100.0))
+    session.flush()
+    session.rollback()
+    session.commit()
+
+    mock_bump.assert_not_called()
+
+
+##########################################################
+# Conditional GET
+##########################################################
+
+def test_versioned_response_has_validators(client, mock_versions):
+    """Test that a versioned endpoint sends a weak ETag and Cache-Control."""
+    response = client.get("/api/portfolio")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" not in response.headers
+    assert response.headers["Cache-Control"] == http_cache.REVALIDATE
+    mock_versions.assert_called_with(["stocks"])
+
+def test_if_none_match_returns_304_without_running_view(client, mock_versions, mocker):
+    """Test that a matching If-None-Match is answered before the view runs."""
+    etag = client.get("/api/portfolio").headers["ETag"]
+    spy = mocker.spy(Stock, "get_portfolio_value")
+
+    response = client.get("/api/portfolio", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.get_data() == b""
+    spy.assert_not_called()
+
+def test_version_change_invalidates_etag(client, mock_versions):
+    """Test that a new data version gives a full response with a new ETag."""
+    etag = client.get("/api/portfolio-leaderboard").headers["ETag"]
+    mock_versions.return_value = [4]
+
+    response = client.get("/api/portfolio-leaderboard", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_if_modified_since_alone_is_not_answered_with_304(client, mock_versions):
+    """Test that If-Modified-Since cannot validate versioned data, which may change twice in a second."""
+    response = client.get("/api/portfolio", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+
+    assert response.status_code == 200
+
+def test_query_string_is_part_of_etag(client, mock_versions):
+    """Test that different query strings of one endpoint get different ETags."""
+    by_value = client.get("/api/portfolio-leaderboard?sort_by=value").headers["ETag"]
+    by_quantity = client.get("/api/portfolio-leaderboard?sort_by=quantity").headers["ETag"]
+
+    assert by_value != by_quantity
+
+def test_stock_scope_and_errors(client, mock_versions):
+    """Test that a stock is versioned by symbol and errors carry no validators."""
+    response = client.get("/api/get-stock/MISSING")
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+    mock_versions.assert_called_with(["stock:MISSING"])
+
+def test_no_validators_without_redis(client, mocker):
+    """Test that responses are served without validators when Redis is unavailable."""
+    mocker.patch("stock_trading.utils.http_cache.get_versions", return_value=None)
+
+    response = client.get("/api/portfolio")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+def test_historical_content_etag(client, mocker):
+    """Test that historical data is validated by a hash of its content."""
+    mocker.patch("stock_trading.routes.api.get_historical_data", return_value={"2024-01-02": {"close": 1.0}})
+
+    response = client.get("/api/historical-stock/AAPL")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == http_cache.HISTORICAL_CACHE_CONTROL
+
+    assert client.get("/api/historical-stock/AAPL", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from config import TestConfig
+from stock_trading import create_app
+from stock_trading.utils.json_provider import OrjsonProvider
+
+pytest.importorskip("orjson")
+
+
+@dataclass
+class Quote:
+    symbol: str
+    price: Decimal
+    created_at: datetime
+
+
+##########################################################
+# orjson Provider
+##########################################################
+
+def test_orjson_provider_installed(app):
+    """Test that the app serializes JSON with orjson by default."""
+    assert isinstance(app.json, OrjsonProvider)
+
+def test_default_provider_selectable():
+    """Test that JSON_PROVIDER=default keeps Flask's provider."""
+    app = create_app(type("DefaultJsonConfig", (TestConfig,), {"JSON_PROVIDER": "default"}))
+
+    assert type(app.json) is DefaultJSONProvider
+
+def test_datetime_and_decimal(app):
+    """Test that datetimes are ISO 8601 in UTC and decimals keep their exact value."""
+    quote = Quote("AAPL", Decimal("189.9500"), datetime(2024, 1, 2, 15, 30))
+
+    assert app.json.loads(app.json.dumps(quote)) == {
+        "symbol": "AAPL", "price": "189.9500", "created_at": "2024-01-02T15:30:00+00:00"}
+    assert app.json.dumps({"at": datetime(2024, 1, 2, tzinfo=timezone.utc)}) == '{"at":"2024-01-02T00:00:00+00:00"}'
+
+def test_unserializable_type(app):
+    """Test that unknown types raise TypeError, as with the default provider."""
+    with pytest.raises(TypeError):
+        app.json.dumps({"value": object()})
+
+def test_jsonify_response(app):
+    """Test that jsonify() returns compact JSON bytes from the provider."""
+    with app.test_request_context():
+        response = app.json.response({"status": "success", 1: [1.5]})
+
+    assert response.mimetype == "application/json"
+    assert response.get_data() == b'{"status":"success","1":[1.5]}\n'
+
+def test_request_json_parsed(app):
+    """Test that request bodies are parsed with the provider."""
+    with app.test_request_context(json={"users": [{"username": "alice"}]}):
+        from flask import request
+        assert request.get_json() == {"users": [{"username": "alice"}]}
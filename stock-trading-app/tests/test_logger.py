@@ -0,0 +1,134 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from stock_trading.utils import logger as logger_module
+from stock_trading.utils.logger import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    configure_logger,
+    get_queue_handler,
+    level_for,
+    truncated,
+)
+
+
+##########################################################
+# Logger Setup
+##########################################################
+
+def test_configure_logger_is_idempotent():
+    """Test that configuring a logger repeatedly attaches one shared handler."""
+    test_logger = logging.getLogger("stock_trading.tests.idempotent")
+
+    configure_logger(test_logger)
+    configure_logger(test_logger)
+    configure_logger(test_logger)
+
+    assert test_logger.handlers == [get_queue_handler()]
+    assert test_logger.propagate is False
+
+def test_level_for_uses_longest_prefix(mocker):
+    """Test that the most specific LOG_LEVELS entry wins over LOG_LEVEL."""
+    mocker.patch.object(logger_module, "LOG_LEVEL", "INFO")
+    mocker.patch.object(logger_module, "_LEVEL_OVERRIDES", logger_module._parse_levels(
+        "stock_trading.clients=DEBUG, stock_trading.clients.redis_client=ERROR"))
+
+    assert level_for("stock_trading.clients.alpha_vantage_client") == logging.DEBUG
+    assert level_for("stock_trading.clients.redis_client") == logging.ERROR
+    assert level_for("stock_trading.clientsx") == logging.INFO
+    assert level_for("stock_trading.routes.api") == logging.INFO
+
+def test_unknown_levels_fall_back_to_info(mocker):
+    """Test that misspelled LOG_LEVEL and LOG_LEVELS values warn and use INFO instead of failing."""
+    mocker.patch.object(logger_module, "LOG_LEVEL", "verbose")
+    with pytest.warns(UserWarning, match="LOG_LEVELS"):
+        mocker.patch.object(logger_module, "_LEVEL_OVERRIDES", logger_module._parse_levels(
+            "stock_trading.clients=chatty,stock_trading.routes=debug"))
+
+    with pytest.warns(UserWarning, match="LOG_LEVEL"):
+        assert level_for("stock_trading.models") == logging.INFO
+    assert level_for("stock_trading.clients.redis_client") == logging.INFO
+    assert level_for("stock_trading.routes.api") == logging.DEBUG
+
+
+##########################################################
+# Queue Handler
+##########################################################
+
+def make_record(msg, *args, exc_info=None):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+def test_prepare_defers_message_formatting():
+    """Test that enqueued records keep their arguments unformatted."""
+    payload = truncated({"a": 1})
+    handler = DeferredQueueHandler(queue.Queue())
+
+    handler.handle(make_record("Payload: %s", payload))
+
+    record = handler.queue.get_nowait()
+    assert record.msg == "Payload: %s"
+    assert record.args == (payload,)
+    assert record.getMessage() == "Payload: {'a': 1}"
+
+def test_prepare_renders_traceback_up_front():
+    """Test that exception details are captured before the record is queued."""
+    handler = DeferredQueueHandler(queue.Queue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        handler.handle(make_record("Failed", exc_info=sys.exc_info()))
+
+    record = handler.queue.get_nowait()
+    assert record.exc_info is None
+    assert "ValueError: boom" in record.exc_text
+
+def test_enqueue_drops_when_full():
+    """Test that a full queue drops records instead of blocking."""
+    handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+##########################################################
+# Formatting
+##########################################################
+
+def test_json_formatter():
+    """Test that JSON output holds the level, logger name and message."""
+    entry = json.loads(JsonFormatter().format(make_record("Bought %d shares of %s", 10, "AAPL")))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "test"
+    assert entry["message"] == "Bought 10 shares of AAPL"
+    assert "exception" not in entry
+
+def test_truncated_cuts_long_values():
+    """Test that long payloads are cut to the limit."""
+    text = str(truncated("x" * 50, limit=10))
+
+    assert text == "xxxxxxxxxx... (40 more chars)"
+
+def test_truncated_is_lazy_at_disabled_levels():
+    """Test that a payload is never rendered when its level is disabled."""
+    class Payload:
+        rendered = 0
+
+        def __str__(self):
+            Payload.rendered += 1
+            return "payload"
+
+    test_logger = logging.getLogger("stock_trading.tests.lazy")
+    configure_logger(test_logger)
+    test_logger.setLevel(logging.INFO)
+
+    test_logger.debug("Response: %s", truncated(Payload()))
+
+    assert Payload.rendered == 0
@@ -0,0 +1,79 @@
+import pytest
+import redis
+
+from stock_trading.clients import login_throttle
+from stock_trading.clients.login_throttle import login_retry_after, record_login_failure, reset_login_failures
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    """Fixture to replace the Redis client used by the throttle."""
+    client = mocker.patch("stock_trading.clients.login_throttle.redis_client")
+    return client
+
+
+##########################################################
+# Throttle Checks
+##########################################################
+
+def test_login_allowed_below_limits(mock_redis):
+    """Test that attempts below both limits are allowed."""
+    mock_redis.pipeline.return_value.execute.return_value = [b"2", 100, b"2", 100, None, -2]
+    assert login_retry_after("alice", "10.0.0.1") is None
+
+def test_login_rejected_when_user_limit_reached(mock_redis):
+    """Test that an account over its failure limit is throttled until its window ends."""
+    mock_redis.pipeline.return_value.execute.return_value = [
+        str(login_throttle.LOGIN_MAX_FAILURES_PER_USER).encode(), 120, b"5", 120, b"1", 200
+    ]
+    assert login_retry_after("alice", "10.0.0.1") == 120
+
+def test_login_rejected_when_ip_limit_reached(mock_redis):
+    """Test that an address over its failure limit is throttled for any account."""
+    mock_redis.pipeline.return_value.execute.return_value = [
+        None, -2, None, -2, str(login_throttle.LOGIN_MAX_FAILURES_PER_IP).encode(), 45
+    ]
+    assert login_retry_after("bob", "10.0.0.1") == 45
+
+def test_login_rejected_when_account_limit_reached_from_many_addresses(mock_redis):
+    """Test that an account failing from many addresses is throttled even from a fresh address."""
+    mock_redis.pipeline.return_value.execute.return_value = [
+        None, -2, str(login_throttle.LOGIN_MAX_FAILURES_PER_ACCOUNT).encode(), 90, None, -2
+    ]
+
+    assert login_retry_after("alice", "10.0.0.99") == 90
+    mock_redis.pipeline.return_value.get.assert_any_call("login:fail:account:alice")
+
+def test_login_throttle_fails_open(mock_redis):
+    """Test that a Redis outage does not block logins."""
+    mock_redis.pipeline.return_value.execute.side_effect = redis.exceptions.ConnectionError("down")
+    assert login_retry_after("alice", "10.0.0.1") is None
+
+##########################################################
+# Failure Bookkeeping
+##########################################################
+
+def test_record_login_failure_counts_user_and_ip(mock_redis):
+    """Test that a failure increments every counter and starts their windows."""
+    pipe = mock_redis.pipeline.return_value
+
+    record_login_failure("Alice", "10.0.0.1")
+
+    pipe.incr.assert_any_call("login:fail:user:alice:10.0.0.1")
+    pipe.incr.assert_any_call("login:fail:account:alice")
+    pipe.incr.assert_any_call("login:fail:ip:10.0.0.1")
+    pipe.set.assert_any_call("login:fail:user:alice:10.0.0.1", 0, ex=login_throttle.LOGIN_THROTTLE_WINDOW, nx=True)
+    pipe.execute.assert_called_once()
+
+def test_reset_login_failures_clears_user_only(mock_redis):
+    """Test that a successful login clears the account counter only."""
+    reset_login_failures("alice", "10.0.0.1")
+    mock_redis.delete.assert_called_once_with("login:fail:user:alice:10.0.0.1")
+
+def test_user_limit_is_per_address(mock_redis):
+    """Test that account failures are counted per client address, so others are not locked out."""
+    mock_redis.pipeline.return_value.execute.return_value = [None, -2, None, -2, None, -2]
+
+    assert login_retry_after("alice", "10.0.0.2") is None
+
+    mock_redis.pipeline.return_value.get.assert_any_call("login:fail:user:alice:10.0.0.2")
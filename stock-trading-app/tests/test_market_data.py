@@ -0,0 +1,220 @@
+import datetime
+import time
+
+import pytest
+
+from stock_trading.clients import market_data
+from stock_trading.clients.market_data import (
+    FailoverProvider,
+    MarketDataProvider,
+    ProviderError,
+    SimulatedProvider,
+    create_provider
+)
+
+
+class FakeProvider(MarketDataProvider):
+    """Provider returning a fixed price after a delay, or raising an error."""
+
+    def __init__(self, name, price=100.0, delay=0.0, error=None):
+        self.name = name
+        self.price = price
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def get_quote(self, symbol):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.price
+
+    def get_overview(self, symbol):
+        return None
+
+    def get_daily_series(self, symbol, output_size="compact"):
+        return {}
+
+
+##########################################################
+# Simulated Provider
+##########################################################
+
+def test_simulated_quotes_are_reproducible():
+    """Test that the same seed produces the same price sequence."""
+    first = SimulatedProvider(seed=42)
+    second = SimulatedProvider(seed=42)
+
+    assert [first.get_quote("AAPL") for _ in range(5)] == [second.get_quote("AAPL") for _ in range(5)]
+
+def test_simulated_quotes_independent_of_other_symbols():
+    """Test that querying other symbols does not change a symbol's walk."""
+    alone = SimulatedProvider(seed=1)
+    mixed = SimulatedProvider(seed=1)
+
+    expected = [alone.get_quote("AAPL") for _ in range(3)]
+    actual = []
+    for _ in range(3):
+        mixed.get_quote("TSLA")
+        actual.append(mixed.get_quote("AAPL"))
+
+    assert actual == expected
+
+def test_simulated_seeds_differ():
+    """Test that different seeds give different prices."""
+    assert SimulatedProvider(seed=1).get_quote("AAPL") != SimulatedProvider(seed=2).get_quote("AAPL")
+
+def test_simulated_error_injection():
+    """Test that an error rate of one fails every call."""
+    provider = SimulatedProvider(error_rate=1.0)
+
+    with pytest.raises(ProviderError, match="Simulated upstream failure"):
+        provider.get_quote("AAPL")
+
+def test_simulated_latency_injection(mocker):
+    """Test that configured latency is applied before answering."""
+    mock_sleep = mocker.patch("stock_trading.clients.market_data.time.sleep")
+    provider = SimulatedProvider(latency_ms=50)
+
+    provider.get_quote("AAPL")
+
+    mock_sleep.assert_called_once_with(0.05)
+
+def test_simulated_daily_series_format():
+    """Test that daily bars match the Alpha Vantage layout, newest first."""
+    series = SimulatedProvider(seed=7).get_daily_series("AAPL")
+
+    dates = list(series)
+    assert len(dates) == 100
+    assert dates == sorted(dates, reverse=True)
+    bar = series[dates[0]]
+    assert float(bar["3. low"]) <= float(bar["4. close"]) <= float(bar["2. high"])
+    assert series == SimulatedProvider(seed=7).get_daily_series("AAPL")
+
+def test_simulated_daily_series_anchor_date():
+    """Test that a pinned anchor date makes the series independent of today's date."""
+    series = SimulatedProvider(seed=7, anchor_date=datetime.date(2024, 1, 5)).get_daily_series("AAPL")
+
+    assert next(iter(series)) == "2024-01-05"
+    assert series == SimulatedProvider(seed=7, anchor_date=datetime.date(2024, 1, 5)).get_daily_series("AAPL")
+
+def test_provider_interface_is_abstract():
+    """Test that a provider missing part of the interface cannot be created."""
+    class QuoteOnly(MarketDataProvider):
+        def get_quote(self, symbol):
+            return 1.0
+
+    with pytest.raises(TypeError):
+        QuoteOnly()
+
+def test_simulated_overview():
+    """Test that the simulator returns a complete overview."""
+    overview = SimulatedProvider().get_overview("AAPL")
+
+    assert overview["symbol"] == "AAPL"
+    assert set(overview) == {"symbol", "name", "description", "exchange", "sector", "industry"}
+
+##########################################################
+# Provider Selection
+##########################################################
+
+def test_create_unknown_provider():
+    """Test that an unknown provider name is rejected."""
+    with pytest.raises(ValueError, match="Unknown market data provider: nope"):
+        create_provider("nope")
+
+def test_create_provider_strips_single_name():
+    """Test that a single name is matched like an entry of a provider list."""
+    assert isinstance(create_provider(" simulated "), SimulatedProvider)
+
+def test_get_stock_price_uses_configured_provider(mocker):
+    """Test that the client façade routes quotes through the active provider."""
+    from stock_trading.clients.alpha_vantage_client import get_stock_price
+
+    mocker.patch.object(market_data, "_provider", SimulatedProvider(seed=3))
+
+    assert get_stock_price("AAPL") == SimulatedProvider(seed=3).get_quote("AAPL")
+
+def test_comma_separated_providers_build_failover():
+    """Test that a provider list enables failover."""
+    provider = create_provider("simulated,simulated")
+
+    assert isinstance(provider, FailoverProvider)
+    assert len(provider.health) == 2
+
+##########################################################
+# Failover Provider
+##########################################################
+
+def test_failover_uses_primary_when_healthy():
+    """Test that the first provider answers when it is healthy."""
+    primary, secondary = FakeProvider("a", 1.0), FakeProvider("b", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=False)
+
+    assert provider.get_quote("AAPL") == 1.0
+    assert secondary.calls == 0
+
+def test_failover_on_provider_error():
+    """Test that a failing provider is routed around."""
+    primary = FakeProvider("a", error=ProviderError("down"))
+    secondary = FakeProvider("b", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=False)
+
+    assert provider.get_quote("AAPL") == 2.0
+
+def test_failover_does_not_retry_missing_data():
+    """Test that a ValueError (no data) is returned without trying other providers."""
+    primary = FakeProvider("a", error=ValueError("No quote data available"))
+    secondary = FakeProvider("b", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=False)
+
+    with pytest.raises(ValueError, match="No quote data available"):
+        provider.get_quote("AAPL")
+    assert secondary.calls == 0
+
+def test_failover_all_providers_fail():
+    """Test that an error listing every provider is raised when all fail."""
+    provider = FailoverProvider([FakeProvider("a", error=ProviderError("down")),
+                                 FakeProvider("b", error=ProviderError("throttled"))], hedge=False)
+
+    with pytest.raises(ProviderError, match="a: down; b: throttled"):
+        provider.get_quote("AAPL")
+
+def test_failover_skips_open_circuit():
+    """Test that a provider with an open breaker is not called."""
+    primary = FakeProvider("a", error=ProviderError("down"))
+    secondary = FakeProvider("b", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=False)
+    for _ in range(market_data.MARKET_DATA_BREAKER_THRESHOLD):
+        provider.get_quote("AAPL")
+    calls = primary.calls
+
+    provider.get_quote("AAPL")
+
+    assert primary.calls == calls
+    assert provider.status()[0]["state"] == "open"
+
+def test_hedged_request_bounds_latency():
+    """Test that a slow primary is hedged to the next provider."""
+    primary = FakeProvider("slow", 1.0, delay=1.0)
+    secondary = FakeProvider("fast", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=True, hedge_min_delay=0.05)
+
+    start = time.perf_counter()
+    assert provider.get_quote("AAPL") == 2.0
+    assert time.perf_counter() - start < 0.5
+
+def test_saturated_provider_is_skipped():
+    """Test that a provider whose threads are all stuck is skipped instead of queued behind."""
+    primary = FakeProvider("hung", 1.0, delay=1.0)
+    secondary = FakeProvider("fast", 2.0)
+    provider = FailoverProvider([primary, secondary], hedge=True, hedge_min_delay=0.2, max_in_flight=1)
+    assert provider.get_quote("AAPL") == 2.0
+
+    start = time.perf_counter()
+    assert provider.get_quote("AAPL") == 2.0
+
+    assert time.perf_counter() - start < 0.1
+    assert primary.calls == 1
+    assert provider.status()[0]["in_flight"] == 1
@@ -0,0 +1,151 @@
+import pytest
+
+from stock_trading.clients.mongo_client import CommandMetrics
+from stock_trading.utils.metrics import Histogram, MetricsRegistry, metrics
+
+
+@pytest.fixture
+def registry():
+    """Fixture for an empty, enabled registry."""
+    return MetricsRegistry(enabled=True)
+
+@pytest.fixture
+def admin_token(mocker):
+    """Fixture that sets the admin token protecting /api/metrics."""
+    mocker.patch("stock_trading.routes.api.ADMIN_API_TOKEN", "admin")
+    return {"X-Admin-Token": "admin"}
+
+@pytest.fixture
+def clear_metrics():
+    """Fixture that clears the shared registry around a test."""
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+##########################################################
+# Histogram
+##########################################################
+
+def test_histogram_quantiles():
+    """Test that quantile estimates land in the right bucket."""
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.observe(0.002)
+    histogram.observe(0.9)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == pytest.approx(0.002)
+    assert histogram.quantile(0.99) == pytest.approx(0.002)
+    assert histogram.quantile(1.0) == pytest.approx(0.9)
+
+def test_histogram_quantile_empty():
+    """Test that an empty histogram reports zero."""
+    assert Histogram().quantile(0.99) == 0.0
+
+def test_histogram_quantile_above_last_bucket():
+    """Test that values above the last bound are reported as the maximum."""
+    histogram = Histogram(buckets=[0.1, 1.0])
+    histogram.observe(5.0)
+
+    assert histogram.quantile(0.5) == 5.0
+
+
+##########################################################
+# Registry
+##########################################################
+
+def test_render_prometheus_text(registry):
+    """Test the exposition format of histograms and counters."""
+    registry.describe("request_seconds", "histogram", "Request time.")
+    registry.observe("request_seconds", 0.003, route="/buy")
+    registry.inc("cache_requests_total", cache="quote", result="hit")
+    registry.inc("cache_requests_total", cache="quote", result="hit")
+
+    text = registry.render()
+
+    assert "# HELP request_seconds Request time.\n# TYPE request_seconds histogram" in text
+    assert 'request_seconds_bucket{route="/buy",le="0.0025"} 0' in text
+    assert 'request_seconds_bucket{route="/buy",le="0.003"} 1' in text
+    assert 'request_seconds_bucket{route="/buy",le="+Inf"} 1' in text
+    assert 'request_seconds_count{route="/buy"} 1' in text
+    assert "# TYPE cache_requests_total counter" in text
+    assert 'cache_requests_total{cache="quote",result="hit"} 2.0' in text
+
+def test_render_escapes_label_values(registry):
+    """Test that quotes and backslashes in label values are escaped."""
+    registry.inc("errors_total", reason='bad "quote" \\')
+
+    assert 'errors_total{reason="bad \\"quote\\" \\\\"} 1.0' in registry.render()
+
+def test_timer_records_failures(registry):
+    """Test that a timed block is recorded even when it raises."""
+    with pytest.raises(RuntimeError):
+        with registry.timer("op_seconds", op="fail"):
+            raise RuntimeError("boom")
+
+    assert registry.histogram("op_seconds", op="fail").count == 1
+
+def test_disabled_registry_records_nothing():
+    """Test that a disabled registry ignores observations."""
+    registry = MetricsRegistry(enabled=False)
+
+    registry.observe("op_seconds", 0.1)
+    registry.inc("calls_total")
+
+    assert registry.histogram("op_seconds") is None
+    assert registry.counter("calls_total") == 0.0
+
+
+##########################################################
+# Instrumentation
+##########################################################
+
+def test_request_metrics_and_endpoint(client, clear_metrics, admin_token):
+    """Test that requests are timed by route and exposed at /api/metrics."""
+    client.get("/api/health")
+
+    histogram = clear_metrics.histogram(
+        "http_request_duration_seconds", method="GET", route="/api/health", status="200")
+    assert histogram.count == 1
+
+    response = client.get("/api/metrics", headers=admin_token)
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"} 1' \
+        in response.get_data(as_text=True)
+
+def test_metrics_endpoint_disabled(client, mocker, admin_token):
+    """Test that /api/metrics is not served when metrics are disabled."""
+    mocker.patch.object(metrics, "enabled", False)
+
+    assert client.get("/api/metrics", headers=admin_token).status_code == 404
+
+def test_metrics_endpoint_requires_admin_token(client, admin_token):
+    """Test that /api/metrics needs the admin token, also accepted as a bearer token."""
+    assert client.get("/api/metrics").status_code == 403
+    assert client.get("/api/metrics", headers={"Authorization": "Bearer admin"}).status_code == 200
+
+def test_request_metrics_record_unhandled_errors(app, clear_metrics):
+    """Test that a request failing with an unhandled exception is recorded as a 500."""
+    def fail():
+        raise RuntimeError("boom")
+    app.add_url_rule("/fail", "fail", fail)
+
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/fail")
+
+    histogram = clear_metrics.histogram("http_request_duration_seconds", method="GET", route="/fail", status="500")
+    assert histogram.count == 1
+
+def test_mongo_command_listener(mocker, clear_metrics):
+    """Test that MongoDB command events are recorded with their outcome."""
+    listener = CommandMetrics()
+
+    listener.succeeded(mocker.Mock(command_name="find", duration_micros=1500))
+    listener.failed(mocker.Mock(command_name="update", duration_micros=2500))
+
+    assert clear_metrics.histogram(
+        "mongodb_command_duration_seconds", command="find", outcome="success").sum == pytest.approx(0.0015)
+    assert clear_metrics.histogram(
+        "mongodb_command_duration_seconds", command="update", outcome="failure").count == 1
@@ -0,0 +1,88 @@
+import pytest
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from stock_trading.clients import mongo_client
+
+
+@pytest.fixture
+def mock_client(mocker):
+    """Fixture to build the MongoDB client from a mocked constructor."""
+    mocker.patch.object(mongo_client, "_client", None)
+    mocker.patch.dict(mongo_client._collections, clear=True)
+    return mocker.patch("stock_trading.clients.mongo_client.MongoClient")
+
+
+##########################################################
+# Client Options
+##########################################################
+
+def test_client_options_skip_unavailable_compressors(mocker):
+    """Test that compressors whose library is missing are left out."""
+    mocker.patch.object(mongo_client, "MONGO_COMPRESSORS", "zstd,snappy,zlib")
+    mocker.patch(
+        "stock_trading.clients.mongo_client.importlib.util.find_spec",
+        side_effect=lambda name: object() if name in ("zstandard", "zlib") else None
+    )
+
+    assert mongo_client.client_options()["compressors"] == "zstd,zlib"
+
+def test_client_uses_pool_settings(mock_client, mocker):
+    """Test that the client is created with the configured pool and timeouts."""
+    mocker.patch.object(mongo_client, "MONGO_URI", None)
+    mocker.patch.object(mongo_client, "MONGO_MAX_POOL_SIZE", 250)
+
+    mongo_client.get_client()
+
+    kwargs = mock_client.call_args[1]
+    assert kwargs["maxPoolSize"] == 250
+    assert kwargs["serverSelectionTimeoutMS"] == mongo_client.MONGO_SERVER_SELECTION_TIMEOUT_MS
+
+def test_client_prefers_connection_string(mock_client, mocker):
+    """Test that MONGO_URI is used when set, e.g. for a replica set."""
+    uri = "mongodb://a,b,c/?replicaSet=rs0"
+    mocker.patch.object(mongo_client, "MONGO_URI", uri)
+
+    mongo_client.get_client()
+
+    assert mock_client.call_args[0] == (uri,)
+
+##########################################################
+# Per-Operation Options
+##########################################################
+
+def test_trade_collection_is_durable(mock_client):
+    """Test that trades read the primary and write with a journaled majority concern."""
+    base = mock_client.return_value.__getitem__.return_value.__getitem__.return_value
+
+    mongo_client.get_portfolio_trade_collection()
+
+    kwargs = base.with_options.call_args[1]
+    assert isinstance(kwargs["read_preference"], Primary)
+    assert kwargs["write_concern"].document == {"w": "majority", "j": True, "wtimeout": mongo_client.MONGO_TRADE_WTIMEOUT_MS}
+
+def test_view_collection_uses_configured_read_preference(mock_client, mocker):
+    """Test that portfolio views honour MONGO_PORTFOLIO_READ_PREFERENCE."""
+    mocker.patch.object(mongo_client, "MONGO_PORTFOLIO_READ_PREFERENCE", "secondaryPreferred")
+    base = mock_client.return_value.__getitem__.return_value.__getitem__.return_value
+
+    mongo_client.get_portfolio_view_collection()
+
+    assert isinstance(base.with_options.call_args[1]["read_preference"], SecondaryPreferred)
+
+def test_configured_collections_are_built_once_per_client(mock_client):
+    """Test that option-bearing collections are reused until the client is reset."""
+    base = mock_client.return_value.__getitem__.return_value.__getitem__.return_value
+
+    first = mongo_client.get_portfolio_trade_collection()
+    assert mongo_client.get_portfolio_trade_collection() is first
+    assert base.with_options.call_count == 1
+
+    mongo_client.reset_client()
+    mongo_client.get_portfolio_trade_collection()
+
+    assert base.with_options.call_count == 2
+
+def test_unknown_read_preference_is_rejected():
+    """Test that a misspelled read preference fails loudly."""
+    with pytest.raises(ValueError, match="Unknown MongoDB read preference"):
+        mongo_client._read_preference("primaryish")
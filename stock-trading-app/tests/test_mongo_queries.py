@@ -0,0 +1,91 @@
+import pytest
+
+from stock_trading.models import mongo_session_model
+from stock_trading.utils.mongo_queries import fields, with_element
+
+
+##########################################################
+# Projection Helpers
+##########################################################
+
+def test_fields_excludes_id_by_default():
+    """Test that a projection names exactly the requested fields."""
+    assert fields("cash_balance") == {"cash_balance": 1, "_id": 0}
+    assert fields("_id", "user_id") == {"_id": 1, "user_id": 1}
+
+def test_with_element_uses_elem_match():
+    """Test that a single array element is selected with $elemMatch."""
+    projection = with_element(fields("cash_balance"), "holdings", symbol="AAPL")
+    assert projection == {"cash_balance": 1, "_id": 0, "holdings": {"$elemMatch": {"symbol": "AAPL"}}}
+
+##########################################################
+# Portfolio Reads
+##########################################################
+
+@pytest.fixture
+def mock_collections(mocker):
+    """Fixture to replace the portfolio view and trade collections."""
+    return {
+        "view": mocker.patch("stock_trading.models.mongo_session_model.portfolio_view_collection"),
+        "trade": mocker.patch("stock_trading.models.mongo_session_model.portfolio_trade_collection"),
+    }
+
+def test_get_cash_balance_reads_only_cash(mock_collections):
+    """Test that the cash balance is read without the holdings array."""
+    mock_collections["view"].find_one.return_value = {"cash_balance": 500.0}
+
+    assert mongo_session_model.get_cash_balance(1) == 500.0
+    mock_collections["view"].find_one.assert_called_once_with({"user_id": 1}, {"cash_balance": 1, "_id": 0})
+
+def test_get_holding_projects_single_holding(mock_collections):
+    """Test that one holding is requested with $elemMatch."""
+    mock_collections["trade"].find_one.return_value = {
+        "cash_balance": 100.0, "holdings": [{"symbol": "AAPL", "shares": 3}]
+    }
+
+    result = mongo_session_model.get_holding(1, "AAPL")
+
+    assert result == {"cash_balance": 100.0, "holding": {"symbol": "AAPL", "shares": 3}}
+    projection = mock_collections["trade"].find_one.call_args[0][1]
+    assert projection["holdings"] == {"$elemMatch": {"symbol": "AAPL"}}
+
+##########################################################
+# Sell Stock
+##########################################################
+
+def test_sell_stock_rejects_oversell(mock_collections):
+    """Test that selling more shares than held fails without writing."""
+    mock_collections["trade"].find_one.return_value = {
+        "cash_balance": 100.0, "holdings": [{"symbol": "AAPL", "shares": 3}]
+    }
+
+    with pytest.raises(ValueError, match="Insufficient shares of AAPL. Requested: 5, Held: 3"):
+        mongo_session_model.sell_stock(1, "AAPL", 5, 10.0)
+    mock_collections["trade"].update_one.assert_not_called()
+
+def test_sell_stock_credits_cash_and_removes_empty_holding(mock_collections):
+    """Test that selling a whole position credits cash and drops the holding."""
+    mock_collections["trade"].find_one.return_value = {
+        "cash_balance": 100.0, "holdings": [{"symbol": "AAPL", "shares": 3}]
+    }
+    mock_collections["trade"].update_one.return_value.modified_count = 1
+
+    mongo_session_model.sell_stock(1, "AAPL", 3, 10.0)
+
+    sale, cleanup = mock_collections["trade"].update_one.call_args_list
+    assert sale[0][1] == {"$inc": {"holdings.$.shares": -3, "cash_balance": 30.0}}
+    assert cleanup[0][1] == {"$pull": {"holdings": {"symbol": "AAPL", "shares": {"$lte": 0}}}}
+
+def test_sell_stock_lost_race_does_not_credit(mock_collections):
+    """Test that a sale whose shares were sold concurrently fails instead of overselling."""
+    mock_collections["trade"].find_one.return_value = {
+        "cash_balance": 100.0, "holdings": [{"symbol": "AAPL", "shares": 3}]
+    }
+    mock_collections["trade"].update_one.return_value.modified_count = 0
+
+    with pytest.raises(ValueError, match="Insufficient shares of AAPL"):
+        mongo_session_model.sell_stock(1, "AAPL", 2, 10.0)
+
+    sale = mock_collections["trade"].update_one.call_args
+    assert sale[0][0]["holdings"] == {"$elemMatch": {"symbol": "AAPL", "shares": {"$gte": 2}}}
+    assert mock_collections["trade"].update_one.call_count == 1
@@ -0,0 +1,65 @@
+import hashlib
+
+import pytest
+
+from stock_trading.utils import passwords
+from stock_trading.utils.passwords import hash_password, needs_rehash, verify_password
+
+
+SALT = "00112233445566778899aabbccddeeff"
+
+
+##########################################################
+# Hashing and Verification
+##########################################################
+
+def test_hash_password_encodes_parameters():
+    """Test that a new hash records its algorithm and cost parameters."""
+    encoded = hash_password("secret", SALT)
+    assert encoded.startswith(f"scrypt${passwords.SCRYPT_N}${passwords.SCRYPT_R}${passwords.SCRYPT_P}$")
+
+def test_verify_password_round_trip():
+    """Test that a hashed password verifies and a wrong one does not."""
+    encoded = hash_password("secret", SALT)
+    assert verify_password("secret", SALT, encoded) is True
+    assert verify_password("wrong", SALT, encoded) is False
+
+def test_verify_password_pbkdf2(mocker):
+    """Test hashing and verifying with PBKDF2."""
+    mocker.patch.object(passwords, "PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256")
+    mocker.patch.object(passwords, "PBKDF2_ITERATIONS", 1000)
+    encoded = hash_password("secret", SALT)
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("secret", SALT, encoded) is True
+
+def test_verify_password_legacy_sha256():
+    """Test that legacy SHA-256 rows still verify."""
+    legacy = hashlib.sha256(("secret" + SALT).encode()).hexdigest()
+    assert verify_password("secret", SALT, legacy) is True
+    assert verify_password("wrong", SALT, legacy) is False
+
+def test_verify_password_rejects_excessive_cost():
+    """Test that a hash demanding more work than allowed is rejected without computing it."""
+    encoded = f"scrypt${passwords.SCRYPT_MAX_N * 2}$8$1${'0' * 64}"
+    assert verify_password("secret", SALT, encoded) is False
+
+def test_verify_password_rejects_long_password():
+    """Test that overly long passwords are rejected."""
+    encoded = hash_password("secret", SALT)
+    assert verify_password("x" * (passwords.MAX_PASSWORD_LENGTH + 1), SALT, encoded) is False
+    with pytest.raises(ValueError):
+        hash_password("x" * (passwords.MAX_PASSWORD_LENGTH + 1), SALT)
+
+def test_verify_password_malformed_hash():
+    """Test that a malformed hash does not verify."""
+    assert verify_password("secret", SALT, "scrypt$abc") is False
+
+##########################################################
+# Rehash Detection
+##########################################################
+
+def test_needs_rehash():
+    """Test that legacy and outdated hashes are flagged for rehashing."""
+    assert needs_rehash(hash_password("secret", SALT)) is False
+    assert needs_rehash(hashlib.sha256(b"secret").hexdigest()) is True
+    assert needs_rehash(f"scrypt$1024$8$1${'0' * 64}") is True
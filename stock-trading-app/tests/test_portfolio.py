@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from stock_trading.clients.price_bus import PriceBus
+from stock_trading.routes import portfolio as portfolio_routes
+
+
+@pytest.fixture
+def bus(mocker):
+    """Fixture for the price bus the stream reads, with its poller stopped."""
+    bus = PriceBus(mocker.Mock(return_value=100.0), poll_interval=60)
+    mocker.patch.object(bus, "_ensure_running")
+    mocker.patch.object(portfolio_routes, "price_bus", bus)
+    mocker.patch.object(portfolio_routes, "STREAM_HEARTBEAT_SECONDS", 0)
+    return bus
+
+@pytest.fixture
+def mock_positions(mocker):
+    """Fixture that serves a sequence of portfolio positions to the stream."""
+    return mocker.patch("stock_trading.routes.portfolio.get_portfolio_positions")
+
+
+def positions(cash, **shares):
+    return {"holdings": [{"symbol": symbol, "shares": count, "avg_purchase_price": 10.0}
+                         for symbol, count in shares.items()],
+            "cash_balance": cash}
+
+def parse(event):
+    name, data = event.split("\n")[:2]
+    return name[len("event: "):], json.loads(data[len("data: "):])
+
+
+##########################################################
+# Valuation
+##########################################################
+
+def test_valuation_withholds_partial_totals():
+    """Test that totals are only given once every holding has a price."""
+    partial = portfolio_routes._valuation(positions(50.0, AAPL=2, TSLA=1), {"AAPL": 100.0})
+    full = portfolio_routes._valuation(positions(50.0, AAPL=2, TSLA=1), {"AAPL": 100.0, "TSLA": 20.0})
+
+    assert partial["complete"] is False
+    assert partial["total_portfolio_value"] is None
+    assert full["complete"] is True
+    assert full["total_portfolio_value"] == 270.0
+
+
+##########################################################
+# Stream
+##########################################################
+
+def test_stream_totals_wait_for_every_price(bus, mock_positions):
+    """Test that valuation events on a cold bus carry no totals until all holdings are priced."""
+    mock_positions.return_value = positions(50.0, AAPL=2, TSLA=1)
+    events = portfolio_routes._portfolio_events(1)
+
+    assert parse(next(events))[1]["complete"] is False
+    bus.publish("AAPL", 100.0)
+    name, data = parse(next(events))
+    assert (name, data["complete"], data["total_portfolio_value"]) == ("valuation", False, None)
+    bus.publish("TSLA", 20.0)
+    name, data = parse(next(events))
+    assert (data["complete"], data["total_portfolio_value"]) == (True, 270.0)
+    events.close()
+
+def test_stream_seeds_prices_of_new_holdings(bus, mock_positions):
+    """Test that a newly held symbol is priced from the bus even if its price does not change."""
+    other = bus.subscribe(["TSLA"])
+    bus.publish("TSLA", 20.0)
+    mock_positions.side_effect = [positions(50.0, AAPL=2), positions(30.0, AAPL=2, TSLA=1)]
+    events = portfolio_routes._portfolio_events(1)
+    next(events)
+
+    name, data = parse(next(events))
+
+    assert name == "snapshot"
+    assert data["holdings"][1]["current_price"] == 20.0
+    events.close()
+    bus.unsubscribe(other)
+
+def test_stream_snapshot_after_same_symbol_trade(bus, mock_positions):
+    """Test that a trade changing only quantities and cash sends a fresh snapshot."""
+    bus.publish("AAPL", 100.0)
+    mock_positions.side_effect = [positions(50.0, AAPL=2), positions(30.0, AAPL=3), positions(30.0, AAPL=3)]
+    events = portfolio_routes._portfolio_events(1)
+    next(events)
+
+    name, data = parse(next(events))
+    assert name == "snapshot"
+    assert data["holdings"][0]["shares"] == 3
+    assert data["cash_balance"] == 30.0
+    assert next(events) == ": keep-alive\n\n"
+    events.close()
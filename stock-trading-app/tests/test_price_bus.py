@@ -0,0 +1,87 @@
+import pytest
+
+from stock_trading.clients.price_bus import PriceBus
+
+
+@pytest.fixture
+def fetch_price(mocker):
+    return mocker.Mock(return_value=100.0)
+
+
+@pytest.fixture
+def bus(fetch_price, mocker):
+    """Fixture for a bus whose background poller is never started; tests poll by hand."""
+    bus = PriceBus(fetch_price, poll_interval=60)
+    mocker.patch.object(bus, "_ensure_running")
+    return bus
+
+
+##########################################################
+# Publish / Subscribe
+##########################################################
+
+def test_publish_notifies_subscribers(bus):
+    """Test that a published price reaches every subscriber of the symbol."""
+    first = bus.subscribe(["AAPL"])
+    second = bus.subscribe(["AAPL", "TSLA"])
+
+    bus.publish("AAPL", 150.0)
+
+    assert first.get(timeout=0) == {"AAPL": 150.0}
+    assert second.get(timeout=0) == {"AAPL": 150.0}
+
+def test_publish_skips_unchanged_price(bus):
+    """Test that republishing the same price does not notify subscribers."""
+    subscription = bus.subscribe(["AAPL"])
+
+    bus.publish("AAPL", 150.0)
+    subscription.get(timeout=0)
+    bus.publish("AAPL", 150.0)
+
+    assert subscription.get(timeout=0) == {}
+
+def test_updates_are_coalesced_per_symbol(bus):
+    """Test that a slow subscriber only sees the latest price per symbol."""
+    subscription = bus.subscribe(["AAPL"])
+
+    bus.publish("AAPL", 150.0)
+    bus.publish("AAPL", 151.0)
+
+    assert subscription.get(timeout=0) == {"AAPL": 151.0}
+
+def test_unsubscribe_forgets_unwatched_symbols(bus):
+    """Test that symbols with no subscribers are dropped from the bus."""
+    subscription = bus.subscribe(["AAPL"])
+    bus.publish("AAPL", 150.0)
+
+    bus.unsubscribe(subscription)
+
+    assert bus.last_price("AAPL") is None
+    assert subscription.closed
+
+##########################################################
+# Poller
+##########################################################
+
+def test_poll_fetches_each_symbol_once_for_many_subscribers(bus, fetch_price):
+    """Test that many subscribers share a single upstream fetch per symbol."""
+    subscriptions = [bus.subscribe(["AAPL"]) for _ in range(50)]
+
+    assert bus.poll_once() == 1
+
+    fetch_price.assert_called_once_with("AAPL")
+    for subscription in subscriptions:
+        assert subscription.get(timeout=0) == {"AAPL": 100.0}
+
+def test_poll_survives_fetch_errors(bus, fetch_price):
+    """Test that a failing symbol does not stop the others from being published."""
+    def fetch(symbol):
+        if symbol == "BAD":
+            raise ValueError("No quote data available")
+        return 1.0
+    fetch_price.side_effect = fetch
+    subscription = bus.subscribe(["AAPL", "BAD"])
+
+    bus.poll_once()
+
+    assert subscription.get(timeout=0) == {"AAPL": 1.0}
@@ -0,0 +1,125 @@
+import pstats
+import threading
+import time
+
+import pytest
+
+from config import TestConfig
+from stock_trading import create_app
+from stock_trading.utils.profiling import ProfileStore, SamplingProfiler
+
+
+def make_profiling_app(tmp_path, **overrides):
+    config = type("ProfilingConfig", (TestConfig,), {
+        "PROFILING_ENABLED": True,
+        "PROFILING_TOKEN": "secret",
+        "PROFILING_DIR": str(tmp_path),
+        "PROFILING_INTERVAL": 0.001,
+        **overrides,
+    })
+    app = create_app(config)
+
+    @app.route("/slow")
+    def slow():
+        time.sleep(0.05)
+        return "done"
+
+    return app
+
+@pytest.fixture
+def admin_token(mocker):
+    """Fixture that sets the admin token used by the profile endpoints."""
+    mocker.patch("stock_trading.routes.api.ADMIN_API_TOKEN", "admin")
+    return {"X-Admin-Token": "admin"}
+
+
+##########################################################
+# Request Profiling
+##########################################################
+
+def test_profiling_disabled_installs_no_hooks(app, client):
+    """Test that no profiling hooks run when profiling is disabled."""
+    hooks = [f.__name__ for f in app.before_request_funcs.get(None, [])]
+
+    assert "_start_profile" not in hooks
+    assert "X-Profile-Id" not in client.get("/api/health", headers={"X-Profile": "secret"}).headers
+
+def test_profile_requested_by_header(tmp_path, admin_token):
+    """Test that a request with the profiling header is profiled and can be downloaded."""
+    client = make_profiling_app(tmp_path).test_client()
+
+    response = client.get("/slow", headers={"X-Profile": "secret"})
+    profile_id = response.headers["X-Profile-Id"]
+
+    listing = client.get("/api/profiles", headers=admin_token).get_json()
+    assert listing["profiles"][0]["id"] == profile_id
+    assert listing["profiles"][0]["path"] == "/slow"
+    assert listing["profiles"][0]["format"] == "collapsed"
+
+    download = client.get(f"/api/profiles/{profile_id}", headers=admin_token)
+    assert download.status_code == 200
+    assert "test_profiling:slow" in download.get_data(as_text=True)
+
+def test_profile_header_needs_token(tmp_path):
+    """Test that the profiling header is ignored without the right token."""
+    client = make_profiling_app(tmp_path).test_client()
+
+    response = client.get("/slow", headers={"X-Profile": "wrong"})
+
+    assert "X-Profile-Id" not in response.headers
+
+def test_profile_sample_rate(tmp_path):
+    """Test that requests are profiled at random according to the sample rate."""
+    client = make_profiling_app(tmp_path, PROFILING_SAMPLE_RATE=1.0).test_client()
+
+    assert "X-Profile-Id" in client.get("/api/health").headers
+
+def test_cprofile_mode(tmp_path, admin_token):
+    """Test that cProfile mode stores a loadable pstats file."""
+    client = make_profiling_app(tmp_path, PROFILING_MODE="cprofile").test_client()
+
+    profile_id = client.get("/slow", headers={"X-Profile": "secret"}).headers["X-Profile-Id"]
+
+    stats = pstats.Stats(str(tmp_path / f"{profile_id}.pstats"))
+    assert any(func[2] == "slow" for func in stats.stats)
+
+def test_profile_endpoints_require_admin_token(client):
+    """Test that profiles cannot be listed without the admin token."""
+    assert client.get("/api/profiles").status_code == 403
+
+def test_download_unknown_profile(client, admin_token):
+    """Test that unknown or malformed profile IDs are not found."""
+    assert client.get("/api/profiles/" + "0" * 32, headers=admin_token).status_code == 404
+    assert client.get("/api/profiles/..%2Fconfig", headers=admin_token).status_code == 404
+
+
+##########################################################
+# Profiler and Store
+##########################################################
+
+def test_sampling_profiler_collapsed_stacks():
+    """Test that samples are recorded as root-first collapsed stacks."""
+    def busy_wait():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    profiler = SamplingProfiler(threading.get_ident(), 0.001)
+    profiler.start()
+    busy_wait()
+    profiler.stop()
+
+    lines = profiler.collapsed().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.endswith("test_profiling:busy_wait")
+    assert int(count) > 0
+
+def test_store_keeps_most_recent(tmp_path):
+    """Test that the store deletes the oldest profiles beyond its limit."""
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+
+    ids = [store.save({"created": float(i)}, "collapsed", data="a;b 1\n") for i in range(3)]
+
+    assert [p["id"] for p in store.list()] == [ids[2], ids[1]]
+    assert store.data_path(ids[0]) is None
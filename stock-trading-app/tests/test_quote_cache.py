@@ -0,0 +1,58 @@
+import time
+
+import pytest
+import redis
+
+from stock_trading.clients import quote_cache
+from stock_trading.clients.quote_cache import get_last_quote
+
+
+@pytest.fixture
+def local_quotes(mocker):
+    """Fixture to give each test an empty in-process quote store."""
+    quotes = {}
+    mocker.patch.object(quote_cache, "_local_quotes", quotes)
+    return quotes
+
+@pytest.fixture
+def mock_redis(mocker):
+    """Fixture to replace the shared quote store."""
+    return mocker.patch.object(quote_cache, "redis_client")
+
+
+##########################################################
+# Last Quote
+##########################################################
+
+def test_get_last_quote_prefers_newer_shared_quote(local_quotes, mock_redis):
+    """Test that a newer price from another worker wins over an older local one."""
+    now = time.time()
+    local_quotes["AAPL"] = (149.0, now - 300)
+    mock_redis.hgetall.return_value = {b"price": b"151.0", b"as_of": str(now - 10).encode()}
+
+    assert get_last_quote("AAPL") == (151.0, now - 10)
+    assert local_quotes["AAPL"] == (151.0, now - 10)
+
+def test_get_last_quote_keeps_newer_local_quote(local_quotes, mock_redis):
+    """Test that an older shared price does not replace a newer local one."""
+    now = time.time()
+    local_quotes["AAPL"] = (150.0, now - 10)
+    mock_redis.hgetall.return_value = {b"price": b"149.0", b"as_of": str(now - 300).encode()}
+
+    assert get_last_quote("AAPL") == (150.0, now - 10)
+
+def test_get_last_quote_falls_back_to_local_when_redis_down(local_quotes, mock_redis):
+    """Test that the local price is served when Redis cannot be reached."""
+    now = time.time()
+    local_quotes["AAPL"] = (150.0, now - 10)
+    mock_redis.hgetall.side_effect = redis.exceptions.ConnectionError("down")
+
+    assert get_last_quote("AAPL") == (150.0, now - 10)
+
+def test_get_last_quote_too_old(local_quotes, mock_redis, mocker):
+    """Test that a price older than QUOTE_STALE_MAX_AGE is not served."""
+    mocker.patch.object(quote_cache, "QUOTE_STALE_MAX_AGE", 60)
+    local_quotes["AAPL"] = (150.0, time.time() - 120)
+    mock_redis.hgetall.return_value = {}
+
+    assert get_last_quote("AAPL") is None
@@ -0,0 +1,132 @@
+import msgpack
+import pytest
+import redis
+from flask import Flask, session
+
+from stock_trading.sessions import RedisSessionInterface, revoke_user_sessions
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    """Fixture for a mocked Redis client holding no sessions."""
+    client = mocker.Mock()
+    client.getex.return_value = None
+    client.smembers.return_value = set()
+    return client
+
+
+@pytest.fixture
+def session_app(mock_redis):
+    """Fixture for a minimal app using Redis-backed sessions."""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    app.session_interface = RedisSessionInterface(mock_redis, idle_timeout=600)
+
+    @app.route('/set/<value>')
+    def set_value(value):
+        session['value'] = value
+        return 'ok'
+
+    @app.route('/get')
+    def get_value():
+        return session.get('value', '')
+
+    @app.route('/login/<user_id>')
+    def login(user_id):
+        session['_user_id'] = user_id
+        return 'ok'
+
+    return app
+
+
+def _cookie(response):
+    return response.headers['Set-Cookie'].split(';')[0].split('=', 1)[1]
+
+
+##########################################################
+# Loading and Saving
+##########################################################
+
+def test_new_session_is_stored_in_redis(session_app, mock_redis):
+    """Test that a modified session is written to Redis and only its ID sent as a cookie."""
+    response = session_app.test_client().get('/set/hello')
+
+    sid = _cookie(response)
+    pipe = mock_redis.pipeline.return_value
+    key, payload = pipe.set.call_args[0]
+    assert key == f"session:{sid}"
+    assert msgpack.unpackb(payload, raw=False) == {'value': 'hello'}
+    assert pipe.set.call_args[1] == {'ex': 600}
+
+def test_existing_session_is_loaded_with_sliding_expiry(session_app, mock_redis):
+    """Test that a session is read with GETEX, which also extends its expiry."""
+    mock_redis.getex.return_value = msgpack.packb({'value': 'stored'}, use_bin_type=True)
+    client = session_app.test_client()
+    client.set_cookie('session', 'abc')
+
+    response = client.get('/get')
+
+    assert response.get_data(as_text=True) == 'stored'
+    mock_redis.getex.assert_called_once_with('session:abc', ex=600)
+    assert 'Set-Cookie' not in response.headers
+    mock_redis.pipeline.return_value.set.assert_not_called()
+
+def test_unreachable_store_gives_empty_session(session_app, mock_redis):
+    """Test that a Redis outage yields an empty session instead of an error."""
+    mock_redis.getex.side_effect = redis.exceptions.ConnectionError("down")
+    client = session_app.test_client()
+    client.set_cookie('session', 'abc')
+
+    response = client.get('/get')
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == ''
+
+##########################################################
+# Login and Revocation
+##########################################################
+
+def test_login_rotates_session_id_and_tracks_user(session_app, mock_redis):
+    """Test that attaching a user issues a new session ID and records it for revocation."""
+    mock_redis.getex.return_value = msgpack.packb({'value': 'anon'}, use_bin_type=True)
+    client = session_app.test_client()
+    client.set_cookie('session', 'before')
+
+    response = client.get('/login/7')
+
+    sid = _cookie(response)
+    pipe = mock_redis.pipeline.return_value
+    assert sid != 'before'
+    pipe.delete.assert_any_call('session:before')
+    pipe.sadd.assert_called_once_with('session:user:7', sid)
+
+def test_login_prunes_expired_sessions(session_app, mock_redis):
+    """Test that a login removes expired sessions from the user's set, which never expires."""
+    mock_redis.smembers.return_value = {b'gone'}
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.side_effect = [None, [0]]
+
+    session_app.test_client().get('/login/7')
+
+    pipe.expire.assert_not_called()
+    mock_redis.srem.assert_called_once_with('session:user:7', 'gone')
+
+def test_login_fails_when_session_cannot_be_saved(session_app, mock_redis):
+    """Test that a login whose session cannot be stored fails visibly instead of redirecting."""
+    mock_redis.pipeline.return_value.execute.side_effect = redis.exceptions.ConnectionError("down")
+
+    response = session_app.test_client().get('/login/7')
+
+    assert response.status_code == 503
+    assert 'Set-Cookie' not in response.headers
+
+def test_revoke_user_sessions(mock_redis):
+    """Test that revoking a user deletes every tracked session."""
+    mock_redis.smembers.return_value = {b'one', b'two'}
+
+    assert revoke_user_sessions(7, client=mock_redis) == 2
+
+    pipe = mock_redis.pipeline.return_value
+    pipe.delete.assert_any_call('session:one')
+    pipe.delete.assert_any_call('session:two')
+    pipe.delete.assert_any_call('session:user:7')
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+import redis
+
+from stock_trading.utils.single_flight import SingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    return SingleFlight()
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+
+    def run():
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+##########################################################
+# In-process coalescing
+##########################################################
+
+def test_concurrent_calls_share_one_execution(single_flight):
+    """Test that concurrent calls with the same key run the function once."""
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"price": 150.0}
+
+    _run_concurrently(10, lambda: results.append(single_flight.do("GLOBAL_QUOTE:AAPL", fetch)))
+
+    assert len(calls) == 1
+    assert results == [{"price": 150.0}] * 10
+
+def test_different_keys_do_not_coalesce(single_flight, mocker):
+    """Test that calls with different keys each run the function."""
+    fetch = mocker.Mock(return_value=1.0)
+
+    single_flight.do("GLOBAL_QUOTE:AAPL", fetch)
+    single_flight.do("GLOBAL_QUOTE:TSLA", fetch)
+
+    assert fetch.call_count == 2
+
+def test_sequential_calls_are_not_cached(single_flight, mocker):
+    """Test that a completed call is not reused by later callers."""
+    fetch = mocker.Mock(return_value=1.0)
+
+    single_flight.do("GLOBAL_QUOTE:AAPL", fetch)
+    single_flight.do("GLOBAL_QUOTE:AAPL", fetch)
+
+    assert fetch.call_count == 2
+
+def test_errors_are_raised_to_the_caller(single_flight):
+    """Test that an exception from the function propagates and clears the key."""
+    def fetch():
+        raise ValueError("Network error while fetching price")
+
+    with pytest.raises(ValueError, match="Network error while fetching price"):
+        single_flight.do("GLOBAL_QUOTE:AAPL", fetch)
+
+    assert single_flight.do("GLOBAL_QUOTE:AAPL", lambda: 1.0) == 1.0
+
+def test_waiter_gives_up_on_hung_leader():
+    """Test that a waiter raises TimeoutError instead of waiting forever on a hung call."""
+    single_flight = SingleFlight(wait_timeout=0.1)
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: single_flight.do("GLOBAL_QUOTE:AAPL", release.wait))
+    leader.start()
+    time.sleep(0.05)
+
+    try:
+        with pytest.raises(TimeoutError):
+            single_flight.do("GLOBAL_QUOTE:AAPL", lambda: 1.0)
+    finally:
+        release.set()
+        leader.join()
+
+##########################################################
+# Cross-process coalescing
+##########################################################
+
+def test_redis_failure_falls_back_to_local_call(mocker):
+    """Test that Redis errors degrade to running the function directly."""
+    mock_redis = mocker.Mock()
+    mock_redis.get.side_effect = redis.exceptions.ConnectionError("Connection refused")
+    single_flight = SingleFlight(mock_redis)
+
+    assert single_flight.do("GLOBAL_QUOTE:AAPL", lambda: {"price": 1.0}) == {"price": 1.0}
+
+def test_shared_result_from_another_process_is_used(mocker):
+    """Test that a result published by another process skips the upstream call."""
+    mock_redis = mocker.Mock()
+    mock_redis.get.return_value = b'{"price": 2.0}'
+    fetch = mocker.Mock()
+    single_flight = SingleFlight(mock_redis)
+
+    assert single_flight.do("GLOBAL_QUOTE:AAPL", fetch) == {"price": 2.0}
+    fetch.assert_not_called()
@@ -0,0 +1,104 @@
+import csv
+
+import pytest
+
+from stock_trading.clients.symbol_directory import SymbolDirectory
+
+
+LISTINGS = [
+    {"symbol": "AAPL", "name": "Apple Inc", "exchange": "NASDAQ", "assetType": "Stock", "status": "Active"},
+    {"symbol": "AAP", "name": "Advance Auto Parts Inc", "exchange": "NYSE", "assetType": "Stock", "status": "Active"},
+    {"symbol": "AMZN", "name": "Amazon.com Inc", "exchange": "NASDAQ", "assetType": "Stock", "status": "Active"},
+    {"symbol": "MSFT", "name": "Microsoft Corporation", "exchange": "NASDAQ", "assetType": "Stock", "status": "Active"},
+    {"symbol": "TWTR", "name": "Twitter Inc", "exchange": "NYSE", "assetType": "Stock", "status": "Delisted"},
+]
+
+
+@pytest.fixture
+def directory():
+    directory = SymbolDirectory()
+    directory.load_rows(LISTINGS)
+    return directory
+
+
+##########################################################
+# Loading
+##########################################################
+
+def test_load_rows_skips_inactive_listings(directory):
+    """Test that only active listings are loaded."""
+    assert "AAPL" in directory
+    assert "TWTR" not in directory
+
+def test_load_csv(tmp_path):
+    """Test loading a listing-status CSV dump."""
+    path = tmp_path / "listing_status.csv"
+    path.write_text(
+        "symbol,name,exchange,assetType,ipoDate,delistingDate,status\n"
+        "IBM,International Business Machines Corp,NYSE,Stock,1962-01-02,null,Active\n"
+    )
+    directory = SymbolDirectory()
+
+    assert directory.load_csv(str(path)) == 1
+    assert directory.get("ibm")["name"] == "International Business Machines Corp"
+
+def test_ensure_loaded_missing_file(tmp_path):
+    """Test that a missing dump leaves the directory unavailable."""
+    directory = SymbolDirectory()
+
+    assert directory.ensure_loaded(str(tmp_path / "missing.csv")) is False
+    assert not directory.loaded
+
+def test_ensure_loaded_retries_on_interval(tmp_path, mocker):
+    """Test that a missing dump is retried only after the retry interval, and warned about once."""
+    directory = SymbolDirectory(retry_interval=60)
+    path = tmp_path / "listing_status.csv"
+    mock_warning = mocker.patch("stock_trading.clients.symbol_directory.logger.warning")
+    mock_time = mocker.patch("stock_trading.clients.symbol_directory.time.monotonic", return_value=1000.0)
+
+    assert directory.ensure_loaded(str(path)) is False
+    path.write_text("symbol,name,exchange,assetType,ipoDate,delistingDate,status\nIBM,IBM,NYSE,Stock,,,Active\n")
+    assert directory.ensure_loaded(str(path)) is False
+
+    mock_time.return_value = 1061.0
+    assert directory.ensure_loaded(str(path)) is True
+    assert mock_warning.call_count == 1
+
+def test_ensure_loaded_malformed_file(tmp_path, mocker):
+    """Test that an unreadable dump leaves the directory unavailable instead of raising."""
+    path = tmp_path / "listing_status.csv"
+    path.write_text("symbol,name\n")
+    directory = SymbolDirectory()
+    mocker.patch.object(directory, "load_csv", side_effect=csv.Error("malformed"))
+
+    assert directory.ensure_loaded(str(path)) is False
+
+##########################################################
+# Search
+##########################################################
+
+def test_search_symbol_prefix_exact_match_first(directory):
+    """Test that an exact symbol sorts ahead of longer prefix matches."""
+    results = directory.search("aap")
+
+    assert [r["symbol"] for r in results[:2]] == ["AAP", "AAPL"]
+
+def test_search_name_prefix(directory):
+    """Test searching by company name prefix."""
+    results = directory.search("micro")
+
+    assert [r["symbol"] for r in results] == ["MSFT"]
+
+def test_search_fuzzy_symbol(directory):
+    """Test that a mistyped symbol still finds close matches."""
+    results = directory.search("AMZM")
+
+    assert "AMZN" in [r["symbol"] for r in results]
+
+def test_search_respects_limit(directory):
+    """Test that results are capped at the limit."""
+    assert len(directory.search("A", limit=2)) == 2
+
+def test_search_unloaded_directory():
+    """Test searching before anything is loaded."""
+    assert SymbolDirectory().search("AAPL") == []
@@ -0,0 +1,39 @@
+import pytest
+
+from stock_trading.models.user_model import Users
+
+
+@pytest.fixture
+def logged_in_client(client, mocker):
+    """Fixture for a test client logged in as user 1."""
+    mocker.patch.object(Users, "load_identity", return_value=mocker.Mock(id=1, is_active=True, is_authenticated=True))
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "1"
+    return client
+
+@pytest.fixture
+def mock_sell_stock(mocker):
+    """Fixture to replace the sale executed by the trade routes."""
+    return mocker.patch("stock_trading.routes.trade.sell_stock")
+
+
+##########################################################
+# Execute Sell
+##########################################################
+
+def test_execute_sell_sells_shares(logged_in_client, mock_sell_stock):
+    """Test that a confirmed sale is executed and redirects to the portfolio."""
+    response = logged_in_client.post("/execute-sell", data={"symbol": "aapl", "shares": "3", "price": "10.5"})
+
+    mock_sell_stock.assert_called_once_with(1, "AAPL", 3, 10.5)
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/portfolio")
+
+def test_execute_sell_insufficient_shares(logged_in_client, mock_sell_stock):
+    """Test that a rejected sale redirects back to the sell form."""
+    mock_sell_stock.side_effect = ValueError("Insufficient shares of AAPL")
+
+    response = logged_in_client.post("/execute-sell", data={"symbol": "AAPL", "shares": "5", "price": "10.5"})
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/sell")
@@ -0,0 +1,48 @@
+import pytest
+
+from stock_trading.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(mocker):
+    """Fixture to control the cache's notion of time."""
+    now = [1000.0]
+    mocker.patch("stock_trading.utils.ttl_cache.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_expiry(clock):
+    """Test that entries are served until their TTL elapses."""
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+
+    clock[0] += 9
+    assert cache.get("a") == 1
+
+    clock[0] += 1
+    assert cache.get("a") is None
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """Test that the cache stays within maxsize by evicting the least recently used entry."""
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_delete_and_clear(clock):
+    """Test removing single entries and clearing the cache."""
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 
 from stock_trading.models.user_model import Users
@@ -10,21 +12,26 @@ def sample_user():
         "password": "securepassword123"
     }
 
+@pytest.fixture
+def mock_portfolio_init(mocker):
+    """Fixture to keep create_user from inserting a portfolio into MongoDB."""
+    return mocker.patch("stock_trading.models.user_model.initialize_user_portfolio")
+
 
 ##########################################################
 # User Creation
 ##########################################################
 
-def test_create_user(session, sample_user):
+def test_create_user(session, sample_user, mock_portfolio_init):
     """Test creating a new user with a unique username."""
     Users.create_user(**sample_user)
     user = session.query(Users).filter_by(username=sample_user["username"]).first()
     assert user is not None, "User should be created in the database."
     assert user.username == sample_user["username"], "Username should match the input."
     assert len(user.salt) == 32, "Salt should be 32 characters (hex)."
-    assert len(user.password) == 64, "Password should be a 64-character SHA-256 hash."
+    assert user.password.startswith("scrypt$"), "Password should be stored as an encoded scrypt hash."
 
-def test_create_duplicate_user(session, sample_user):
+def test_create_duplicate_user(session, sample_user, mock_portfolio_init):
     """Test attempting to create a user with a duplicate username."""
     Users.create_user(**sample_user)
     with pytest.raises(ValueError, match="User with username 'testuser' already exists"):
@@ -34,26 +41,47 @@ def test_create_duplicate_user(session, sample_user):
 # User Authentication
 ##########################################################
 
-def test_check_password_correct(session, sample_user):
+def test_check_password_correct(session, sample_user, mock_portfolio_init):
     """Test checking the correct password."""
     Users.create_user(**sample_user)
     assert Users.check_password(sample_user["username"], sample_user["password"]) is True, "Password should match."
 
-def test_check_password_incorrect(session, sample_user):
+def test_check_password_incorrect(session, sample_user, mock_portfolio_init):
     """Test checking an incorrect password."""
     Users.create_user(**sample_user)
     assert Users.check_password(sample_user["username"], "wrongpassword") is False, "Password should not match."
 
+def test_check_password_rehashes_legacy_sha256(session, sample_user, mock_portfolio_init):
+    """Test that a legacy SHA-256 password is upgraded to the current KDF on login."""
+    Users.create_user(**sample_user)
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    user.password = hashlib.sha256((sample_user["password"] + user.salt).encode()).hexdigest()
+    session.commit()
+
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.password.startswith("scrypt$"), "Legacy hash should be replaced after login."
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
 def test_check_password_user_not_found(session):
     """Test checking password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.check_password("nonexistentuser", "password")
 
+def test_check_password_user_not_found_runs_kdf(session, mocker):
+    """Test that an unknown username still pays for a password check, so timing does not reveal it."""
+    mock_verify = mocker.patch("stock_trading.models.user_model.verify_password", return_value=False)
+
+    with pytest.raises(ValueError):
+        Users.check_password("nonexistentuser", "password")
+
+    assert mock_verify.call_args[0][0] == "password"
+
 ##########################################################
 # Update Password
 ##########################################################
 
-def test_update_password(session, sample_user):
+def test_update_password(session, sample_user, mock_portfolio_init):
     """Test updating the password for an existing user."""
     Users.create_user(**sample_user)
     new_password = "newpassword456"
@@ -70,7 +98,7 @@ def test_update_password_user_not_found(session):
 # Delete User
 ##########################################################
 
-def test_delete_user(session, sample_user):
+def test_delete_user(session, sample_user, mock_portfolio_init):
     """Test deleting an existing user."""
     Users.create_user(**sample_user)
     Users.delete_user(sample_user["username"])
@@ -86,7 +114,7 @@ def test_delete_user_not_found(session):
 # Get User
 ##########################################################
 
-def test_get_id_by_username(session, sample_user):
+def test_get_id_by_username(session, sample_user, mock_portfolio_init):
     """
     Test successfully retrieving a user's ID by their username.
     """
@@ -108,3 +136,137 @@ def test_get_id_by_username_user_not_found(session):
     """
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.get_id_by_username("nonexistentuser")
+
+
+##########################################################
+# Cached Identity
+##########################################################
+
+@pytest.fixture
+def identity_cache(mocker):
+    """Fixture to give each test an empty identity cache."""
+    from stock_trading.models import user_model
+    from stock_trading.utils.ttl_cache import TTLCache
+    cache = TTLCache(ttl=60)
+    mocker.patch.object(user_model, "_identity_cache", cache)
+    return cache
+
+def test_load_identity_is_cached(session, sample_user, mock_portfolio_init, identity_cache, mocker):
+    """Test that a loaded identity is served from cache without another query."""
+    Users.create_user(**sample_user)
+    user_id = Users.get_id_by_username(sample_user["username"])
+
+    identity = Users.load_identity(user_id)
+    assert identity.id == user_id
+    assert identity.username == sample_user["username"]
+
+    mock_get = mocker.patch.object(session, "get")
+    assert Users.load_identity(user_id) is identity
+    mock_get.assert_not_called()
+
+def test_load_identity_not_found(session, identity_cache):
+    """Test that loading a non-existent user returns None."""
+    assert Users.load_identity(999) is None
+
+def test_delete_user_invalidates_identity(session, sample_user, mock_portfolio_init, identity_cache):
+    """Test that deleting a user drops their cached identity."""
+    Users.create_user(**sample_user)
+    user_id = Users.get_id_by_username(sample_user["username"])
+    Users.load_identity(user_id)
+
+    Users.delete_user(sample_user["username"])
+
+    assert Users.load_identity(user_id) is None
+
+def test_update_password_invalidates_identity(session, sample_user, mock_portfolio_init, identity_cache):
+    """Test that changing a password drops the cached identity."""
+    Users.create_user(**sample_user)
+    user_id = Users.get_id_by_username(sample_user["username"])
+    Users.load_identity(user_id)
+
+    Users.update_password(sample_user["username"], "newpassword456")
+
+    assert identity_cache.get(user_id) is None
+
+
+##########################################################
+# Bulk Registration
+##########################################################
+
+@pytest.fixture
+def mock_bulk_portfolios(mocker):
+    """Fixture to replace the bulk portfolio insert and its compensation."""
+    return {
+        "init": mocker.patch("stock_trading.models.user_model.initialize_user_portfolios"),
+        "delete": mocker.patch("stock_trading.models.user_model.delete_user_portfolios"),
+    }
+
+def test_create_users_bulk(session, mock_bulk_portfolios):
+    """Test creating several users and their portfolios in one call."""
+    user_ids = Users.create_users_bulk([("bulk1", "pw1"), ("bulk2", "pw2")], workers=1)
+
+    assert len(user_ids) == 2
+    assert Users.get_id_by_username("bulk2") == user_ids[1]
+    assert Users.check_password("bulk1", "pw1") is True
+    mock_bulk_portfolios["init"].assert_called_once_with(user_ids)
+
+def test_create_users_bulk_existing_username(session, sample_user, mock_portfolio_init, mock_bulk_portfolios):
+    """Test that a batch containing an existing username creates nobody."""
+    Users.create_user(**sample_user)
+
+    with pytest.raises(ValueError, match="Users already exist: testuser"):
+        Users.create_users_bulk([("fresh", "pw"), (sample_user["username"], "pw")], workers=1)
+
+    assert session.query(Users).filter_by(username="fresh").first() is None
+    mock_bulk_portfolios["init"].assert_not_called()
+
+def test_create_users_bulk_portfolio_failure_rolls_back(session, mock_bulk_portfolios):
+    """Test that a failed portfolio insert leaves no users behind."""
+    mock_bulk_portfolios["init"].side_effect = RuntimeError("mongo down")
+
+    with pytest.raises(RuntimeError):
+        Users.create_users_bulk([("bulk1", "pw1")], workers=1)
+
+    assert session.query(Users).filter_by(username="bulk1").first() is None
+
+def test_create_users_bulk_commit_failure_removes_portfolios(session, mocker, mock_bulk_portfolios):
+    """Test that a failed SQL commit deletes the portfolios already inserted."""
+    mocker.patch.object(session, "commit", side_effect=RuntimeError("disk full"))
+
+    with pytest.raises(RuntimeError):
+        Users.create_users_bulk([("bulk1", "pw1")], workers=1)
+
+    mock_bulk_portfolios["delete"].assert_called_once()
+
+def test_bulk_endpoint_rejects_non_string_credentials(client, mocker):
+    """Test that non-string usernames or passwords are rejected with 400."""
+    mocker.patch("stock_trading.routes.api.ADMIN_API_TOKEN", "admin")
+    create = mocker.patch.object(Users, "create_users_bulk")
+
+    response = client.post("/api/users/bulk", headers={"X-Admin-Token": "admin"},
+                           json={"users": [{"username": "bulk1", "password": 12345}]})
+
+    assert response.status_code == 400
+    create.assert_not_called()
+
+def test_bulk_endpoint_caps_batch_size(client, mocker):
+    """Test that batches larger than BULK_REGISTRATION_MAX_USERS are rejected."""
+    mocker.patch("stock_trading.routes.api.ADMIN_API_TOKEN", "admin")
+    mocker.patch("stock_trading.routes.api.BULK_REGISTRATION_MAX_USERS", 2)
+    users = [{"username": f"bulk{i}", "password": "pw"} for i in range(3)]
+
+    response = client.post("/api/users/bulk", headers={"X-Admin-Token": "admin"}, json={"users": users})
+
+    assert response.status_code == 400
+
+def test_create_users_command_reports_bad_line(app, tmp_path, mocker):
+    """Test that create-users names the first line without a comma and creates nobody."""
+    create = mocker.patch.object(Users, "create_users_bulk")
+    users_file = tmp_path / "users.txt"
+    users_file.write_text("alice,pw1\n\nbob\n")
+
+    result = app.test_cli_runner().invoke(args=["create-users", str(users_file)])
+
+    assert result.exit_code != 0
+    assert "line 3" in result.output
+    create.assert_not_called()
@@ -0,0 +1,7 @@
+from stock_trading import create_app
+from stock_trading.utils.fragment_cache import precompile_templates
+
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app()
+# With preloading this runs once in the master, and workers inherit the compiled templates
+precompile_templates(app)